@@ -0,0 +1,139 @@
+"""
+Benchmark for type-filtered AST queries.
+
+Compares `Module.get_descendants`, which uses the module's node-type index, with
+a direct recursive search of the tree, on a generated module of roughly 5,000
+nodes. Constant folding, which repeatedly queries and modifies the tree, is
+timed with and without the index.
+
+Usage:
+
+    python -m benchmarks.ast_index
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from vyper import ast as vy_ast
+from vyper.ast import nodes
+
+QUERIES = {
+    "Int": vy_ast.Int,
+    "Call": vy_ast.Call,
+    "BinOp, BoolOp": (vy_ast.BinOp, vy_ast.BoolOp),
+    "all nodes": None,
+}
+
+
+def generate_module(n: int = 5000) -> vy_ast.Module:
+    """
+    Generate a module with at least `n` nodes.
+    """
+    function_nodes = len(vy_ast.parse_to_ast(_function(0)).body[0].get_descendants()) + 1
+    source = "\n".join(_function(i) for i in range(n // function_nodes + 1))
+    return vy_ast.parse_to_ast(source)
+
+
+def _function(i: int) -> str:
+    return (
+        f"@external\ndef foo{i}(a: uint256) -> uint256:\n"
+        f"    b: uint256 = a * {i} + (2 + 3)\n"
+        f"    return min(b, {i + 1})\n"
+    )
+
+
+def _unindexed_descendants(
+    node: vy_ast.VyperNode,
+    node_type: Optional[Any] = None,
+    filters: Optional[dict] = None,
+    include_self: bool = False,
+    reverse: bool = False,
+) -> List:
+    # the search performed by `VyperNode.get_descendants` prior to the module index
+    children = node.get_children(node_type, filters)
+    for child in node.get_children():
+        children.extend(_unindexed_descendants(child, node_type, filters))
+    if (
+        include_self
+        and (not node_type or isinstance(node, node_type))
+        and nodes._node_filter(node, filters)
+    ):
+        children.append(node)
+    result = nodes._sort_nodes(children)
+    if reverse:
+        result.reverse()
+    return result
+
+
+def _best_time(fn: Callable, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(n: int = 5000, repeat: int = 5) -> Dict[str, Dict]:
+    """
+    Time each query and constant folding, with and without the index.
+
+    Returns
+    -------
+    dict
+        `{"query name": {"matches": int, "indexed": float, "unindexed": float}}`
+    """
+    vyper_module = generate_module(n)
+    # build the index before timing queries
+    vyper_module.get_descendants()
+
+    results = {}
+    for name, node_type in QUERIES.items():
+        results[name] = {
+            "matches": len(vyper_module.get_descendants(node_type)),
+            "indexed": _best_time(lambda: vyper_module.get_descendants(node_type), repeat),
+            "unindexed": _best_time(
+                lambda: _unindexed_descendants(vyper_module, node_type), repeat
+            ),
+        }
+
+    def fold() -> None:
+        vy_ast.folding.fold(vyper_module.clone())
+
+    def fold_unindexed() -> None:
+        get_descendants = vy_ast.Module.get_descendants
+        vy_ast.Module.get_descendants = _unindexed_descendants  # type: ignore
+        try:
+            fold()
+        finally:
+            vy_ast.Module.get_descendants = get_descendants  # type: ignore
+
+    results["constant folding"] = {
+        "matches": len(vyper_module.get_descendants(vy_ast.BinOp)),
+        "indexed": _best_time(fold, repeat),
+        "unindexed": _best_time(fold_unindexed, repeat),
+    }
+    results["total nodes"] = len(vyper_module.get_descendants()) + 1  # type: ignore
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark type-filtered AST queries")
+    parser.add_argument("-n", type=int, default=5000, help="Minimum number of nodes in the module")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per query")
+    args = parser.parse_args(argv)
+
+    results = run(args.n, args.repeat)
+    print(f"Module with {results.pop('total nodes')} nodes\n")
+    print(f"{'query':<20}{'matches':>10}{'indexed (ms)':>15}{'unindexed (ms)':>17}{'speedup':>10}")
+    for name, data in results.items():
+        speedup = data["unindexed"] / data["indexed"]
+        print(
+            f"{name:<20}{data['matches']:>10}{data['indexed'] * 1000:>15.3f}"
+            f"{data['unindexed'] * 1000:>17.3f}{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark for Vyper AST node construction.
+
+Times the conversion of an annotated Python AST into Vyper nodes with
+`nodes.get_node`, on a generated module of roughly 20,000 nodes, alongside the
+other phases of `parse_to_ast` and some common operations on the resulting tree.
+
+Usage:
+
+    python -m benchmarks.ast_nodes
+"""
+
+import argparse
+import ast as python_ast
+import io
+import json
+from typing import Dict, List, Optional
+
+from benchmarks.ast_index import _best_time, generate_module
+from vyper import ast as vy_ast
+from vyper.ast import nodes, serialization
+from vyper.ast.annotation import annotate_python_ast
+from vyper.ast.pre_parser import pre_parse_tokens
+
+
+def run(n: int = 20000, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time each phase of parsing, and operations on the parsed module.
+
+    Returns
+    -------
+    dict
+        `{"phase name": time in seconds}`
+    """
+    source_code = generate_module(n).full_source_code
+    class_types, reformatted_code, token_list = pre_parse_tokens(source_code)
+    py_ast = python_ast.parse(reformatted_code)
+    annotate_python_ast(py_ast, source_code, class_types, token_list=token_list)
+    vyper_module = nodes.get_node(py_ast)
+    binary_ast = serialization.dump(vyper_module)
+
+    # a statement is inserted at the start of a function in the middle of the module,
+    # and removed again on the next call
+    edit_offset = (
+        source_code.index("\n", source_code.index("\ndef ", len(source_code) // 2) + 1) + 1
+    )
+    edit_text = "    x: uint256 = 1\n"
+    reparsed = [vy_ast.parse_to_ast(source_code)]
+
+    def reparse() -> None:
+        module = reparsed.pop()
+        if module.full_source_code == source_code:
+            reparsed.append(vy_ast.reparse_to_ast(module, edit_offset, edit_offset, edit_text))
+        else:
+            end = edit_offset + len(edit_text)
+            reparsed.append(vy_ast.reparse_to_ast(module, edit_offset, end, ""))
+
+    def annotate() -> None:
+        annotate_python_ast(
+            python_ast.parse(reformatted_code), source_code, class_types, token_list=token_list
+        )
+
+    return {
+        "pre_parse": _best_time(lambda: pre_parse_tokens(source_code), repeat),
+        "python ast.parse": _best_time(lambda: python_ast.parse(reformatted_code), repeat),
+        "parse + annotate": _best_time(annotate, repeat),
+        "get_node": _best_time(lambda: nodes.get_node(py_ast), repeat),
+        "to_dict": _best_time(vyper_module.to_dict, repeat),
+        "compare_nodes": _best_time(
+            lambda: vy_ast.compare_nodes(vyper_module, vyper_module), repeat
+        ),
+        "clone": _best_time(vyper_module.clone, repeat),
+        "reparse_to_ast": _best_time(reparse, repeat),
+        "json.dumps(to_dict)": _best_time(lambda: json.dumps(vyper_module.to_dict()), repeat),
+        "dump_json": _best_time(
+            lambda: serialization.dump_json(vyper_module, io.StringIO()), repeat
+        ),
+        "serialization.dump": _best_time(lambda: serialization.dump(vyper_module), repeat),
+        "serialization.load": _best_time(lambda: serialization.load(binary_ast), repeat),
+        "total nodes": len(vyper_module.get_descendants()) + 1,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Vyper AST node construction")
+    parser.add_argument("-n", type=int, default=20000, help="Minimum number of nodes in the module")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per phase")
+    args = parser.parse_args(argv)
+
+    results = run(args.n, args.repeat)
+    print(f"Module with {results.pop('total nodes')} nodes\n")
+    print(f"{'phase':<22}{'time (ms)':>12}")
+    for name, value in results.items():
+        print(f"{name:<22}{value * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
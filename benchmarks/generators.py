@@ -0,0 +1,100 @@
+"""
+Generators for synthetic contracts that scale along a single axis.
+
+Each generator accepts a size `n` and returns a tuple of `(source_code, interface_codes)`.
+"""
+
+from typing import Callable, Dict, Tuple
+
+Contract = Tuple[str, Dict]
+
+
+def functions(n: int) -> Contract:
+    """`n` external functions."""
+    source = "\n".join(
+        f"@external\ndef foo{i}(a: uint256) -> uint256:\n    return a + {i}\n" for i in range(n)
+    )
+    return source, {}
+
+
+def storage(n: int) -> Contract:
+    """`n` public storage variables, each of which creates a getter."""
+    source = "\n".join(f"var{i}: public(uint256)" for i in range(n))
+    return source, {}
+
+
+def nesting(n: int) -> Contract:
+    """
+    A single expression with a nesting depth of `n`.
+
+    Python 3.8 fails to parse expressions nested more than ~90 levels deep.
+    """
+    expr = "a"
+    for i in range(n):
+        op = "+" if i % 2 else "*"
+        expr = f"({expr} {op} {i + 1})"
+    source = f"@external\ndef foo(a: uint256) -> uint256:\n    return {expr}\n"
+    return source, {}
+
+
+def loop_body(n: int) -> Contract:
+    """A `for` loop containing `n` statements."""
+    body = "\n".join(f"        x += a * {i}" for i in range(n))
+    source = f"""
+@external
+def foo(a: uint256) -> uint256:
+    x: uint256 = 0
+    for i in range(10):
+{body}
+    return x
+"""
+    return source, {}
+
+
+def structs_events(n: int) -> Contract:
+    """`n` structs and `n` events, all of which are used within a single function."""
+    declarations = "\n".join(
+        f"struct Struct{i}:\n    a: uint256\n    b: address\n\n"
+        f"event Event{i}:\n    sender: indexed(address)\n    value: uint256\n"
+        for i in range(n)
+    )
+    body = "\n".join(
+        f"    s{i}: Struct{i} = Struct{i}({{a: a, b: msg.sender}})\n"
+        f"    log Event{i}(s{i}.b, s{i}.a)"
+        for i in range(n)
+    )
+    source = f"{declarations}\n@external\ndef foo(a: uint256):\n{body}\n"
+    return source, {}
+
+
+def interfaces(n: int) -> Contract:
+    """`n` imported interfaces, all of which are called within a single function."""
+    imports = "\n".join(f"import interface{i} as Interface{i}" for i in range(n))
+    body = "\n".join(f"    x += Interface{i}(target).bar{i}(a)" for i in range(n))
+    source = f"""{imports}
+
+@external
+def foo(target: address, a: uint256) -> uint256:
+    x: uint256 = 0
+{body}
+    return x
+"""
+    interface_codes = {
+        f"Interface{i}": {
+            "type": "vyper",
+            "code": f"@external\ndef bar{i}(a: uint256) -> uint256:\n    pass\n",
+        }
+        for i in range(n)
+    }
+    return source, interface_codes
+
+
+# axis name -> (generator, sizes)
+AXES: Dict[str, Tuple[Callable[[int], Contract], Tuple[int, ...]]] = {
+    "functions": (functions, (16, 32, 64, 128)),
+    "storage": (storage, (16, 32, 64, 128)),
+    "nesting": (nesting, (8, 16, 32, 64)),
+    "loop_body": (loop_body, (16, 32, 64, 128)),
+    "structs_events": (structs_events, (8, 16, 32, 64)),
+    "interfaces": (interfaces, (8, 16, 32, 64)),
+}
@@ -0,0 +1,239 @@
+"""
+Compiler benchmark suite.
+
+Compiles the contracts in `examples/` and synthetic contracts that scale along a
+single axis, recording the time and memory used in each compiler phase. For each
+axis, a power law is fitted to the measurements. The resulting exponent is ~1 for
+a phase that scales linearly, and ~2 for a phase that scales quadratically.
+
+Usage:
+
+    python -m benchmarks.run                  # compare against the stored baseline
+    python -m benchmarks.run --save-baseline  # overwrite the stored baseline
+
+A comparison run exits with status 1 if any exponent has increased by more than
+the given tolerance, relative to the baseline.
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import vyper
+from benchmarks.generators import AXES
+from vyper.cli.vyper_compile import get_interface_codes
+from vyper.compiler.phases import CompilerData
+from vyper.session import CompilationSession
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent.joinpath("baseline.json")
+
+# phases that take less time (in seconds) or memory (in bytes) than this at the
+# largest size of an axis are too noisy to gate on
+MIN_PHASE_TIME = 0.005
+MIN_PHASE_MEMORY = 64 * 1024
+
+# default allowed increase of a fitted exponent, relative to the baseline
+DEFAULT_TOLERANCE = 0.35
+
+
+def profile_contract(
+    source_code: str, interface_codes: Optional[Dict] = None, contract_name: str = "Benchmark"
+) -> Dict[str, dict]:
+    """
+    Compile a contract and return the profile data for each phase.
+    """
+    with CompilationSession():
+        compiler_data = CompilerData(
+            source_code, contract_name, interface_codes=interface_codes, profile=True
+        )
+        compiler_data.bytecode
+        compiler_data.bytecode_runtime
+        compiler_data.source_map
+    return compiler_data.profiler.phases  # type: ignore
+
+
+def measure(
+    source_code: str,
+    interface_codes: Optional[Dict] = None,
+    contract_name: str = "Benchmark",
+    repeat: int = 3,
+) -> Dict[str, dict]:
+    """
+    Compile a contract `repeat` times and return the fastest time and peak memory
+    of each phase, and the total.
+    """
+    runs = [profile_contract(source_code, interface_codes, contract_name) for _ in range(repeat)]
+    result = {}
+    for phase in runs[0]:
+        result[phase] = {
+            "wall_time": min(i[phase]["wall_time"] for i in runs),
+            "peak_memory": min(i[phase]["peak_memory"] for i in runs),
+        }
+    result["total"] = {
+        "wall_time": sum(i["wall_time"] for i in result.values()),
+        "peak_memory": max(i["peak_memory"] for i in result.values()),
+    }
+    return result
+
+
+def fit_exponent(sizes: Sequence[int], values: Sequence[float]) -> float:
+    """
+    Fit `value = c * size ** k` with least squares on a log-log scale, and return `k`.
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(sizes, values) if y > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(i[0] for i in points) / len(points)
+    mean_y = sum(i[1] for i in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return round(covariance / variance, 3)
+
+
+def run_axis(name: str, repeat: int = 3) -> dict:
+    """
+    Benchmark a single scaling axis and fit the exponent of each phase.
+    """
+    generator, sizes = AXES[name]
+    measurements = [measure(*generator(n), repeat=repeat) for n in sizes]  # type: ignore
+
+    data: dict = {"sizes": list(sizes), "phases": {}}
+    for phase in measurements[-1]:
+        times = [i.get(phase, {}).get("wall_time", 0) for i in measurements]
+        memory = [i.get(phase, {}).get("peak_memory", 0) for i in measurements]
+        data["phases"][phase] = {
+            "wall_time": times,
+            "peak_memory": memory,
+            "time_exponent": fit_exponent(sizes, times),
+            "memory_exponent": fit_exponent(sizes, memory),
+        }
+    return data
+
+
+def run_examples(repeat: int = 3) -> dict:
+    """
+    Benchmark each contract within `examples/`.
+    """
+    contract_sources = {}
+    for path in sorted(ROOT_PATH.joinpath("examples").glob("**/*.vy")):
+        contract_sources[path.relative_to(ROOT_PATH).as_posix()] = path.read_text()
+    interface_codes = get_interface_codes(ROOT_PATH, contract_sources)
+
+    return {
+        name: measure(source, interface_codes[name], name, repeat)
+        for name, source in contract_sources.items()
+    }
+
+
+def run(axes: Sequence[str], repeat: int = 3, examples: bool = True) -> dict:
+    results: dict = {"compiler": f"{vyper.__version__}+commit.{vyper.__commit__}", "axes": {}}
+    for name in axes:
+        results["axes"][name] = run_axis(name, repeat)
+    if examples:
+        results["examples"] = run_examples(repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Compare fitted exponents against a baseline.
+
+    Returns
+    -------
+    List[str]
+        Description of each regression. Empty if there were no regressions.
+    """
+    regressions = []
+    for axis, data in results["axes"].items():
+        if axis not in baseline["axes"]:
+            continue
+        baseline_phases = baseline["axes"][axis]["phases"]
+        for phase, phase_data in data["phases"].items():
+            if phase not in baseline_phases:
+                continue
+            for key, values, minimum in (
+                ("time_exponent", "wall_time", MIN_PHASE_TIME),
+                ("memory_exponent", "peak_memory", MIN_PHASE_MEMORY),
+            ):
+                if phase_data[values][-1] < minimum:
+                    continue
+                expected = baseline_phases[phase][key]
+                if phase_data[key] > expected + tolerance:
+                    regressions.append(
+                        f"{axis}/{phase}: {key} increased from {expected} to {phase_data[key]}"
+                    )
+    return regressions
+
+
+def print_summary(results: dict) -> None:
+    print(f"{'axis':<16}{'phase':<30}{'time k':>8}{'memory k':>10}{'time (s)':>10}")
+    for axis, data in results["axes"].items():
+        for phase, phase_data in data["phases"].items():
+            print(
+                f"{axis:<16}{phase:<30}{phase_data['time_exponent']:>8.2f}"
+                f"{phase_data['memory_exponent']:>10.2f}{phase_data['wall_time'][-1]:>10.4f}"
+            )
+    for name, data in results.get("examples", {}).items():
+        print(f"{name:<64}{data['total']['wall_time']:>10.4f}")
+
+
+def _parse_args(argv: Sequence[str]) -> Tuple[argparse.Namespace, List[str]]:
+    parser = argparse.ArgumentParser(description="Vyper compiler benchmark suite")
+    parser.add_argument(
+        "--axis",
+        help="Scaling axis to benchmark, may be given multiple times (default: all)",
+        action="append",
+        choices=list(AXES),
+        dest="axes",
+    )
+    parser.add_argument(
+        "--repeat", help="Number of times to compile each contract", type=int, default=3
+    )
+    parser.add_argument(
+        "--no-examples", help="Do not benchmark contracts in examples/", action="store_true"
+    )
+    parser.add_argument("--baseline", help="Path to the baseline JSON", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", help="Store the results as the new baseline", action="store_true"
+    )
+    parser.add_argument(
+        "--tolerance",
+        help=f"Allowed increase of a fitted exponent (default {DEFAULT_TOLERANCE})",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+    )
+    parser.add_argument("-o", help="Save the results to this file", dest="output_file")
+    args = parser.parse_args(argv)
+    return args, args.axes or list(AXES)
+
+
+def main(argv: Sequence[str]) -> int:
+    args, axes = _parse_args(argv)
+    results = run(axes, args.repeat, not args.no_examples)
+    print_summary(results)
+
+    if args.output_file:
+        Path(args.output_file).write_text(json.dumps(results, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline found at {baseline_path}, use --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    for msg in regressions:
+        print(f"REGRESSION: {msg}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
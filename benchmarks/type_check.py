@@ -0,0 +1,113 @@
+"""
+Benchmark for semantic validation of deeply nested expressions.
+
+Times `validate_semantics` on contracts containing a single expression nested
+30 levels deep, for several kinds of expression. Without memoization of the
+possible types of each node, some of these take exponential time.
+
+Usage:
+
+    python -m benchmarks.type_check
+"""
+
+import argparse
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.ast_index import _best_time
+from vyper import ast as vy_ast
+from vyper.context import validate_semantics
+from vyper.session import CompilationSession
+
+
+def _arithmetic(depth: int) -> str:
+    expr = "a"
+    for i in range(depth):
+        op = "+" if i % 2 else "*"
+        expr = f"({expr} {op} {i + 1})"
+    return expr
+
+
+def _unary(depth: int) -> str:
+    expr = "b"
+    for i in range(depth):
+        expr = f"-({expr} + {i + 1})"
+    return f"convert({expr}, uint256)"
+
+
+def _convert(depth: int) -> str:
+    expr = "a"
+    for i in range(depth):
+        expr = f"convert({expr}, {'int128' if i % 2 else 'uint256'})"
+    return f"convert({expr}, uint256)"
+
+
+def _min_max(depth: int) -> str:
+    expr = "a"
+    for i in range(depth):
+        expr = f"{'max' if i % 2 else 'min'}({expr}, {i + 1})"
+    return expr
+
+
+def _comparison(depth: int) -> str:
+    expr = "a > 0"
+    for i in range(depth):
+        op = "or" if i % 2 else "and"
+        expr = f"({expr}) {op} (a + {i} != {2 * i})"
+    return f"convert({expr}, uint256)"
+
+
+EXPRESSIONS: Dict[str, Callable[[int], str]] = {
+    "arithmetic": _arithmetic,
+    "unary": _unary,
+    "convert": _convert,
+    "min / max": _min_max,
+    "comparison": _comparison,
+}
+
+
+def generate_module(expr: str) -> vy_ast.Module:
+    """
+    Generate a folded module with a function that returns the given expression.
+    """
+    source = f"@external\ndef foo(a: uint256, b: int128) -> uint256:\n    return {expr}\n"
+    vyper_module = vy_ast.parse_to_ast(source)
+    vy_ast.folding.fold(vyper_module)
+    return vyper_module
+
+
+def run(depth: int = 30, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time semantic validation for each kind of nested expression.
+
+    Returns
+    -------
+    dict
+        `{"expression kind": time in seconds}`
+    """
+    results = {}
+    for name, generate in EXPRESSIONS.items():
+        vyper_module = generate_module(generate(depth))
+
+        def validate() -> None:
+            with CompilationSession():
+                validate_semantics(vyper_module, None)
+
+        results[name] = _best_time(validate, repeat)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark validation of nested expressions")
+    parser.add_argument("--depth", type=int, default=30, help="Nesting depth of each expression")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per expression")
+    args = parser.parse_args(argv)
+
+    results = run(args.depth, args.repeat)
+    print(f"Expressions nested {args.depth} levels deep\n")
+    print(f"{'expression':<22}{'time (ms)':>12}")
+    for name, value in results.items():
+        print(f"{name:<22}{value * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from vyper import ast as vy_ast
+
+code = """
+FOO: constant(uint256) = 6
+bar: public(uint256[FOO * 2])
+
+@external
+def baz(a: uint256, b: uint256 = 3) -> uint256:
+    for i in range(FOO):
+        if a > i:
+            return a + b
+    return min(a, b)
+"""
+
+
+def test_clone():
+    vyper_module = vy_ast.parse_to_ast(code)
+    cloned = vyper_module.clone()
+
+    assert isinstance(cloned, vy_ast.Module)
+    assert vy_ast.compare_nodes(vyper_module, cloned)
+    assert cloned.to_dict() == vyper_module.to_dict()
+
+
+def test_clone_does_not_share_nodes():
+    vyper_module = vy_ast.parse_to_ast(code)
+    cloned = vyper_module.clone()
+
+    original_nodes = set(id(i) for i in vyper_module.get_descendants(include_self=True))
+    cloned_nodes = cloned.get_descendants(include_self=True)
+
+    assert len(original_nodes) == len(cloned_nodes)
+    assert not original_nodes.intersection(id(i) for i in cloned_nodes)
+    for node in cloned_nodes:
+        for child in node.get_children():
+            assert child._parent is node
+            assert child._depth == node._depth + 1
+
+
+def test_clone_shares_source():
+    vyper_module = vy_ast.parse_to_ast(code)
+    cloned = vyper_module.clone()
+
+    for original, node in zip(vyper_module.get_descendants(), cloned.get_descendants()):
+        assert node.full_source_code is original.full_source_code
+        assert node.node_source_code == original.node_source_code
+        assert node.src == original.src
+
+
+def test_fold_clone():
+    vyper_module = vy_ast.parse_to_ast(code)
+    expected = vyper_module.to_dict()
+
+    cloned = vyper_module.clone()
+    vy_ast.folding.fold(cloned)
+
+    assert not cloned.get_descendants(vy_ast.BinOp, {"op.ast_type": "Mult"})
+    assert vyper_module.to_dict() == expected
+    assert vyper_module.get_descendants(vy_ast.BinOp, {"op.ast_type": "Mult"})
+
+
+def test_clone_subtree():
+    vyper_module = vy_ast.parse_to_ast(code)
+    node = vyper_module.get_children(vy_ast.FunctionDef)[0]
+    cloned = node.clone()
+
+    assert vy_ast.compare_nodes(node, cloned)
+    assert cloned._parent is vyper_module
+    assert not [i for i in vyper_module.get_children() if i is cloned]
+    assert cloned.get_descendants(vy_ast.For)[0].get_ancestor(vy_ast.Module) is vyper_module
@@ -0,0 +1,32 @@
+import pytest
+
+from vyper import ast as vy_ast
+from vyper.ast import nodes
+
+NODE_CLASSES = [
+    v for v in nodes.__dict__.values() if isinstance(v, type) and issubclass(v, vy_ast.VyperNode)
+]
+
+
+@pytest.mark.parametrize("node_class", NODE_CLASSES)
+def test_get_fields(node_class):
+    slots = set(x for i in node_class.__mro__ for x in getattr(i, "__slots__", ()))
+
+    assert node_class.get_fields() == set(i for i in slots if not i.startswith("_"))
+    assert set(node_class._slot_names) == slots
+
+
+def test_replace_equal_node():
+    vyper_module = vy_ast.parse_to_ast("foo = 1")
+    old_node = vyper_module.body[0].value
+
+    # the new node compares equal to the node it replaces
+    new_node = vy_ast.Int.from_node(old_node, value=1)
+    assert new_node == old_node
+
+    vyper_module.replace_in_tree(old_node, new_node)
+    children = vyper_module.body[0].get_children()
+
+    assert len(children) == 2
+    assert children[1] is new_node
+    assert not [i for i in children if i is old_node]
@@ -69,3 +69,35 @@ def test_order_reversed():
     values = [i.value for i in node.get_descendants(vy_ast.Int, reverse=True)]
 
     assert values == [0, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+
+
+def _unindexed_descendants(node, node_type=None):
+    # search the tree directly, without using the module's index
+    result = []
+    for child in node.get_children():
+        if node_type is None or isinstance(child, node_type):
+            result.append(child)
+        result.extend(_unindexed_descendants(child, node_type))
+    return sorted(result, key=lambda k: (k.lineno, k.col_offset, k.node_id))
+
+
+def test_index_matches_tree():
+    for path in Path(".").glob("examples/**/*.vy"):
+        with path.open() as fp:
+            vyper_ast = vy_ast.parse_to_ast(fp.read())
+        for node_type in (None, vy_ast.Name, (vy_ast.Int, vy_ast.Decimal), vy_ast.Constant):
+            assert vyper_ast.get_descendants(node_type) == _unindexed_descendants(
+                vyper_ast, node_type
+            )
+
+
+def test_index_updated_on_replace():
+    vyper_ast = vy_ast.parse_to_ast("foo: constant(uint256) = 6\nbar: uint256[foo * (2 + 3)]")
+    assert len(vyper_ast.get_descendants(vy_ast.Int)) == 3
+
+    vy_ast.folding.fold(vyper_ast)
+
+    assert [i.value for i in vyper_ast.get_descendants(vy_ast.Int)] == [6, 30]
+    assert not vyper_ast.get_descendants(vy_ast.BinOp)
+    for node_type in (None, vy_ast.Int, vy_ast.Name):
+        assert vyper_ast.get_descendants(node_type) == _unindexed_descendants(vyper_ast, node_type)
@@ -0,0 +1,39 @@
+from vyper import ast as vy_ast
+
+code = """
+@external
+def foo(a: uint256) -> int128:
+    b: int128 = -42
+    return (b + 1) * 2
+"""
+
+
+def test_node_source_code():
+    vyper_module = vy_ast.parse_to_ast(code)
+
+    fn_node = vyper_module.body[0]
+    assert fn_node.node_source_code == code.strip()[code.strip().index("def") :]  # noqa: E203
+
+    binop = vyper_module.get_descendants(vy_ast.BinOp, {"op.ast_type": "Mult"})[0]
+    assert binop.node_source_code == "(b + 1) * 2"
+
+
+def test_negative_literal():
+    vyper_module = vy_ast.parse_to_ast(code)
+    node = vyper_module.get_descendants(vy_ast.Int, {"value": -42})[0]
+
+    assert node.node_source_code == "-42"
+
+
+def test_shared_source():
+    vyper_module = vy_ast.parse_to_ast(code)
+
+    for node in vyper_module.get_descendants():
+        assert node.full_source_code is vyper_module.full_source_code
+
+
+def test_not_in_dict():
+    ast_dict = vy_ast.parse_to_ast(code).to_dict()
+
+    for key in ("full_source_code", "node_source_code", "source_start", "source_end"):
+        assert key not in ast_dict
@@ -236,3 +236,37 @@ def test_replace_builtins(source, original, result):
     folding.replace_builtin_functions(original_ast)
 
     assert vy_ast.compare_nodes(original_ast, target_ast)
+
+
+def test_fold_dependent_constants():
+    source = "\n".join(f"C{i}: constant(uint256) = C{i - 1} + 1" for i in range(1, 50))
+    test_ast = vy_ast.parse_to_ast(f"C0: constant(uint256) = 1\n{source}\nfoo: uint256[C49]")
+    expected_ast = vy_ast.parse_to_ast(
+        "\n".join(f"C{i}: constant(uint256) = {i + 1}" for i in range(50)) + "\nfoo: uint256[50]"
+    )
+
+    changed_nodes = folding.fold(test_ast)
+
+    assert vy_ast.compare_nodes(test_ast, expected_ast)
+    assert changed_nodes["user_constants"] == 50
+    assert changed_nodes["literal_ops"] == 49
+
+
+def test_fold_counts():
+    source = """
+FOO: constant(uint256[3]) = [1, 2, 3]
+BAR: constant(uint256) = FOO[1] * 2
+
+@external
+def foo() -> uint256:
+    return MAX_UINT256 - BAR - floor(2.5)
+    """
+    test_ast = vy_ast.parse_to_ast(source)
+
+    assert folding.fold(test_ast) == {
+        "builtin_constants": 1,
+        "user_constants": 2,
+        "literal_ops": 3,
+        "subscripts": 1,
+        "builtin_functions": 1,
+    }
@@ -0,0 +1,180 @@
+from pathlib import Path
+
+import pytest
+
+from vyper import ast as vy_ast
+from vyper.exceptions import SyntaxException
+
+EXAMPLES = sorted(Path(__file__).parent.parent.parent.joinpath("examples").glob("**/*.vy"))
+
+code = '''"""
+@title Module docstring
+"""
+
+# a comment
+struct Foo:
+    a: uint256
+    b: int128
+
+event Bar:
+    value: uint256
+
+foo: public(uint256)
+bar: HashMap[address, Foo]
+
+@external
+@view
+def baz(x: uint256) -> uint256:
+    """
+    @notice function docstring
+    """
+    y: uint256 = x + 1 + 2
+    return y * -2
+
+@internal
+def qux():
+    log Bar(self.foo)
+'''
+
+# (old text, new text), the first occurrence of the old text is replaced
+edits = [
+    ("x + 1 + 2", "x + 12"),
+    ("x + 1 + 2", "x + 1 + 2 + 3 + 4"),
+    ("    return y * -2\n", "    return y * -2\n    z: decimal = -1.5\n"),
+    ("foo: public(uint256)\n", ""),
+    ("foo: public(uint256)\n", "foo: public(uint256)\nqwerty: Bytes[3]\n"),
+    ("@internal\n", "\n\n@internal\n"),
+    ("@internal\n", "@external\n@payable\n"),
+    ("struct Foo:", "struct Food:"),
+    ("    log Bar(self.foo)\n", "    log Bar(self.foo)\n    pass\n\n# trailing comment\n"),
+    ("event Bar:\n    value: uint256\n\n", ""),
+    ("    b: int128\n", "    b: int128\n    c: address\n"),
+    ("# a comment\n", "# another comment\n"),
+    ('"""\n@title Module docstring\n"""', '"""docstring"""'),
+]
+
+
+def _apply_edit(source_code, old_text, new_text):
+    start = source_code.index(old_text)
+    end = start + len(old_text)
+    return start, end, source_code[:start] + new_text + source_code[end:]
+
+
+def _assert_equal(new_module, expected):
+    assert new_module.to_dict() == expected.to_dict()
+    assert new_module._singleton_ids == expected._singleton_ids
+    assert new_module.full_source_code == expected.full_source_code
+
+    new_nodes = [new_module] + new_module.get_descendants()
+    expected_nodes = [expected] + expected.get_descendants()
+    assert len(new_nodes) == len(expected_nodes)
+    for node, expected_node in zip(new_nodes, expected_nodes):
+        assert node.node_source_code == expected_node.node_source_code
+        assert node.full_source_code is new_module.full_source_code
+        for child in node.get_children():
+            assert child.get_ancestor() is node
+            assert child._depth == node._depth + 1
+
+
+@pytest.mark.parametrize("old_text,new_text", edits)
+def test_reparse(old_text, new_text):
+    module = vy_ast.parse_to_ast(code, 1, "test")
+    start, end, new_code = _apply_edit(code, old_text, new_text)
+
+    new_module = vy_ast.reparse_to_ast(module, start, end, new_text)
+    _assert_equal(new_module, vy_ast.parse_to_ast(new_code, 1, "test"))
+
+
+def test_operator_node_ids():
+    # every occurrence of an operator shares the node ID of the last occurrence
+    module = vy_ast.parse_to_ast(code)
+    start, end, _ = _apply_edit(code, "foo: public(uint256)\n", "")
+    module = vy_ast.reparse_to_ast(module, start, end, "")
+
+    add_nodes = module.get_descendants(vy_ast.Add)
+    assert len(add_nodes) == 2
+    assert add_nodes[0].node_id == add_nodes[1].node_id == module._singleton_ids["Add"][-1]
+
+
+def test_unchanged_statements_reused():
+    module = vy_ast.parse_to_ast(code)
+    first, last = module.body[0], module.body[-1]
+    start, end, _ = _apply_edit(code, "x + 1 + 2", "x + 3")
+
+    new_module = vy_ast.reparse_to_ast(module, start, end, "x + 3")
+    assert new_module.body[0] is first
+    assert new_module.body[-1] is last
+
+
+def test_successive_edits():
+    module = vy_ast.parse_to_ast(code)
+    source_code = code
+
+    # skip edits that replace text removed by a previous edit
+    for old_text, new_text in edits[:1] + edits[2:4] + edits[5:]:
+        start, end, source_code = _apply_edit(source_code, old_text, new_text)
+        module = vy_ast.reparse_to_ast(module, start, end, new_text)
+        _assert_equal(module, vy_ast.parse_to_ast(source_code))
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=[i.stem for i in EXAMPLES])
+def test_insert_lines(path):
+    source_code = path.read_text()
+    module = vy_ast.parse_to_ast(source_code)
+
+    # insert and then remove a statement at the start of every 8th line
+    lines = source_code.splitlines(keepends=True)
+    for idx in range(0, len(lines), 8):
+        offset = sum(len(i) for i in lines[:idx])
+        line = lines[idx]
+        new_text = f"{line[:len(line) - len(line.lstrip())]}pass\n"
+        new_code = source_code[:offset] + new_text + source_code[offset:]
+        try:
+            expected = vy_ast.parse_to_ast(new_code)
+        except Exception:
+            continue
+        module = vy_ast.reparse_to_ast(module, offset, offset, new_text)
+        _assert_equal(module, expected)
+
+        module = vy_ast.reparse_to_ast(module, offset, offset + len(new_text), "")
+
+    _assert_equal(module, vy_ast.parse_to_ast(source_code))
+
+
+def test_edit_log_statement():
+    # the offsets of a `log` statement may extend past the last token of the reparsed
+    # region, the source is then parsed again in full
+    source_code = """
+event Foo:
+    a: address
+    b: int128
+
+y: int128
+
+@external
+def foo(x: int128):
+    log Foo(msg.sender, x)
+
+@external
+def bar():
+    self.y = 0
+"""
+    module = vy_ast.parse_to_ast(source_code)
+    start, end, new_code = _apply_edit(source_code, "msg.sender", "m==g.sender")
+
+    new_module = vy_ast.reparse_to_ast(module, start, end, "m==g.sender")
+    _assert_equal(new_module, vy_ast.parse_to_ast(new_code))
+
+
+@pytest.mark.parametrize(
+    "old_text,new_text", [("y: uint256", "y: uint256 ="), ("def qux():", "def qux("), (":", ";")]
+)
+def test_syntax_error(old_text, new_text):
+    start, end, new_code = _apply_edit(code, old_text, new_text)
+    with pytest.raises(SyntaxException) as expected:
+        vy_ast.parse_to_ast(new_code)
+
+    module = vy_ast.parse_to_ast(code)
+    with pytest.raises(SyntaxException) as exc_info:
+        vy_ast.reparse_to_ast(module, start, end, new_text)
+    assert str(exc_info.value) == str(expected.value)
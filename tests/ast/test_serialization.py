@@ -0,0 +1,82 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from vyper import ast as vy_ast
+from vyper.ast import serialization
+from vyper.exceptions import CompilerPanic
+
+EXAMPLES = sorted(Path(__file__).parent.parent.parent.joinpath("examples").glob("**/*.vy"))
+
+code = """
+x: public(decimal)
+y: Bytes[3]
+
+@external
+def foo(a: uint256 = 2**200) -> bool:
+    b: decimal = -1.5
+    c: Bytes[3] = b"abc"
+    d: bytes32 = 0x0000000000000000000000000000000000000000000000000000000000000001
+    e: int128 = -42
+    f: String[10] = "héllo"
+    return True
+"""
+
+sources = [code] + [i.read_text() for i in EXAMPLES]
+source_ids = ["code"] + [i.stem for i in EXAMPLES]
+
+
+@pytest.mark.parametrize("source_code", sources, ids=source_ids)
+def test_round_trip(source_code):
+    vyper_module = vy_ast.parse_to_ast(source_code)
+    new_module = serialization.load(serialization.dump(vyper_module))
+
+    assert isinstance(new_module, vy_ast.Module)
+    assert new_module.to_dict() == vyper_module.to_dict()
+    assert vy_ast.compare_nodes(new_module, vyper_module)
+
+
+def test_round_trip_matches_dict_to_ast():
+    vyper_module = vy_ast.parse_to_ast(code)
+    from_binary = serialization.load(serialization.dump(vyper_module))
+    from_dict = vy_ast.nodes.get_node(vyper_module.to_dict())
+
+    for left, right in zip(
+        [from_binary] + from_binary.get_descendants(), [from_dict] + from_dict.get_descendants()
+    ):
+        assert type(left) is type(right)
+        assert left.node_id == right.node_id
+        assert left.src == right.src
+        assert left.get("value") == right.get("value")
+
+
+def test_smaller_than_json():
+    vyper_module = vy_ast.parse_to_ast(code)
+    data = serialization.dump(vyper_module)
+
+    assert len(data) * 4 < len(json.dumps(vyper_module.to_dict(), default=str))
+
+
+@pytest.mark.parametrize("data", [b"", b"VYAST", b"VYAST\x00\x00\x00", b"foo"])
+def test_load_invalid(data):
+    with pytest.raises(CompilerPanic):
+        serialization.load(data)
+
+
+@pytest.mark.parametrize("source_code", sources, ids=source_ids)
+def test_dump_json(source_code):
+    vyper_module = vy_ast.parse_to_ast(source_code)
+
+    fp = io.StringIO()
+    serialization.dump_json(vyper_module, fp, default=str)
+
+    assert fp.getvalue() == json.dumps(vyper_module.to_dict(), default=str)
+
+
+def test_dump_json_unserializable():
+    vyper_module = vy_ast.parse_to_ast(code)
+
+    with pytest.raises(TypeError):
+        serialization.dump_json(vyper_module, io.StringIO())
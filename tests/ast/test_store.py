@@ -0,0 +1,67 @@
+import vyper
+from vyper.ast import Module, ModuleStore, compare_nodes, parse_to_ast
+from vyper.ast import store as store_module
+
+CODE = """
+@external
+def foo() -> uint256:
+    return 42
+"""
+
+INTERFACE_CODE = """
+@external
+def foo() -> uint256:
+    pass
+"""
+
+CONTRACT_CODE = """
+import bar as Bar
+
+implements: Bar
+
+@external
+def foo() -> uint256:
+    return 42
+"""
+
+
+def test_parse_is_cached():
+    store = ModuleStore()
+    vyper_module = store.parse(CODE, 1, "foo.vy")
+
+    assert isinstance(vyper_module, Module)
+    assert compare_nodes(vyper_module, parse_to_ast(CODE, 1, "foo.vy"))
+    assert store.parse(CODE, 1, "foo.vy") is vyper_module
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_key_includes_source_id_and_name():
+    store = ModuleStore()
+    vyper_module = store.parse(CODE, 0, "foo.vy")
+
+    assert store.parse(CODE, 1, "foo.vy") is not vyper_module
+    assert store.parse(CODE, 0, "bar.vy") is not vyper_module
+    assert store.parse(f"{CODE}\n", 0, "foo.vy") is not vyper_module
+    assert len(store) == 4
+
+
+def test_shared_interface_parsed_once(monkeypatch):
+    parsed = []
+
+    def parse_to_ast(source_code, source_id=0, contract_name=None):
+        parsed.append(contract_name)
+        return vyper.ast.parse_to_ast(source_code, source_id, contract_name)
+
+    monkeypatch.setattr(store_module, "parse_to_ast", parse_to_ast)
+
+    interface_codes = {"Bar": {"type": "vyper", "code": INTERFACE_CODE}}
+    store = ModuleStore()
+    vyper.compile_codes(
+        {"foo.vy": CONTRACT_CODE, "baz.vy": CONTRACT_CODE},
+        ["bytecode"],
+        interface_codes=interface_codes,
+        module_store=store,
+    )
+
+    assert sorted(parsed) == ["Bar", "baz.vy", "foo.vy"]
+    assert store.hits > 0
@@ -0,0 +1,40 @@
+import ast as python_ast
+from pathlib import Path
+
+import asttokens
+import pytest
+
+from vyper.ast.pre_parser import pre_parse_tokens
+from vyper.ast.tokens import SourceTokens, mark_tokens
+
+EXAMPLES = sorted(Path(__file__).parent.parent.parent.joinpath("examples").glob("**/*.vy"))
+
+sources = [
+    "x: int128",
+    "foo(\n  a,\n  b,\n)\n",
+    "x = 'é' + 'ü'\ny = (1, 2,)\nz = 1, 2\n",
+    "x = -1.5\ny = {'a': 1, 'b': [1, 2,]}[2][:]\n",
+    "@a\n@b()\ndef f(x: uint256 = 1, *y, **z):\n    pass\n",
+    "log Foo(a, b=c)  # comment\nif a:\n    pass\nelif b: pass\n",
+]
+
+
+def _get_offsets(tree):
+    return [
+        (type(node).__name__, node.first_token.startpos, node.last_token.endpos)
+        for node in python_ast.walk(tree)
+        if hasattr(node, "first_token")
+    ]
+
+
+@pytest.mark.parametrize("source_code", sources + [i.read_text() for i in EXAMPLES])
+def test_matches_asttokens(source_code):
+    _, reformatted_code, token_list = pre_parse_tokens(source_code)
+
+    expected = python_ast.parse(reformatted_code)
+    asttokens.ASTTokens(source_code, tree=expected)
+
+    tree = python_ast.parse(reformatted_code)
+    mark_tokens(tree, SourceTokens(source_code, token_list))
+
+    assert _get_offsets(tree) == _get_offsets(expected)
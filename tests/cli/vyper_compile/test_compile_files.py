@@ -52,3 +52,43 @@ def foo() -> uint256:
     # SELFBALANCE opcode is 0x47
     assert "47" not in byzantium_bytecode
     assert "47" in istanbul_bytecode
+
+
+def test_parallel_jobs(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path.joinpath(f"foo{i}.vy")
+        with path.open("w") as fp:
+            fp.write(f"@external\ndef foo() -> uint256:\n    return {i}\n")
+        paths.append(path)
+
+    serial = compile_files(paths, ["combined_json"], root_folder=tmp_path)
+    parallel = compile_files(paths, ["combined_json"], root_folder=tmp_path, jobs=2)
+    assert serial == parallel
+
+
+def test_sources_parsed_once(tmp_path, monkeypatch):
+    from vyper.ast import store as store_module
+
+    parsed = []
+    parse_to_ast = store_module.parse_to_ast
+
+    def counting_parse(source_code, source_id=0, contract_name=None):
+        parsed.append(contract_name)
+        return parse_to_ast(source_code, source_id, contract_name)
+
+    monkeypatch.setattr(store_module, "parse_to_ast", counting_parse)
+
+    with tmp_path.joinpath("bar.vy").open("w") as fp:
+        fp.write("@external\ndef bar() -> uint256:\n    pass\n")
+    paths = []
+    for name in ("foo", "baz"):
+        paths.append(tmp_path.joinpath(f"{name}.vy"))
+        with paths[-1].open("w") as fp:
+            fp.write("import bar as Bar\n\nimplements: Bar\n\n")
+            fp.write("@external\ndef bar() -> uint256:\n    return 42\n")
+
+    compile_files(paths, ["bytecode", "abi"], root_folder=tmp_path)
+
+    # both contracts and the shared interface are parsed exactly once
+    assert sorted(parsed) == ["Bar", "baz.vy", "foo.vy"]
@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from vyper.cli.import_graph import BuildManifest, ImportGraph
+from vyper.cli.vyper_compile import compile_files
+
+BAZ_CODE = """
+@external
+def baz() -> uint256:
+    pass
+"""
+
+BAR_CODE = """
+import baz as Baz
+
+@external
+def bar() -> uint256:
+    return Baz(msg.sender).baz()
+"""
+
+FOO_CODE = """
+import bar as Bar
+
+@external
+def foo() -> uint256:
+    return Bar(msg.sender).bar()
+"""
+
+QUX_CODE = """
+@external
+def qux() -> uint256:
+    return 42
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name, code in (("foo", FOO_CODE), ("bar", BAR_CODE), ("baz", BAZ_CODE), ("qux", QUX_CODE)):
+        with tmp_path.joinpath(f"{name}.vy").open("w") as fp:
+            fp.write(code)
+    return tmp_path
+
+
+def test_dependencies_in_build_order(project):
+    graph = ImportGraph(project, {"foo.vy": FOO_CODE, "qux.vy": QUX_CODE})
+
+    assert graph.get_imports("foo.vy") == {"Bar": "bar.vy"}
+    assert graph.get_dependencies("foo.vy") == ["baz.vy", "bar.vy"]
+    assert graph.get_dependencies("qux.vy") == []
+    assert graph.get_interface_codes("foo.vy") == {"Bar": {"type": "vyper", "code": BAR_CODE}}
+
+
+def test_unresolved_interface_import(project):
+    with project.joinpath("baz.vy").open("w") as fp:
+        fp.write(f"import missing as Missing\n{BAZ_CODE}")
+    graph = ImportGraph(project, {"foo.vy": FOO_CODE})
+
+    # imports within an interface that cannot be found are treated as leaves
+    assert graph.get_dependencies("foo.vy") == ["baz.vy", "bar.vy"]
+    output = compile_files([project.joinpath("foo.vy")], ["dependencies"], root_folder=project)
+    assert output["foo.vy"]["dependencies"]["dependencies"] == ["baz.vy", "bar.vy"]
+
+
+def test_unresolved_contract_import(project):
+    graph = ImportGraph(project, {"foo.vy": "import missing as Missing\n"})
+    with pytest.raises(FileNotFoundError):
+        graph.get_dependencies("foo.vy")
+
+
+def test_filesystem_lookups_cached(project, monkeypatch):
+    contract_sources = {f"foo{i}.vy": FOO_CODE for i in range(5)}
+    for path in contract_sources:
+        with project.joinpath(path).open("w") as fp:
+            fp.write(FOO_CODE)
+    graph = ImportGraph(project, contract_sources)
+
+    lookups = []
+    exists = Path.exists
+
+    def counting_exists(path):
+        lookups.append(path)
+        return exists(path)
+
+    monkeypatch.setattr(Path, "exists", counting_exists)
+    for path in contract_sources:
+        graph.get_dependencies(path)
+
+    # every path is only checked once
+    assert lookups
+    assert len(lookups) == len(set(lookups))
+
+
+def test_digest(project):
+    graph = ImportGraph(project, {"foo.vy": FOO_CODE, "qux.vy": QUX_CODE})
+    digest = graph.get_digest("foo.vy")
+
+    assert graph.get_digest("foo.vy") == digest
+    assert graph.get_digest("foo.vy", {"evm_version": "byzantium"}) != digest
+
+    # modifying a transitive import changes the digest
+    with project.joinpath("baz.vy").open("w") as fp:
+        fp.write(f"{BAZ_CODE}\n# modified")
+    assert ImportGraph(project, {"foo.vy": FOO_CODE}).get_digest("foo.vy") != digest
+
+
+def test_dependencies_output(project):
+    paths = [project.joinpath("foo.vy"), project.joinpath("qux.vy")]
+    output = compile_files(paths, ["dependencies"], root_folder=project)
+
+    assert output["foo.vy"] == {
+        "dependencies": {"imports": {"Bar": "bar.vy"}, "dependencies": ["baz.vy", "bar.vy"]}
+    }
+    assert output["qux.vy"] == {"dependencies": {"imports": {}, "dependencies": []}}
+
+
+def test_manifest_rebuilds_changed_contracts(project):
+    paths = [project.joinpath("foo.vy"), project.joinpath("qux.vy")]
+    manifest_path = project.joinpath("manifest.json").as_posix()
+
+    output = compile_files(paths, ["bytecode"], root_folder=project, manifest_path=manifest_path)
+    assert list(output) == ["foo.vy", "qux.vy"]
+    assert set(BuildManifest(manifest_path).contracts) == {"foo.vy", "qux.vy"}
+
+    # nothing has changed
+    output = compile_files(paths, ["bytecode"], root_folder=project, manifest_path=manifest_path)
+    assert list(output) == []
+
+    # a transitive import of foo.vy has changed
+    with project.joinpath("baz.vy").open("w") as fp:
+        fp.write(f"{BAZ_CODE}\n# modified")
+    output = compile_files(paths, ["bytecode"], root_folder=project, manifest_path=manifest_path)
+    assert list(output) == ["foo.vy"]
+
+    # different output formats require a rebuild
+    output = compile_files(paths, ["abi"], root_folder=project, manifest_path=manifest_path)
+    assert list(output) == ["foo.vy", "qux.vy"]
+
+
+def test_manifest_from_other_version(tmp_path):
+    manifest_path = tmp_path.joinpath("manifest.json")
+    with manifest_path.open("w") as fp:
+        json.dump({"compiler": "0.0.0", "contracts": {"foo.vy": "digest"}}, fp)
+
+    manifest = BuildManifest(manifest_path)
+    assert manifest.contracts == {}
+    assert manifest.is_changed("foo.vy", "digest")
@@ -0,0 +1,137 @@
+import io
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from vyper.cli.vyper_compile import _parse_args
+from vyper.cli.vyper_daemon import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    CompilerDaemon,
+)
+from vyper.cli.vyper_json import compile_json, exc_handler_to_dict
+from vyper.compiler.cache import CompilerCache
+
+FOO_CODE = """
+@external
+def foo(a: uint256) -> uint256:
+    return a + 1
+"""
+
+INPUT_JSON = {
+    "language": "Vyper",
+    "sources": {"contracts/foo.vy": {"content": FOO_CODE}},
+    "settings": {"outputSelection": {"*": ["abi", "evm.bytecode.object"]}},
+}
+
+
+def _compile_request(request_id, params=INPUT_JSON):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "compile", "params": params}
+
+
+def test_compile():
+    daemon = CompilerDaemon()
+    response = daemon.handle_request(_compile_request(1))
+
+    assert response == {"jsonrpc": "2.0", "id": 1, "result": compile_json(INPUT_JSON)}
+
+
+def test_compile_error():
+    daemon = CompilerDaemon()
+    input_json = {
+        "language": "Vyper",
+        "sources": {"contracts/foo.vy": {"content": "foo: bar"}},
+        "settings": {"outputSelection": {"*": ["abi"]}},
+    }
+    response = daemon.handle_request(_compile_request("a", input_json))
+
+    assert response["id"] == "a"
+    assert response["result"] == compile_json(input_json, exc_handler_to_dict)
+    assert response["result"]["errors"][0]["severity"] == "error"
+
+
+def test_invalid_requests():
+    daemon = CompilerDaemon()
+
+    assert daemon.handle_request([])["error"]["code"] == INVALID_REQUEST
+    assert daemon.handle_request({"id": 1, "method": "version"})["error"]["code"] == INVALID_REQUEST
+
+    response = daemon.handle_request({"jsonrpc": "2.0", "id": 1, "method": "foo"})
+    assert response["error"]["code"] == METHOD_NOT_FOUND
+
+    response = daemon.handle_request(_compile_request(2, "foo"))
+    assert response["error"]["code"] == INVALID_PARAMS
+
+    response = json.loads(daemon.handle_line("{not json"))
+    assert response["error"]["code"] == PARSE_ERROR
+    assert response["id"] is None
+
+
+def test_notification():
+    daemon = CompilerDaemon()
+    assert daemon.handle_request({"jsonrpc": "2.0", "method": "version"}) is None
+
+
+def test_pipelined_stdio(tmp_path):
+    cache = CompilerCache(tmp_path)
+    daemon = CompilerDaemon(cache=cache)
+    requests = [
+        _compile_request(1),
+        {"jsonrpc": "2.0", "id": 2, "method": "version"},
+        _compile_request(3),
+        {"jsonrpc": "2.0", "id": 4, "method": "shutdown"},
+        # requests after a shutdown are not processed
+        _compile_request(5),
+    ]
+    infile = io.StringIO("".join(json.dumps(i) + "\n" for i in requests))
+    outfile = io.StringIO()
+    daemon.serve_stdio(infile, outfile)
+
+    responses = [json.loads(i) for i in outfile.getvalue().splitlines()]
+    assert [i["id"] for i in responses] == [1, 2, 3, 4]
+    assert responses[0]["result"] == responses[2]["result"]
+    assert not daemon.is_running
+    # the second compilation is loaded from the cache
+    assert cache.hits > 0
+
+
+def test_socket(tmp_path):
+    socket_path = tmp_path.joinpath("vyper.sock").as_posix()
+    daemon = CompilerDaemon()
+    thread = threading.Thread(target=daemon.serve_socket, args=(socket_path,))
+    thread.start()
+
+    for _ in range(100):
+        try:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(socket_path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            client.close()
+            time.sleep(0.05)
+
+    with client:
+        requests = [_compile_request(1), {"jsonrpc": "2.0", "id": 2, "method": "shutdown"}]
+        client.sendall("".join(json.dumps(i) + "\n" for i in requests).encode())
+        with client.makefile("r") as fp:
+            responses = [json.loads(i) for i in fp]
+
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert [i["id"] for i in responses] == [1, 2]
+    assert responses[0]["result"] == compile_json(INPUT_JSON)
+
+
+def test_socket_requires_daemon():
+    with pytest.raises(SystemExit):
+        _parse_args(["--socket", "vyper.sock"])
+
+
+def test_input_files_required():
+    with pytest.raises(SystemExit):
+        _parse_args([])
@@ -139,3 +139,47 @@ def test_evm_version():
     compiled = compile_from_input_dict(input_json)
     input_json["settings"]["evmVersion"] = "istanbul"
     assert compiled != compile_from_input_dict(input_json)
+
+
+def test_parallel_outputs():
+    assert compile_from_input_dict(INPUT_JSON, jobs=2) == compile_from_input_dict(INPUT_JSON)
+
+
+@pytest.mark.parametrize(
+    "code,component", [(BAD_SYNTAX_CODE, "parser"), (BAD_COMPILER_CODE, "compiler")]
+)
+def test_parallel_exc_handler(code, component):
+    input_json = deepcopy(INPUT_JSON)
+    input_json["sources"]["badcode.vy"] = {"content": code}
+    result, _ = compile_from_input_dict(input_json, exc_handler_to_dict, jobs=2)
+    assert result == compile_from_input_dict(input_json, exc_handler_to_dict)[0]
+    assert result["errors"][0]["component"] == component
+
+
+def test_dependencies_output():
+    input_json = deepcopy(INPUT_JSON)
+    input_json["settings"]["outputSelection"] = {"*": ["dependencies"]}
+    result, _ = compile_from_input_dict(input_json)
+
+    assert result["contracts/foo.vy"] == {
+        "dependencies": {"imports": {"Bar": "contracts/bar"}, "dependencies": ["contracts/bar"]}
+    }
+    assert result["contracts/bar.vy"] == {"dependencies": {"imports": {}, "dependencies": []}}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_manifest(tmp_path, jobs):
+    manifest_path = tmp_path.joinpath("manifest.json").as_posix()
+    input_json = deepcopy(INPUT_JSON)
+    input_json["settings"]["outputSelection"] = {"*": ["abi"]}
+
+    result, _ = compile_from_input_dict(input_json, jobs=jobs, manifest_path=manifest_path)
+    assert sorted(result) == ["contracts/bar.vy", "contracts/foo.vy"]
+
+    result, _ = compile_from_input_dict(input_json, jobs=jobs, manifest_path=manifest_path)
+    assert result == {}
+
+    # foo.vy imports the JSON interface, so only foo.vy is rebuilt
+    input_json["interfaces"]["contracts/bar.json"]["abi"][0]["gas"] = 42
+    result, _ = compile_from_input_dict(input_json, jobs=jobs, manifest_path=manifest_path)
+    assert sorted(result) == ["contracts/foo.vy"]
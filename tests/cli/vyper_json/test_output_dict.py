@@ -20,9 +20,11 @@ def test_keys():
     assert output_json["sources"]["foo.vy"] == {"id": 0, "ast": data["ast_dict"]["ast"]}
     assert output_json["contracts"]["foo.vy"]["foo"] == {
         "abi": data["abi"],
+        "callGraph": data["call_graph"],
         "devdoc": data["devdoc"],
         "interface": data["interface"],
         "ir": data["ir"],
+        "profile": data["profile"],
         "userdoc": data["userdoc"],
         "evm": {
             "bytecode": {"object": data["bytecode"], "opcodes": data["opcodes"]},
@@ -0,0 +1,194 @@
+import asyncio
+import json
+
+import pytest
+
+import vyper
+from vyper.cli.vyper_json import compile_json
+from vyper.cli.vyper_serve import LatencyHistogram, ResultCache, VyperServer
+
+CODE = """
+@external
+def foo(a: uint256) -> uint256:
+    return a + 1
+"""
+
+
+@pytest.fixture
+def server():
+    server = VyperServer(workers=1, queue_size=0, cache_size=8)
+    yield server
+    server.close()
+
+
+def _run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def _post(server, path, data):
+    return _run(server.dispatch("POST", path, json.dumps(data).encode()))
+
+
+def test_compile_selected_formats(server):
+    status, response = _post(server, "/compile", {"code": CODE, "formats": ["abi", "bytecode"]})
+
+    assert status == 200
+    assert response.pop("status") == "success"
+    assert response == vyper.compile_code(CODE, ["abi", "bytecode"])
+
+
+def test_compile_default_formats(server):
+    status, response = _post(server, "/compile", {"code": CODE})
+
+    assert status == 200
+    assert "opcodes" in response
+    assert isinstance(response["ir"], str)
+    assert "profile" not in response
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"code": 42},
+        {"code": CODE, "formats": ["foo"]},
+        {"code": CODE, "formats": []},
+        {"code": CODE, "evm_version": "foo"},
+    ],
+)
+def test_invalid_input(server, data):
+    status, response = _post(server, "/compile", data)
+    assert status == 400
+    assert response["status"] == "failed"
+
+
+def test_compile_error(server):
+    status, response = _post(server, "/compile", {"code": CODE.replace("a + 1", "b + 1")})
+
+    assert status == 400
+    assert response["status"] == "failed"
+    assert "has not been declared" in response["message"]
+    assert "line 4" in response["message"]
+
+
+def test_compile_json(server):
+    input_json = {
+        "language": "Vyper",
+        "sources": {"foo.vy": {"content": CODE}},
+        "settings": {"outputSelection": {"*": ["abi", "evm.bytecode.object"]}},
+    }
+    status, response = _post(server, "/compile_json", input_json)
+
+    assert status == 200
+    assert response == compile_json(input_json)
+
+
+def test_result_cache(server):
+    data = {"code": CODE, "formats": ["bytecode"]}
+    first = _post(server, "/compile", data)
+    assert (server.cache.hits, server.cache.misses) == (0, 1)
+
+    second = _post(server, "/compile", data)
+    assert (server.cache.hits, server.cache.misses) == (1, 1)
+    assert first == second
+
+    # format order does not matter, the evm version does
+    _post(server, "/compile", {"code": CODE, "formats": ["bytecode", "bytecode"]})
+    assert (server.cache.hits, server.cache.misses) == (2, 1)
+    _post(server, "/compile", {"code": CODE, "formats": ["bytecode"], "evm_version": "byzantium"})
+    assert (server.cache.hits, server.cache.misses) == (2, 2)
+
+
+def test_in_flight_requests_are_shared(server):
+    data = json.dumps({"code": CODE, "formats": ["bytecode"]}).encode()
+    coroutines = [server.dispatch("POST", "/compile", data) for i in range(3)]
+    results = _run(asyncio.gather(*coroutines))
+
+    assert [i[0] for i in results] == [200, 200, 200]
+    assert (server.cache.hits, server.cache.misses) == (2, 1)
+
+
+def test_backpressure(server):
+    # one worker and no queue, so only one compilation may be pending
+    coroutines = []
+    for i in range(2):
+        data = json.dumps({"code": f"{CODE}\n# {i}", "formats": ["bytecode"]}).encode()
+        coroutines.append(server.dispatch("POST", "/compile", data))
+    results = _run(asyncio.gather(*coroutines))
+
+    assert sorted(i[0] for i in results) == [200, 429]
+    assert server.pending == 0
+
+
+def test_metrics(server):
+    _post(server, "/compile", {"code": CODE, "formats": ["bytecode"]})
+    _post(server, "/compile", {"code": CODE, "formats": ["bytecode"]})
+    status, metrics = _run(server.dispatch("GET", "/metrics", b""))
+
+    assert status == 200
+    lines = metrics.splitlines()
+    assert "vyper_serve_queue_depth 0" in lines
+    assert 'vyper_serve_responses_total{endpoint="/compile",status="200"} 2' in lines
+    assert 'vyper_serve_request_duration_seconds_count{endpoint="/compile"} 2' in lines
+    assert "vyper_serve_cache_hit_rate 0.5" in lines
+
+
+def test_not_found(server):
+    status, _ = _run(server.dispatch("GET", "/foo", b""))
+    assert status == 404
+
+
+def test_http_roundtrip(server):
+    async def request(port, raw_request):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw_request)
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def main():
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        body = json.dumps({"code": CODE, "formats": ["bytecode"]})
+        raw_request = (
+            "POST /compile HTTP/1.1\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n{body}"
+        ).encode()
+        try:
+            return await request(port, raw_request), await request(port, b"\r\n")
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    response, malformed = _run(main())
+
+    headers, _, body = response.partition(b"\r\n\r\n")
+    assert headers.startswith(b"HTTP/1.1 200 OK")
+    assert json.loads(body)["bytecode"] == vyper.compile_code(CODE)["bytecode"]
+    assert malformed.startswith(b"HTTP/1.1 400")
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram((0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.to_metrics("foo", 'a="b"') == [
+        'foo_bucket{a="b",le="0.1"} 1',
+        'foo_bucket{a="b",le="1.0"} 2',
+        'foo_bucket{a="b",le="+Inf"} 3',
+        'foo_sum{a="b"} 5.55',
+        'foo_count{a="b"} 3',
+    ]
+
+
+def test_result_cache_eviction():
+    cache = ResultCache(2)
+    cache.set("a", ({}, 200))
+    cache.set("b", ({}, 200))
+    cache.get("a")
+    cache.set("c", ({}, 200))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
@@ -0,0 +1,192 @@
+import vyper
+from vyper.cli.vyper_compile import compile_files
+from vyper.compiler.cache import CompilerCache
+
+CODE = """
+x: public(uint256)
+
+@external
+def foo(a: uint256) -> uint256:
+    return a + self.x + self.balance
+"""
+
+OUTPUT_FORMATS = ["abi", "ast_dict", "bytecode", "bytecode_runtime", "ir", "source_map"]
+
+
+def test_cache_hit(tmp_path):
+    cache = CompilerCache(tmp_path)
+    uncached = vyper.compile_codes({"foo.vy": CODE}, OUTPUT_FORMATS)
+
+    first = vyper.compile_codes({"foo.vy": CODE}, OUTPUT_FORMATS, cache=cache)
+    assert cache.hits == 0
+    assert cache.misses > 0
+
+    misses = cache.misses
+    second = vyper.compile_codes({"foo.vy": CODE}, OUTPUT_FORMATS, cache=cache)
+    assert cache.misses == misses
+    assert cache.hits > 0
+
+    for output in (first, second):
+        for key in OUTPUT_FORMATS:
+            if key == "ir":
+                assert str(output["foo.vy"][key]) == str(uncached["foo.vy"][key])
+            else:
+                assert output["foo.vy"][key] == uncached["foo.vy"][key]
+
+
+def test_cache_persistent(tmp_path):
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=CompilerCache(tmp_path))
+
+    cache = CompilerCache(tmp_path)
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache)
+    assert cache.stats() == {"hits": 1, "misses": 0}
+
+
+def test_cache_key_inputs(tmp_path):
+    # each modified input generates a new contract-level cache entry
+    # functions may still be reused, so hits are checked per artifact
+    def _bytecode_entries():
+        return len(list(tmp_path.glob("*-bytecode.pickle")))
+
+    cache = CompilerCache(tmp_path)
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache)
+    assert cache.hits == 0
+    assert _bytecode_entries() == 1
+
+    # modified source
+    vyper.compile_codes({"foo.vy": CODE + "\n# comment"}, ["bytecode"], cache=cache)
+    assert _bytecode_entries() == 2
+
+    # different source id
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache, initial_id=1)
+    assert _bytecode_entries() == 3
+
+    # different evm version
+    hits = cache.hits
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache, evm_version="byzantium")
+    assert _bytecode_entries() == 4
+    assert cache.hits == hits
+
+    # different interfaces
+    interface_codes = {"Bar": {"type": "vyper", "code": "@external\ndef bar():\n    pass"}}
+    vyper.compile_codes(
+        {"foo.vy": CODE}, ["bytecode"], cache=cache, interface_codes=interface_codes
+    )
+    assert _bytecode_entries() == 5
+    assert cache.hits == hits
+
+
+def test_evm_version_in_key(tmp_path):
+    cache = CompilerCache(tmp_path)
+    istanbul = vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache)
+    byzantium = vyper.compile_codes(
+        {"foo.vy": CODE}, ["bytecode"], cache=cache, evm_version="byzantium"
+    )
+    assert istanbul != byzantium
+
+
+def test_eviction(tmp_path):
+    cache = CompilerCache(tmp_path, max_size=1)
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache)
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_corrupted_entry(tmp_path):
+    cache = CompilerCache(tmp_path)
+    vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache)
+    for path in tmp_path.iterdir():
+        path.write_bytes(b"corrupted")
+
+    cache = CompilerCache(tmp_path)
+    output = vyper.compile_codes({"foo.vy": CODE}, ["bytecode"], cache=cache)
+    assert cache.hits == 0
+    assert output == vyper.compile_codes({"foo.vy": CODE}, ["bytecode"])
+
+
+def test_compile_files_cache_stats(tmp_path):
+    contract_path = tmp_path.joinpath("foo.vy")
+    with contract_path.open("w") as fp:
+        fp.write(CODE)
+    cache_dir = tmp_path.joinpath("cache")
+
+    output = compile_files([contract_path], ["bytecode"], tmp_path, cache_dir=cache_dir)
+    assert output["cache"]["hits"] == 0
+
+    output = compile_files([contract_path], ["bytecode"], tmp_path, cache_dir=cache_dir)
+    assert output["cache"] == {"hits": 1, "misses": 0}
+
+
+MULTI_FUNCTION_CODE = """
+struct Point:
+    x: uint256
+    y: uint256
+
+a: public(uint256)
+b: HashMap[address, uint256]
+
+@internal
+def _helper(p: Point, s: String[99]) -> String[100]:
+    if p.x > 1 and p.y > 2 and p.x < 10:
+        return s
+    return concat(s, "x")
+
+@external
+@nonreentrant("lock")
+def foo(x: uint256[3]) -> String[100]:
+    return self._helper(Point({x: x[0], y: x[1]}), "hello")
+
+@external
+@nonreentrant("other")
+def bar(x: int128[4]) -> uint256:
+    self.b[msg.sender] = self.a
+    return self.a
+"""
+
+FUNCTION_OUTPUT_FORMATS = ["asm", "bytecode", "bytecode_runtime", "ir", "source_map"]
+
+
+def _function_hits(cache, source):
+    hits = cache.hits
+    output = vyper.compile_codes({"foo.vy": source}, FUNCTION_OUTPUT_FORMATS, cache=cache)
+    uncached = vyper.compile_codes({"foo.vy": source}, FUNCTION_OUTPUT_FORMATS)
+    for key in FUNCTION_OUTPUT_FORMATS:
+        assert str(output["foo.vy"][key]) == str(uncached["foo.vy"][key])
+
+    return cache.hits - hits
+
+
+def test_function_cache_modified_function(tmp_path):
+    cache = CompilerCache(tmp_path)
+    assert _function_hits(cache, MULTI_FUNCTION_CODE) == 0
+
+    # `bar` and the getter for `a` are unchanged
+    modified = MULTI_FUNCTION_CODE.replace("self.b[msg.sender] = self.a", "self.b[msg.sender] = 1")
+    assert _function_hits(cache, modified) == 3
+
+
+def test_function_cache_moved_functions(tmp_path):
+    cache = CompilerCache(tmp_path)
+    assert _function_hits(cache, MULTI_FUNCTION_CODE) == 0
+
+    # all functions are reused, with adjusted source positions
+    moved = f"# a comment\n\n{MULTI_FUNCTION_CODE}"
+    assert _function_hits(cache, moved) == 4
+
+
+def test_function_cache_storage_layout(tmp_path):
+    cache = CompilerCache(tmp_path)
+    assert _function_hits(cache, MULTI_FUNCTION_CODE) == 0
+
+    # modifying the storage layout invalidates every function
+    modified = MULTI_FUNCTION_CODE.replace("a: public(uint256)", "z: int128\na: public(uint256)")
+    assert _function_hits(cache, modified) == 0
+
+
+def test_function_cache_called_function(tmp_path):
+    cache = CompilerCache(tmp_path)
+    assert _function_hits(cache, MULTI_FUNCTION_CODE) == 0
+
+    # the gas estimate for `_helper` increases, which also invalidates `foo`
+    modified = MULTI_FUNCTION_CODE.replace("p.x < 10:", "p.x < 10 and p.y < 10:")
+    assert _function_hits(cache, modified) == 2
@@ -3,14 +3,13 @@ import pytest
 import vyper
 from vyper import opcodes
 from vyper.exceptions import CompilerPanic
+from vyper.session import CompilationSession
 
 
 @pytest.fixture(params=list(opcodes.EVM_VERSIONS))
 def evm_version(request):
-    default = opcodes.active_evm_version
-    opcodes.active_evm_version = opcodes.EVM_VERSIONS[request.param]
-    yield request.param
-    opcodes.active_evm_version = default
+    with CompilationSession(evm_version=request.param):
+        yield request.param
 
 
 def test_opcodes():
@@ -0,0 +1,91 @@
+import pytest
+
+import vyper
+from vyper.exceptions import InvalidType
+
+FOO_CODE = """
+x: public(uint256[3])
+
+@external
+def foo(a: uint256[3]) -> uint256:
+    return a[0] + self.x[1] + self.balance
+"""
+
+BAR_CODE = """
+@external
+def bar(a: uint256) -> bool:
+    return True
+"""
+
+BAD_CODE = """
+@external
+def oopsie(a: uint256) -> bool:
+    return 42
+"""
+
+OUTPUT_FORMATS = ["abi", "asm", "bytecode", "bytecode_runtime", "ir", "source_map"]
+
+
+def _stringify(output):
+    return {k: {x: str(y) for x, y in v.items()} for k, v in output.items()}
+
+
+def test_parallel_matches_serial():
+    sources = {"foo.vy": FOO_CODE, "bar.vy": BAR_CODE, "baz.vy": FOO_CODE}
+    serial = vyper.compile_codes(sources, OUTPUT_FORMATS)
+    parallel = vyper.compile_codes(sources, OUTPUT_FORMATS, max_workers=2)
+
+    assert list(serial) == list(parallel) == ["bar.vy", "baz.vy", "foo.vy"]
+    assert _stringify(serial) == _stringify(parallel)
+
+
+def test_parallel_evm_version():
+    sources = {"foo.vy": FOO_CODE, "bar.vy": BAR_CODE}
+    serial = vyper.compile_codes(sources, evm_version="byzantium")
+    parallel = vyper.compile_codes(sources, evm_version="byzantium", max_workers=2)
+    assert serial == parallel
+    assert parallel != vyper.compile_codes(sources, max_workers=2)
+
+
+def test_parallel_exc_handler():
+    sources = {"foo.vy": FOO_CODE, "bad.vy": BAD_CODE, "bar.vy": BAR_CODE}
+    handled = []
+
+    def exc_handler(contract_name, exc):
+        handled.append((contract_name, type(exc)))
+
+    output = vyper.compile_codes(sources, ["abi", "bytecode"], exc_handler, max_workers=2)
+
+    assert handled == [("bad.vy", InvalidType), ("bad.vy", InvalidType)]
+    assert output["bad.vy"] == {}
+    expected = vyper.compile_codes({"foo.vy": FOO_CODE}, ["abi", "bytecode"])
+    assert output["foo.vy"] == expected["foo.vy"]
+
+
+def test_parallel_raises():
+    sources = {"foo.vy": FOO_CODE, "bad.vy": BAD_CODE}
+    with pytest.raises(InvalidType):
+        vyper.compile_codes(sources, max_workers=2)
+
+
+def test_warning_handler():
+    code = """
+@constant
+@external
+def foo() -> uint256:
+    return 42
+"""
+    sources = {"foo.vy": FOO_CODE, "bar.vy": code}
+    handled = {1: [], 2: []}
+
+    for max_workers, warning_list in handled.items():
+        vyper.compile_codes(
+            sources,
+            ["abi"],
+            exc_handler=lambda name, exc: None,
+            max_workers=max_workers,
+            warning_handler=lambda name, warning: warning_list.append((name, warning.category)),
+        )
+
+    assert handled[1] == handled[2]
+    assert handled[1] and set(handled[1]) == {("bar.vy", DeprecationWarning)}
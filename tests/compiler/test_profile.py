@@ -0,0 +1,76 @@
+import vyper
+from vyper.cli.vyper_compile import compile_files
+from vyper.cli.vyper_json import compile_json
+from vyper.compiler.phases import CompilerData
+
+CODE = """
+x: public(uint256)
+
+@external
+def foo(a: uint256) -> uint256:
+    return a + self.x
+"""
+
+PHASES = [
+    "generate_ast",
+    "generate_folded_ast",
+    "validate_semantics",
+    "generate_global_context",
+    "parse_tree_to_lll",
+    "optimize",
+    "compile_to_assembly",
+    "assembly_to_evm",
+]
+
+
+def test_profile_phases():
+    out = vyper.compile_code(CODE, ["profile", "bytecode"])
+    assert list(out) == ["profile", "bytecode"]
+
+    phases = out["profile"]["phases"]
+    assert list(phases) == PHASES
+    for data in phases.values():
+        assert data["wall_time"] >= 0
+        assert data["cpu_time"] >= 0
+        assert data["peak_memory"] >= 0
+
+    assert phases["generate_ast"]["ast_nodes"] > 1
+    assert phases["parse_tree_to_lll"]["lll_nodes"] > 1
+    assert phases["compile_to_assembly"]["assembly_items"] > 1
+
+    total = out["profile"]["total"]
+    assert total["wall_time"] == sum(i["wall_time"] for i in phases.values())
+
+
+def test_profile_only_executed_phases():
+    out = vyper.compile_code(CODE, ["ast_dict", "profile"])
+    assert list(out["profile"]["phases"]) == ["generate_ast"]
+
+
+def test_profile_disabled():
+    compiler_data = CompilerData(CODE)
+    compiler_data.bytecode
+    assert compiler_data.profiler is None
+
+
+def test_compile_files_profile(tmp_path):
+    contract_path = tmp_path.joinpath("foo.vy")
+    with contract_path.open("w") as fp:
+        fp.write(CODE)
+
+    output = compile_files([contract_path], ["bytecode"], tmp_path, profile=True)
+    assert list(output["foo.vy"]) == ["bytecode", "profile"]
+
+
+def test_compile_json_profile():
+    input_json = {
+        "language": "Vyper",
+        "sources": {"foo.vy": {"content": CODE}},
+        "settings": {"outputSelection": {"*": ["evm.bytecode.object"]}},
+    }
+    output = compile_json(input_json, profile=True)
+    profile = output["contracts"]["foo.vy"]["foo"]["profile"]
+    assert list(profile["phases"]) == PHASES
+
+    output = compile_json(input_json)
+    assert "profile" not in output["contracts"]["foo.vy"]["foo"]
@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import vyper
+from vyper.ast import ModuleStore
+from vyper.compiler.phases import CompilerData
+from vyper.context.namespace import get_namespace
+from vyper.exceptions import CompilerPanic
+from vyper.opcodes import EVM_VERSIONS, version_check
+from vyper.session import CompilationSession, get_session
+
+CODE = """
+x: public(uint256[3])
+
+@external
+def foo(a: uint256[3]) -> uint256:
+    return a[0] + self.x[1] + self.balance
+"""
+
+
+def test_nested_sessions():
+    default = get_session()
+
+    with CompilationSession(evm_version="byzantium") as outer:
+        assert get_session() is outer
+        assert version_check(end="byzantium")
+
+        with CompilationSession() as inner:
+            assert get_session() is inner
+            assert not version_check(end="byzantium")
+            assert get_namespace() is not outer.namespace
+
+        assert get_session() is outer
+
+    assert get_session() is default
+
+
+def test_exit_out_of_order():
+    outer = CompilationSession()
+    inner = CompilationSession()
+    with outer:
+        inner.__enter__()
+        with pytest.raises(CompilerPanic):
+            outer.__exit__(None, None, None)
+        inner.__exit__(None, None, None)
+
+
+def test_symbols_per_session():
+    with CompilationSession() as session:
+        assert session.mksymbol() == "_sym_1"
+        with CompilationSession() as inner:
+            assert inner.mksymbol() == "_sym_1"
+        assert session.mksymbol() == "_sym_2"
+
+
+def test_symbol_scope():
+    with CompilationSession() as session:
+        assert session.mksymbol() == "_sym_1"
+        with session.symbol_scope("foo"):
+            assert session.mksymbol() == "_sym_foo_1"
+            assert session.mksymbol() == "_sym_foo_2"
+        assert session.mksymbol() == "_sym_2"
+
+
+def test_thread_default_sessions():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sessions = list(executor.map(lambda _: get_session(), range(2)))
+    assert get_session() not in sessions
+
+
+def test_concurrent_compilation():
+    formats = ["asm", "bytecode", "source_map"]
+    versions = list(EVM_VERSIONS) * 4
+    expected = {i: vyper.compile_code(CODE, formats, evm_version=i) for i in EVM_VERSIONS}
+
+    def compile_(evm_version):
+        return vyper.compile_code(CODE, formats, evm_version=evm_version)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(compile_, versions))
+
+    for evm_version, result in zip(versions, results):
+        assert result == expected[evm_version]
+
+
+def test_default_session_retains_no_modules():
+    first = CompilerData(CODE)
+    second = CompilerData(CODE)
+    first.bytecode
+
+    # without a batch module store, each compilation parses its own module
+    assert get_session().module_store is None
+    assert first.vyper_module is not second.vyper_module
+
+
+def test_batch_module_store():
+    store = ModuleStore()
+    with CompilationSession(module_store=store):
+        vyper_module = CompilerData(CODE).vyper_module
+        assert CompilerData(CODE).vyper_module is vyper_module
+    assert len(store) == 1
@@ -1,7 +1,7 @@
 import pytest
 
 from vyper.context import environment
-from vyper.context.namespace import get_namespace
+from vyper.context.namespace import Namespace, get_builtins, get_namespace
 from vyper.context.types import get_types
 from vyper.exceptions import (
     CompilerPanic,
@@ -36,6 +36,21 @@ def test_builtin_types_persist_after_clear(namespace):
         assert namespace[key] == value
 
 
+def test_builtins_shared(namespace):
+    other = Namespace()
+    for key in get_types():
+        assert other[key] is namespace[key]
+
+    with pytest.raises(TypeError):
+        get_builtins()["foo"] = 42
+
+
+def test_builtin_collision(namespace):
+    with namespace.enter_scope():
+        with pytest.raises(NamespaceCollision):
+            namespace["uint256"] = 42
+
+
 def test_context_manager_constant_vars(namespace):
     with namespace.enter_scope():
         for key in environment.CONSTANT_ENVIRONMENT_VARS.keys():
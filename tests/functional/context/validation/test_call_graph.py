@@ -0,0 +1,125 @@
+import pytest
+
+import vyper
+from vyper.ast import parse_to_ast
+from vyper.compiler.cache import CompilerCache
+from vyper.compiler.phases import CompilerData
+from vyper.context.validation.call_graph import CallGraph
+from vyper.context.validation.module import ModuleNodeVisitor
+from vyper.exceptions import CallViolation
+
+CODE = """
+@external
+def foo() -> uint256:
+    self.bar()
+    return self.baz()
+
+@internal
+def bar():
+    self.qux()
+
+@internal
+def baz() -> uint256:
+    self.qux()
+    return 1
+
+@internal
+def qux():
+    pass
+"""
+
+
+def test_call_graph():
+    call_graph = CallGraph(parse_to_ast(CODE))
+
+    assert call_graph.internal_calls == {
+        "foo": ["bar", "baz"],
+        "bar": ["qux"],
+        "baz": ["qux"],
+        "qux": [],
+    }
+    assert call_graph.reachable["foo"] == {"bar", "baz", "qux"}
+    assert call_graph.reachable["qux"] == set()
+    assert call_graph.call_depths == {"foo": 2, "bar": 1, "baz": 1, "qux": 0}
+    assert call_graph.find_cycle() is None
+
+
+def test_call_graph_output():
+    out = vyper.compile_code(CODE, ["call_graph"])
+    assert out["call_graph"]["foo"] == {
+        "calls": ["bar", "baz"],
+        "reachable": ["bar", "baz", "qux"],
+        "max_call_depth": 2,
+    }
+
+
+def test_call_graph_reused(monkeypatch, tmp_path):
+    cache = CompilerCache(tmp_path)
+    expected = CompilerData(CODE, cache=cache).call_graph.internal_calls
+
+    # the graph built during validation is stored with the folded AST
+    monkeypatch.setattr(CallGraph, "__init__", None)
+    compiler_data = CompilerData(CODE, cache=cache)
+    assert compiler_data.call_graph.internal_calls == expected
+    assert cache.hits > 0
+
+
+def test_diamonds():
+    # each level calls both functions of the next level, so there are 2**50 paths
+    # from the first function to the last
+    code = ""
+    for i in range(50):
+        code += f"""
+@internal
+def a{i}():
+    self.a{i + 1}()
+    self.b{i + 1}()
+
+@internal
+def b{i}():
+    self.a{i + 1}()
+"""
+    code += "\n@internal\ndef a50():\n    pass\n\n@internal\ndef b50():\n    pass\n"
+    call_graph = CallGraph(parse_to_ast(code))
+
+    assert call_graph.find_cycle() is None
+    assert call_graph.call_depths["a0"] == 50
+    assert len(call_graph.reachable["a0"]) == 100
+
+
+def test_find_cycle():
+    code = """
+@internal
+def foo():
+    self.bar()
+
+@internal
+def bar():
+    self.baz()
+
+@internal
+def baz():
+    self.bar()
+    self.foo()
+    """
+    assert CallGraph(parse_to_ast(code)).find_cycle() == ["bar", "baz", "bar"]
+
+
+def test_cycle_in_callee(namespace):
+    code = """
+@internal
+def foo():
+    self.bar()
+
+@internal
+def bar():
+    self.baz()
+
+@internal
+def baz():
+    self.bar()
+    """
+    vyper_module = parse_to_ast(code)
+    with namespace.enter_scope():
+        with pytest.raises(CallViolation):
+            ModuleNodeVisitor(vyper_module, {}, namespace)
@@ -0,0 +1,73 @@
+import pytest
+
+from vyper.ast import folding, parse_to_ast
+from vyper.context.validation.module import ModuleNodeVisitor
+from vyper.exceptions import UnknownType
+
+
+def test_reverse_order(namespace, monkeypatch):
+    code = """
+implements: Foo
+
+@external
+def foo(a: A) -> B:
+    return B({a: a, c: [1, 2]})
+
+x: public(B)
+
+struct B:
+    a: A
+    c: uint256[SIZE]
+
+struct A:
+    b: Bar
+
+interface Bar:
+    def bar(a: uint256[SIZE]): nonpayable
+
+interface Foo:
+    def foo(a: A) -> B: nonpayable
+
+SIZE: constant(uint256) = LENGTH
+LENGTH: constant(uint256) = 2
+    """
+    vyper_module = parse_to_ast(code)
+    folding.fold(vyper_module)
+    visited = []
+    visit = ModuleNodeVisitor.visit
+    monkeypatch.setattr(
+        ModuleNodeVisitor, "visit", lambda self, node: visited.append(node) or visit(self, node)
+    )
+
+    with namespace.enter_scope():
+        ModuleNodeVisitor(vyper_module, {}, namespace)
+
+    # each statement is visited exactly once
+    assert sorted(i.node_id for i in visited) == sorted(i.node_id for i in vyper_module.body)
+
+
+def test_cyclic_struct(namespace):
+    code = """
+struct A:
+    b: B
+
+struct B:
+    a: A
+    """
+    vyper_module = parse_to_ast(code)
+    with namespace.enter_scope():
+        with pytest.raises(UnknownType):
+            ModuleNodeVisitor(vyper_module, {}, namespace)
+
+
+def test_undeclared_type(namespace):
+    code = """
+struct A:
+    b: B
+
+x: A
+    """
+    vyper_module = parse_to_ast(code)
+    with namespace.enter_scope():
+        with pytest.raises(UnknownType):
+            ModuleNodeVisitor(vyper_module, {}, namespace)
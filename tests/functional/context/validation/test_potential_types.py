@@ -2,9 +2,16 @@ import pytest
 
 from vyper.context.types.indexable.sequence import ArrayDefinition
 from vyper.context.types.value.address import AddressDefinition
+from vyper.context.types.value.array_value import BytesArrayDefinition
 from vyper.context.types.value.boolean import BoolDefinition
-from vyper.context.types.value.numeric import Int128Definition
-from vyper.context.validation.utils import get_possible_types_from_node
+from vyper.context.types.value.numeric import (
+    Int128Definition,
+    Uint256Definition,
+)
+from vyper.context.validation.utils import (
+    get_possible_types_from_node,
+    validate_expected_type,
+)
 from vyper.exceptions import (
     ArrayIndexException,
     InvalidOperation,
@@ -217,3 +224,37 @@ def test_tuple_subscript(build_node, namespace):
     types_list = get_possible_types_from_node(node)
 
     assert types_list == [namespace["bar"]]
+
+
+def test_memoized_until_scope_changes(build_node, namespace):
+    node = build_node("foo")
+    with namespace.enter_scope():
+        namespace["foo"] = Int128Definition()
+        types_list = get_possible_types_from_node(node)
+        assert isinstance(types_list[0], Int128Definition)
+
+        # the memoized result is copied, so the caller may modify it
+        types_list.clear()
+        assert isinstance(get_possible_types_from_node(node)[0], Int128Definition)
+
+    with namespace.enter_scope():
+        namespace["foo"] = AddressDefinition()
+        assert isinstance(get_possible_types_from_node(node)[0], AddressDefinition)
+
+
+def test_nested_convert(build_node, namespace):
+    source = "foo"
+    for i in range(30):
+        source = f"convert({source}, {'uint256' if i % 2 else 'int128'})"
+    node = build_node(source)
+    with namespace.enter_scope():
+        namespace["foo"] = Uint256Definition()
+        assert isinstance(get_possible_types_from_node(node)[0], Uint256Definition)
+
+
+def test_literal_length_not_memoized(build_node, namespace):
+    node = build_node("b'hello'")
+    with namespace.enter_scope():
+        # comparing a literal to a type sets the length of the literal
+        validate_expected_type(node, BytesArrayDefinition(10))
+        validate_expected_type(node, BytesArrayDefinition(5))
@@ -90,3 +90,22 @@ def test() -> int128:
     new_ast = dict_to_ast(out_dict)
 
     assert new_ast == original_ast
+
+
+def test_dict_to_ast_translated_fields():
+    code = """
+from vyper.interfaces import ERC20
+
+@external
+def test(a: uint256):
+    b: uint256 = 0
+    b = a
+    assert a > b
+    """
+
+    original_ast = parse_to_ast(code)
+    out_dict = ast_to_dict(original_ast)
+    new_ast = dict_to_ast(out_dict)
+
+    assert new_ast == original_ast
+    assert ast_to_dict(new_ast) == out_dict
@@ -1,11 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
 import pytest
 
+from vyper.ast import ModuleStore
 from vyper.cli.utils import extract_file_interface_imports
 from vyper.compiler import compile_code, compile_codes
 from vyper.exceptions import InterfaceViolation, StructureException
-from vyper.interfaces import ERC20, ERC721
+from vyper.interfaces import ERC20, ERC721, parse_builtin_interface
+from vyper.session import CompilationSession
 from vyper.signatures.interface import extract_sigs
 
 
@@ -99,6 +102,57 @@ def foo() -> uint256:
         assert [type(i) for i in base] == [type(i) for i in sigs]
 
 
+def test_extract_sigs_memoized():
+    sig_code = {"type": "vyper", "code": ERC20.interface_code}
+    sigs = extract_sigs(sig_code, "ERC20")
+
+    with CompilationSession(module_store=ModuleStore()) as session:
+        cached = extract_sigs(sig_code, "ERC20")
+        # the interface is not parsed again
+        assert len(session.module_store) == 0
+
+    # signatures are copied, so modifying them does not affect later calls
+    assert [i.sig for i in sigs] == [i.sig for i in cached]
+    assert not next((i for i in zip(sigs, cached) if i[0] is i[1]), None)
+    sigs[0].defined_in_interface = "foo"
+    assert not hasattr(extract_sigs(sig_code, "ERC20")[0], "defined_in_interface")
+
+
+def test_extract_sigs_threaded(monkeypatch):
+    monkeypatch.setattr("vyper.signatures.interface.SIGNATURE_CACHE_SIZE", 2)
+    interface_code = """
+@external
+def foo{}() -> uint256:
+    pass
+    """
+
+    # entries are evicted while other threads read the cache
+    def extract(idx):
+        return extract_sigs({"type": "vyper", "code": interface_code.format(idx % 5)}, "Foo")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(extract, range(200)))
+
+    assert [i[0].sig for i in results] == [f"foo{i % 5}()" for i in range(200)]
+
+
+def test_builtin_interface_ast_copied():
+    assert parse_builtin_interface("ERC20") is not parse_builtin_interface("ERC20")
+
+
+def test_extract_sigs_memoized_by_content():
+    interface_code = """
+@external
+def foo() -> {}:
+    pass
+    """
+
+    for typ in ("uint256", "bool"):
+        sigs = extract_sigs({"type": "vyper", "code": interface_code.format(typ)}, "Foo")
+        assert sigs[0].sig == "foo()"
+        assert str(sigs[0].output_type) == typ
+
+
 def test_external_interface_parsing(assert_compile_failed):
     interface_code = """
 @external
@@ -1,3 +1,9 @@
+import pytest
+
+from vyper import ast as vy_ast
+from vyper.parser.global_context import GlobalContext
+
+
 def test_state_accessor(get_contract_with_gas_estimation_for_constants):
     state_accessor = """
 y: HashMap[int128, int128]
@@ -54,3 +60,44 @@ def __init__():
     assert c.w(2)[3][1][2] == 17  # W.e[1][2]
     assert c.w(3)[4] == 750  # W.f
     assert c.w(3)[5] == 751  # W.g
+
+
+getter_sources = [
+    ("x: public(uint256)", "def x() -> uint256:\n    return self.x"),
+    ("x: public(Bytes[100])", "def x() -> Bytes[100]:\n    return self.x"),
+    (
+        "x: public(int128[5][2])",
+        "def x(arg0: uint256, arg1: uint256) -> int128:\n    return self.x[arg0][arg1]",
+    ),
+    (
+        "x: public(HashMap[address, HashMap[uint256, String[10]]])",
+        "def x(arg0: address, arg1: uint256) -> String[10]:\n    return self.x[arg0][arg1]",
+    ),
+    ("x: public(HashMap[int128, W])", "def x(arg0: int128) -> W:\n    return self.x[arg0]"),
+]
+
+
+@pytest.mark.parametrize("declaration,expected", getter_sources)
+def test_getter_node(declaration, expected):
+    code = f"""
+struct W:
+    a: uint256
+
+{declaration}
+    """
+    vyper_module = vy_ast.parse_to_ast(code)
+    global_ctx = GlobalContext.get_global_context(vyper_module)
+    getter = global_ctx._getters[0]
+    item = vyper_module.body[-1]
+    expected = vy_ast.parse_to_ast(f"@view\n@external\n{expected}")[0]
+    expected.pos = getter.pos
+
+    # the getter is equivalent to the generated source, at the offsets of the declaration
+    assert vy_ast.compare_nodes(getter, expected)
+    assert _get_node_ids(getter) == _get_node_ids(expected)
+    for node in [getter] + getter.get_descendants():
+        assert (node.lineno, node.col_offset, node.src) == (item.lineno, item.col_offset, item.src)
+
+
+def _get_node_ids(node):
+    return sorted((i.node_id, i.ast_type) for i in [node] + node.get_descendants())
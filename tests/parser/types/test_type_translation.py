@@ -0,0 +1,62 @@
+from vyper import ast as vy_ast
+from vyper.compiler.phases import CompilerData
+from vyper.types import parse_type
+
+CODE = """
+struct A:
+    a: uint256
+    b: Bytes[10]
+
+struct B:
+    a: A[2]
+    b: String[5]
+
+event Foo:
+    a: indexed(address)
+    b: B
+
+x: HashMap[address, B]
+y: public(int128[3][2])
+
+@external
+def foo(a: A, b: decimal[4]) -> (B, bytes32):
+    c: B = B({a: [a, a], b: "hello"})
+    return c, EMPTY_BYTES32
+"""
+
+
+def test_annotations_have_types():
+    vyper_module = CompilerData(CODE).vyper_module_folded
+
+    annotations = [i.annotation for i in vyper_module.get_descendants(vy_ast.AnnAssign)]
+    annotations = [
+        i.args[0] if i.get("func.id") in ("indexed", "public") else i for i in annotations
+    ]
+    for node in vyper_module.get_children(vy_ast.FunctionDef):
+        annotations.extend(i.annotation for i in node.args.args)
+        annotations.extend(node.returns.elements)
+
+    assert all("type" in i._metadata for i in annotations)
+
+
+def test_translated_types_match_parsed(monkeypatch):
+    compiler_data = CompilerData(CODE)
+    vyper_module = compiler_data.vyper_module_folded
+    structs = compiler_data.global_ctx._structs
+
+    annotations = [i for i in vyper_module.get_descendants() if "type" in i._metadata]
+    assert annotations
+
+    for node in annotations:
+        translated = parse_type(node, "memory", custom_structs=structs)
+        monkeypatch.setattr(node, "_metadata", {})
+        assert parse_type(node, "memory", custom_structs=structs) == translated
+
+
+def test_metadata_is_copied_on_clone():
+    node = vy_ast.parse_to_ast("x: uint256").body[0]
+    node._metadata["foo"] = 42
+
+    cloned = node.clone()
+    assert cloned._metadata == {"foo": 42}
+    assert cloned._metadata is not node._metadata
@@ -0,0 +1,71 @@
+import pytest
+
+import vyper
+from benchmarks import ast_index, run
+from benchmarks.generators import AXES
+from benchmarks.run import compare, fit_exponent
+
+
+@pytest.mark.parametrize("axis", AXES)
+def test_generated_contracts_compile(axis):
+    generator, sizes = AXES[axis]
+    source_code, interface_codes = generator(sizes[0])
+    vyper.compile_code(source_code, interface_codes=interface_codes)
+
+
+def test_fit_exponent():
+    sizes = [8, 16, 32, 64]
+    assert fit_exponent(sizes, [3 * i for i in sizes]) == 1
+    assert fit_exponent(sizes, [i ** 2 for i in sizes]) == 2
+
+
+def _axis_results(time_exponent, wall_time=0.1, peak_memory=10 ** 6):
+    phase_data = {
+        "wall_time": [wall_time],
+        "peak_memory": [peak_memory],
+        "time_exponent": time_exponent,
+        "memory_exponent": 1.0,
+    }
+    return {"axes": {"nesting": {"phases": {"generate_ast": phase_data}}}}
+
+
+def test_compare():
+    baseline = _axis_results(1.0)
+    assert compare(_axis_results(1.0), baseline, 0.1) == []
+    assert compare(_axis_results(1.05), baseline, 0.1) == []
+    assert compare(_axis_results(2.0), baseline, 0.1) == [
+        "nesting/generate_ast: time_exponent increased from 1.0 to 2.0"
+    ]
+
+
+def test_compare_ignores_fast_phases():
+    # phases below the minimum time are too noisy to compare
+    assert compare(_axis_results(2.0, wall_time=0.001), _axis_results(1.0), 0.1) == []
+
+
+def test_compare_ignores_missing_baseline():
+    results = _axis_results(2.0)
+    assert compare(results, {"axes": {}}, 0.1) == []
+    assert compare(results, {"axes": {"nesting": {"phases": {}}}}, 0.1) == []
+
+
+def test_run_axis(monkeypatch):
+    # timings are injected, so that the fitted exponents do not depend on the machine
+    def measure(source_code, interface_codes, repeat):
+        size = len(source_code)
+        return {"generate_ast": {"wall_time": size ** 2, "peak_memory": size}}
+
+    monkeypatch.setattr(run, "measure", measure)
+    monkeypatch.setitem(run.AXES, "test", (lambda n: ("x" * n, None), [8, 16, 32]))
+
+    data = run.run_axis("test")
+    assert data["sizes"] == [8, 16, 32]
+    assert data["phases"]["generate_ast"]["time_exponent"] == 2
+    assert data["phases"]["generate_ast"]["memory_exponent"] == 1
+
+
+def test_ast_index():
+    results = ast_index.run(n=500, repeat=1)
+    assert results.pop("total nodes") >= 500
+    for name in list(ast_index.QUERIES) + ["constant folding"]:
+        assert results[name]["matches"] > 0
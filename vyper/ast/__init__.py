@@ -3,10 +3,11 @@ isort:skip_file
 """
 import sys
 
-from . import nodes, validation
+from . import nodes, serialization, validation
 from .natspec import parse_natspec
 from .nodes import compare_nodes
 from .utils import ast_to_dict, parse_to_ast
+from .incremental import reparse_to_ast
 
 # adds vyper.ast.nodes classes into the local namespace
 for name, obj in (
@@ -17,3 +18,4 @@ for name, obj in (
 
 # required to avoid circular dependency
 from . import folding  # noqa: E402
+from .store import ModuleStore  # noqa: E402
@@ -1,8 +1,10 @@
 import ast as python_ast
 from typing import Any, Optional, Union
 
-from . import folding, nodes, validation
+from . import folding, nodes, serialization, validation
+from .incremental import reparse_to_ast as reparse_to_ast
 from .natspec import parse_natspec as parse_natspec
 from .nodes import *
+from .store import ModuleStore as ModuleStore
 from .utils import ast_to_dict as ast_to_dict
 from .utils import parse_to_ast as parse_to_ast
@@ -1,10 +1,10 @@
 import ast as python_ast
+import io
 import tokenize
 from decimal import Decimal
-from typing import Optional
-
-import asttokens
+from typing import Dict, List, Optional, Sequence
 
+from vyper.ast.tokens import _SINGLETONS, SourceTokens, mark_tokens
 from vyper.exceptions import CompilerPanic, SyntaxException
 from vyper.typing import ModificationOffsets
 
@@ -17,7 +17,7 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         self,
         source_code: str,
         modification_offsets: Optional[ModificationOffsets],
-        tokens: asttokens.ASTTokens,
+        tokens: SourceTokens,
         source_id: int,
         contract_name: Optional[str],
     ):
@@ -26,6 +26,7 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         self._contract_name = contract_name
         self._source_code: str = source_code
         self.counter: int = 0
+        self.singleton_ids: Dict[str, List[int]] = {}
         self._modification_offsets = {}
         if modification_offsets is not None:
             self._modification_offsets = modification_offsets
@@ -62,10 +63,24 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
                 # ignore trailing newline once more
                 end_pos -= 1
             node.src = f"{start_pos}:{end_pos-start_pos}:{self._source_id}"
-            node.node_source_code = self._source_code[start_pos:end_pos]
+            # the node source is sliced from `full_source_code` as needed
+            node.source_start = start_pos
+            node.source_end = end_pos
 
         return super().generic_visit(node)
 
+    def _visit_singleton(self, node):
+        """
+        Annotate an operator node.
+
+        The python AST shares a single instance of each operator between all
+        occurrences, so every occurrence is given the node ID of the last one. The
+        ID of each occurrence is recorded in `singleton_ids`, which allows an
+        incremental reparse to determine the last occurrence.
+        """
+        self.singleton_ids.setdefault(node.__class__.__name__, []).append(self.counter)
+        return self.generic_visit(node)
+
     def _visit_docstring(self, node):
         """
         Move a node docstring from body to `doc_string` and annotate it as `DocStr`.
@@ -84,7 +99,9 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
 
     def visit_Module(self, node):
         node.name = self._contract_name
-        return self._visit_docstring(node)
+        node = self._visit_docstring(node)
+        node.singleton_ids = self.singleton_ids
+        return node
 
     def visit_FunctionDef(self, node):
         if node.decorator_list:
@@ -166,7 +183,7 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         """
         # modify vyper AST type according to the format of the literal value
         self.generic_visit(node)
-        value = node.node_source_code
+        value = self._source_code[node.source_start : node.source_end]  # noqa: E203
 
         # deduce non base-10 types based on prefix
         literal_prefixes = {"0x": "Hex", "0o": "Octal"}
@@ -220,18 +237,28 @@ class AnnotatingVisitor(python_ast.NodeTransformer):
         if is_sub and is_num:
             node.operand.n = 0 - node.operand.n
             node.operand.col_offset = node.col_offset
-            node.operand.node_source_code = node.node_source_code
+            node.operand.source_start = node.source_start
+            node.operand.source_end = node.source_end
             return node.operand
         else:
             return node
 
 
+# expression contexts are also shared, but are not converted to Vyper nodes
+for _node_type in _SINGLETONS:
+    if not issubclass(_node_type, python_ast.expr_context):
+        setattr(
+            AnnotatingVisitor, f"visit_{_node_type.__name__}", AnnotatingVisitor._visit_singleton
+        )
+
+
 def annotate_python_ast(
     parsed_ast: python_ast.AST,
     source_code: str,
     modification_offsets: Optional[ModificationOffsets] = None,
     source_id: int = 0,
     contract_name: Optional[str] = None,
+    token_list: Optional[Sequence[tokenize.TokenInfo]] = None,
 ) -> python_ast.AST:
     """
     Annotate and optimize a Python AST in preparation conversion to a Vyper AST.
@@ -244,13 +271,19 @@ def annotate_python_ast(
         The originating source code of the AST.
     modification_offsets : dict, optional
         A mapping of class names to their original class types.
+    token_list : list, optional
+        Tokens of `source_code`, as returned by `pre_parse_tokens`. If not given,
+        the source code is tokenized here.
 
     Returns
     -------
         The annotated and optimized AST.
     """
+    if token_list is None:
+        token_list = list(tokenize.generate_tokens(io.StringIO(source_code).readline))
 
-    tokens = asttokens.ASTTokens(source_code, tree=parsed_ast)
+    tokens = SourceTokens(source_code, token_list)
+    mark_tokens(parsed_ast, tokens)
     visitor = AnnotatingVisitor(source_code, modification_offsets, tokens, source_id, contract_name)
     visitor.visit(parsed_ast)
 
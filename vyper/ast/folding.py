@@ -1,5 +1,6 @@
+from collections import deque
 from decimal import Decimal
-from typing import Union
+from typing import Deque, Dict, List, Optional, Set, Union
 
 from vyper.ast import nodes as vy_ast
 from vyper.exceptions import UnfoldableNode
@@ -19,24 +20,136 @@ BUILTIN_CONSTANTS = {
 }
 
 
-def fold(vyper_module: vy_ast.Module) -> None:
+LITERAL_OP_TYPES = (vy_ast.BoolOp, vy_ast.BinOp, vy_ast.UnaryOp, vy_ast.Compare)
+
+
+def fold(vyper_module: vy_ast.Module) -> Dict[str, int]:
     """
     Perform literal folding operations on a Vyper AST.
 
+    Every node that may be folded is evaluated once. When a node is replaced, only
+    the nearest foldable ancestor of the new node is queued to be evaluated again.
+    If the replacement leaves the value of a user-defined constant as a literal,
+    the references to that constant are replaced.
+
     Arguments
     ---------
     vyper_module : Module
         Top-level Vyper AST node.
+
+    Returns
+    -------
+    dict
+        Number of nodes that were replaced, for each category of folding.
     """
-    replace_builtin_constants(vyper_module)
+    changed_nodes = {
+        "builtin_constants": replace_builtin_constants(vyper_module),
+        "user_constants": 0,
+        "literal_ops": 0,
+        "subscripts": 0,
+        "builtin_functions": 0,
+    }
+
+    constants: Dict[int, vy_ast.AnnAssign] = {}
+    for node in vyper_module.get_children(vy_ast.AnnAssign):
+        if isinstance(node.target, vy_ast.Name) and node.get("annotation.func.id") == "constant":
+            constants[id(node)] = node
+
+    references: Dict[str, List[vy_ast.Name]] = {}
+    constant_names = set(i.target.id for i in constants.values())
+    for node in vyper_module.get_descendants(vy_ast.Name, reverse=True):
+        if node.id in constant_names:
+            references.setdefault(node.id, []).append(node)
+
+    # nodes are initially evaluated in the same order as the individual `replace_` functions
+    worklist: Deque[vy_ast.VyperNode] = deque(constants.values())
+    worklist.extend(vyper_module.get_descendants(LITERAL_OP_TYPES, reverse=True))
+    worklist.extend(vyper_module.get_descendants(vy_ast.Subscript, reverse=True))
+    worklist.extend(
+        i for i in vyper_module.get_descendants(vy_ast.Call, reverse=True) if _get_builtin(i)
+    )
+    queued: Set[int] = set(id(i) for i in worklist)
+    # nodes removed from the tree are kept so that their IDs are not reused
+    detached: Dict[int, vy_ast.VyperNode] = {}
+
+    def replace(old_node: vy_ast.VyperNode, new_node: vy_ast.VyperNode) -> None:
+        vyper_module.replace_in_tree(old_node, new_node)
+
+        # the new node may be a member of the subtree that it replaces
+        stack = [old_node]
+        while stack:
+            node = stack.pop()
+            if node is not new_node:
+                detached[id(node)] = node
+                stack.extend(node._children)
+
+        dependent = _get_dependent_node(new_node, constants)
+        if dependent is not None and id(dependent) not in queued:
+            queued.add(id(dependent))
+            worklist.append(dependent)
+
+    while worklist:
+        node = worklist.popleft()
+        queued.remove(id(node))
+        if id(node) in detached:
+            continue
+
+        if isinstance(node, vy_ast.AnnAssign):
+            if not _is_literal(node.value):
+                continue
+            for name_node in references.pop(node.target.id, []):
+                if id(name_node) in detached or not _is_constant_reference(name_node):
+                    continue
+                changed_nodes["user_constants"] += 1
+                replace(name_node, _replace(name_node, node.value))
+            continue
+
+        try:
+            if isinstance(node, vy_ast.Call):
+                category = "builtin_functions"
+                new_node = _get_builtin(node).evaluate(node)  # type: ignore
+            else:
+                category = "subscripts" if isinstance(node, vy_ast.Subscript) else "literal_ops"
+                new_node = node.evaluate()
+        except UnfoldableNode:
+            continue
+
+        changed_nodes[category] += 1
+        replace(node, new_node)
+
+    return changed_nodes
+
+
+def _get_builtin(node: vy_ast.Call) -> Optional[object]:
+    # return the builtin function for a call, if it can be evaluated at compile time
+    if not isinstance(node.func, vy_ast.Name):
+        return None
+    func = DISPATCH_TABLE.get(node.func.id)
+    if func is None or not hasattr(func, "evaluate"):
+        return None
+    return func
+
+
+def _get_dependent_node(
+    node: vy_ast.VyperNode, constants: Dict[int, vy_ast.AnnAssign]
+) -> Optional[vy_ast.VyperNode]:
+    # return the nearest ancestor of a node whose evaluation depends upon it
+    parent = node._parent
+    while parent is not None:
+        if isinstance(parent, vy_ast.Call):
+            return parent if _get_builtin(parent) else None
+        if isinstance(parent, LITERAL_OP_TYPES + (vy_ast.Subscript,)):
+            return parent
+        if id(parent) in constants:
+            return parent
+        parent = parent._parent
+    return None
+
 
-    changed_nodes = 1
-    while changed_nodes:
-        changed_nodes = 0
-        changed_nodes += replace_user_defined_constants(vyper_module)
-        changed_nodes += replace_literal_ops(vyper_module)
-        changed_nodes += replace_subscripts(vyper_module)
-        changed_nodes += replace_builtin_functions(vyper_module)
+def _is_literal(node: vy_ast.VyperNode) -> bool:
+    if isinstance(node, vy_ast.List):
+        return all(_is_literal(i) for i in node.elements)
+    return isinstance(node, vy_ast.Constant)
 
 
 def replace_literal_ops(vyper_module: vy_ast.Module) -> int:
@@ -56,8 +169,7 @@ def replace_literal_ops(vyper_module: vy_ast.Module) -> int:
     """
     changed_nodes = 0
 
-    node_types = (vy_ast.BoolOp, vy_ast.BinOp, vy_ast.UnaryOp, vy_ast.Compare)
-    for node in vyper_module.get_descendants(node_types, reverse=True):
+    for node in vyper_module.get_descendants(LITERAL_OP_TYPES, reverse=True):
         try:
             new_node = node.evaluate()
         except UnfoldableNode:
@@ -116,12 +228,8 @@ def replace_builtin_functions(vyper_module: vy_ast.Module) -> int:
     changed_nodes = 0
 
     for node in vyper_module.get_descendants(vy_ast.Call, reverse=True):
-        if not isinstance(node.func, vy_ast.Name):
-            continue
-
-        name = node.func.id
-        func = DISPATCH_TABLE.get(name)
-        if func is None or not hasattr(func, "evaluate"):
+        func = _get_builtin(node)
+        if func is None:
             continue
         try:
             new_node = func.evaluate(node)  # type: ignore
@@ -134,7 +242,7 @@ def replace_builtin_functions(vyper_module: vy_ast.Module) -> int:
     return changed_nodes
 
 
-def replace_builtin_constants(vyper_module: vy_ast.Module) -> None:
+def replace_builtin_constants(vyper_module: vy_ast.Module) -> int:
     """
     Replace references to builtin constants with their literal values.
 
@@ -142,9 +250,20 @@ def replace_builtin_constants(vyper_module: vy_ast.Module) -> None:
     ---------
     vyper_module : Module
         Top-level Vyper AST node.
+
+    Returns
+    -------
+    int
+        Number of nodes that were replaced.
     """
+    changed_nodes = 0
+
     for name, (node, value) in BUILTIN_CONSTANTS.items():
-        replace_constant(vyper_module, name, node(value=value), True)  # type: ignore
+        changed_nodes += replace_constant(
+            vyper_module, name, node(value=value), True  # type: ignore
+        )
+
+    return changed_nodes
 
 
 def replace_user_defined_constants(vyper_module: vy_ast.Module) -> int:
@@ -215,25 +334,9 @@ def replace_constant(
     changed_nodes = 0
 
     for node in vyper_module.get_descendants(vy_ast.Name, {"id": id_}, reverse=True):
-        parent = node.get_ancestor()
-
-        if isinstance(parent, vy_ast.Attribute):
-            # do not replace attributes
-            continue
-        if isinstance(parent, vy_ast.Call) and node == parent.func:
-            # do not replace calls
-            continue
-
-        # do not replace dictionary keys
-        if isinstance(parent, vy_ast.Dict) and node in parent.keys:
+        if not _is_constant_reference(node):
             continue
 
-        if not isinstance(parent, vy_ast.Index):
-            # do not replace left-hand side of assignments
-            assign = node.get_ancestor((vy_ast.Assign, vy_ast.AnnAssign, vy_ast.AugAssign))
-            if assign and node in assign.target.get_descendants(include_self=True):
-                continue
-
         try:
             new_node = _replace(node, replacement_node)
         except UnfoldableNode:
@@ -245,3 +348,29 @@ def replace_constant(
         vyper_module.replace_in_tree(node, new_node)
 
     return changed_nodes
+
+
+def _is_constant_reference(node: vy_ast.Name) -> bool:
+    # check if a name node is a reference that may be replaced with a constant value
+    parent = node.get_ancestor()
+
+    if isinstance(parent, vy_ast.Attribute):
+        # do not replace attributes
+        return False
+    if isinstance(parent, vy_ast.Call) and node == parent.func:
+        # do not replace calls
+        return False
+
+    # do not replace dictionary keys
+    if isinstance(parent, vy_ast.Dict) and node in parent.keys:
+        return False
+
+    if not isinstance(parent, vy_ast.Index):
+        # do not replace left-hand side of assignments
+        assign = node.get_ancestor((vy_ast.Assign, vy_ast.AnnAssign, vy_ast.AugAssign))
+        if isinstance(assign, (vy_ast.Assign, vy_ast.AnnAssign, vy_ast.AugAssign)) and (
+            node in assign.target.get_descendants(include_self=True)
+        ):
+            return False
+
+    return True
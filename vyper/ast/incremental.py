@@ -0,0 +1,274 @@
+import ast as python_ast
+import bisect
+from tokenize import ENCODING, TokenInfo
+from typing import Dict, List, Optional, Tuple
+
+from vyper.ast import nodes as vy_ast
+from vyper.ast.annotation import AnnotatingVisitor
+from vyper.ast.pre_parser import pre_parse_tokens
+from vyper.ast.tokens import SourceTokens, mark_tokens
+from vyper.ast.utils import parse_to_ast
+
+
+def reparse_to_ast(module: vy_ast.Module, start: int, end: int, new_text: str) -> vy_ast.Module:
+    """
+    Apply a text edit to the source of a parsed module, and return the Vyper AST
+    of the edited source.
+
+    Only the top-level statements affected by the edit are parsed again. The
+    statements that are not affected are moved into the returned module, with
+    their source offsets and node IDs shifted to account for the edit. The
+    returned module is identical to the result of calling `parse_to_ast` on the
+    edited source.
+
+    The whole source is parsed again if the edit modifies the module docstring
+    or any code before the first statement, or if the affected statements cannot
+    be parsed on their own. In the latter case the source contains a syntax error
+    and the exception raised is the same as for a full parse.
+
+    Parameters
+    ----------
+    module : Module
+        Module generated by `parse_to_ast` or a previous call to this function.
+        The nodes of this module are reused, so it must not be used afterwards.
+    start : int
+        Offset of the first character of the previous source to replace.
+    end : int
+        Offset after the last character of the previous source to replace.
+    new_text : str
+        Text to insert in place of the replaced characters.
+
+    Returns
+    -------
+    Module
+        Untyped, unoptimized Vyper AST of the edited source.
+    """
+    source_code = module.full_source_code
+    new_source = source_code[:start] + new_text + source_code[end:]
+    source_id = int(module.src.split(":")[2])
+
+    if "\x00" not in new_text:
+        new_module = _reparse_statements(module, start, end, new_source, source_id)
+        if new_module is not None:
+            return new_module
+
+    return parse_to_ast(new_source, source_id, module.name)
+
+
+def _get_statement_offsets(module: vy_ast.Module) -> Tuple[List[int], List[int]]:
+    # offset and line number of the first line of each top-level statement,
+    # including decorators
+    source_code = module.full_source_code
+    offsets = []
+    line_numbers = []
+    for node in module.body:
+        decorators = getattr(node, "decorator_list", None)
+        first_node = decorators[0] if decorators else node
+        offsets.append(source_code.rfind("\n", 0, first_node.source_start) + 1)
+        line_numbers.append(first_node.lineno)
+    return offsets, line_numbers
+
+
+def _get_first_node_id(node: vy_ast.VyperNode) -> int:
+    # `log` statements are nested within an `Expr` node in the python AST, which
+    # is discarded but still receives a node ID
+    return node.node_id - 1 if isinstance(node, vy_ast.Log) else node.node_id
+
+
+def _reparse_statements(
+    module: vy_ast.Module, start: int, end: int, new_source: str, source_id: int
+) -> Optional[vy_ast.Module]:
+    # parse the top-level statements affected by an edit, returns None if the
+    # whole source must be parsed
+    if not module.body or new_source[:1] in ("", " ", "\t", "\f"):
+        # the offsets of the module depend on the first token of the source
+        return None
+    if module._singleton_ids is None:
+        # the module was not generated by `parse_to_ast`
+        return None
+
+    source_code = module.full_source_code
+    statement_offsets, line_numbers = _get_statement_offsets(module)
+    if start < statement_offsets[0]:
+        return None
+
+    # each statement extends until the first line of the next statement, an edit
+    # on the boundary of two statements may modify either of them
+    first_idx = bisect.bisect_right(statement_offsets, start) - 1
+    if first_idx and statement_offsets[first_idx] == start:
+        first_idx -= 1
+    end_idx = bisect.bisect_right(statement_offsets, end)
+
+    region_start = statement_offsets[first_idx]
+    old_body = module.body
+    if next((i for i in old_body[:first_idx] if i.source_end > region_start), None):
+        # the offsets of a `log` statement may be shifted past the end of the line,
+        # which extends the preceding statement into the modified code
+        return None
+
+    if end_idx < len(statement_offsets):
+        old_region_end = statement_offsets[end_idx]
+    else:
+        old_region_end = len(source_code)
+    offset_delta = len(new_source) - len(source_code)
+    region_code = new_source[region_start : old_region_end + offset_delta]  # noqa: E203
+
+    # the region is parsed on its own, with line numbers shifted to match the edited source
+    row_offset = line_numbers[first_idx] - 1
+    try:
+        class_types, reformatted_code, token_list = pre_parse_tokens(region_code)
+        py_ast = python_ast.parse("\n" * row_offset + reformatted_code)
+    except Exception:
+        # the source is parsed again in full, to raise the exception with correct offsets
+        return None
+
+    token_list = [
+        TokenInfo(typ, string, (s[0] + row_offset, s[1]), (e[0] + row_offset, e[1]), line)
+        for typ, string, s, e, line in token_list
+        if typ != ENCODING
+    ]
+    class_types = {(k[0] + row_offset, k[1]): v for k, v in class_types.items()}
+    tokens = SourceTokens(new_source, token_list)
+    try:
+        # the offsets of a `log` statement may run past the last token of the region
+        mark_tokens(py_ast, tokens)
+        if end_idx < len(old_body) and py_ast.body:
+            # as above, a statement must not be extended into the following code
+            last_token_pos = max(i.last_token.startpos for i in py_ast.body)  # type: ignore
+            if last_token_pos >= old_region_end + offset_delta:
+                return None
+    except Exception:
+        return None
+
+    doc_string = getattr(module, "doc_string", None)
+    if first_idx == 0 and doc_string is None and py_ast.body:
+        # if the first statement is a string, it becomes the module docstring
+        first_stmt = py_ast.body[0]
+        if isinstance(first_stmt, python_ast.Expr) and isinstance(first_stmt.value, python_ast.Str):
+            return None
+
+    first_node_id = _get_first_node_id(old_body[first_idx])
+    visitor = AnnotatingVisitor(new_source, class_types, tokens, source_id, module.name)
+    visitor.counter = first_node_id
+    try:
+        new_statements = [visitor.visit(i) for i in py_ast.body]
+    except Exception:
+        return None
+
+    # node IDs are assigned in order, the module docstring is assigned the last ID
+    end_node_id: Optional[int] = None
+    if end_idx < len(old_body):
+        end_node_id = _get_first_node_id(old_body[end_idx])
+    elif doc_string is not None:
+        end_node_id = doc_string.node_id
+    id_delta = 0 if end_node_id is None else visitor.counter - end_node_id
+    line_delta = region_code.count("\n") - source_code.count("\n", region_start, old_region_end)
+
+    if not (new_statements or old_body[:first_idx] or old_body[end_idx:]):
+        return None
+
+    singleton_ids = _merge_singleton_ids(
+        module._singleton_ids, visitor.singleton_ids, first_node_id, end_node_id, id_delta
+    )
+    # every occurrence of an operator shares the node ID of the last occurrence
+    operator_ids = {k: v[-1] for k, v in singleton_ids.items()}
+
+    new_module = vy_ast.Module.from_node(module, body=[], name=module.name)
+    new_module.full_source_code = new_source
+    new_module._singleton_ids = singleton_ids
+    try:
+        new_nodes = [vy_ast.get_node(i, new_module) for i in new_statements]
+    except Exception:
+        return None
+
+    for node in old_body[:first_idx]:
+        _move_node(node, new_module, new_source, operator_ids)
+    for node in new_nodes:
+        _move_node(node, new_module, new_source, operator_ids)
+    for node in old_body[end_idx:]:
+        _move_node(node, new_module, new_source, operator_ids, id_delta, line_delta, offset_delta)
+    body = old_body[:first_idx] + new_nodes + old_body[end_idx:]
+    new_module.body = body
+    new_module._children = body.copy()
+    if doc_string is not None:
+        _move_node(doc_string, new_module, new_source, operator_ids)
+        doc_string.node_id += id_delta
+        new_module.doc_string = doc_string
+        new_module._children.append(doc_string)
+
+    # the module ends with the last statement
+    last_node = body[-1]
+    new_module.end_lineno = last_node.end_lineno
+    new_module.end_col_offset = last_node.end_col_offset
+    new_module.source_end = last_node.source_end
+    length = last_node.source_end - new_module.source_start
+    new_module.src = f"{new_module.source_start}:{length}:{source_id}"
+
+    return new_module
+
+
+def _merge_singleton_ids(
+    old_ids: Dict[str, List[int]],
+    new_ids: Dict[str, List[int]],
+    start_id: int,
+    end_id: Optional[int],
+    id_delta: int,
+) -> Dict[str, List[int]]:
+    # replace the operator node IDs of the statements that were parsed again, and
+    # shift the IDs of the following statements
+    singleton_ids = {}
+    for key in list(old_ids) + [i for i in new_ids if i not in old_ids]:
+        ids = old_ids.get(key, [])
+        merged = ids[: bisect.bisect_left(ids, start_id)] + new_ids.get(key, [])
+        if end_id is not None:
+            merged += [i + id_delta for i in ids[bisect.bisect_left(ids, end_id) :]]  # noqa: E203
+        if merged:
+            singleton_ids[key] = merged
+    return singleton_ids
+
+
+def _move_node(
+    node: vy_ast.VyperNode,
+    new_parent: vy_ast.Module,
+    new_source: str,
+    operator_ids: Dict[str, int],
+    id_delta: int = 0,
+    line_delta: int = 0,
+    offset_delta: int = 0,
+) -> None:
+    # move a top-level statement to a new module, and shift the IDs and source
+    # offsets of the statement and all of its descendants
+    node._parent = new_parent
+    stack = [node]
+
+    if not (id_delta or line_delta or offset_delta):
+        while stack:
+            child = stack.pop()
+            child.full_source_code = new_source
+            if child.ast_type in operator_ids:
+                child.node_id = operator_ids[child.ast_type]
+            stack.extend(child._children)
+        return
+
+    # nodes without their own offsets share the `src` of their parent
+    src_map: Dict[str, str] = {}
+    while stack:
+        child = stack.pop()
+        stack.extend(child._children)
+        child.full_source_code = new_source
+        if child.ast_type in operator_ids:
+            child.node_id = operator_ids[child.ast_type]
+        else:
+            child.node_id += id_delta
+        if child.lineno is not None:
+            child.lineno += line_delta
+            child.end_lineno += line_delta
+        if child.source_start is not None:
+            child.source_start += offset_delta
+            child.source_end += offset_delta
+        src = child.src
+        if src is not None:
+            if src not in src_map:
+                src_start, _, src_rest = src.partition(":")
+                src_map[src] = f"{int(src_start) + offset_delta}:{src_rest}"
+            child.src = src_map[src]
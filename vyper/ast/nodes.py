@@ -1,8 +1,10 @@
 import ast as python_ast
+import bisect
 import decimal
+import heapq
 import operator
 import sys
-from typing import Any, Optional, Union
+from typing import Any, Dict, FrozenSet, Optional, Tuple, TypeVar, Union
 
 from vyper.exceptions import (
     CompilerPanic,
@@ -20,7 +22,9 @@ from vyper.utils import MAX_DECIMAL_PLACES, SizeLimits, annotate_source_code
 NODE_BASE_ATTRIBUTES = (
     "_children",
     "_depth",
+    "_metadata",
     "_parent",
+    "_sorted_children",
     "ast_type",
     "node_id",
 )
@@ -30,11 +34,14 @@ NODE_SRC_ATTRIBUTES = (
     "end_lineno",
     "full_source_code",
     "lineno",
-    "node_source_code",
+    "source_end",
+    "source_start",
     "src",
 )
 
-DICT_AST_SKIPLIST = ("full_source_code", "node_source_code")
+DICT_AST_SKIPLIST = ("full_source_code", "source_end", "source_start")
+
+_NodeT = TypeVar("_NodeT", bound="VyperNode")
 
 
 def get_node(
@@ -102,7 +109,7 @@ def compare_nodes(left_node: "VyperNode", right_node: "VyperNode") -> bool:
     if not isinstance(left_node, type(right_node)):
         return False
 
-    for field_name in (i for i in left_node.get_fields() if i not in VyperNode.__slots__):
+    for field_name in left_node._node_fields:
         left_value = getattr(left_node, field_name, None)
         right_value = getattr(right_node, field_name, None)
 
@@ -149,15 +156,53 @@ def _node_filter(node, filters):
     return True
 
 
-def _sort_nodes(node_iterable):
-    # sorting function for VyperNode.get_children
+def _sort_key(node):
+    # nodes are sorted by source offset and then node ID, nodes without an offset are last
+    lineno = float("inf") if node.lineno is None else node.lineno
+    col_offset = float("inf") if node.col_offset is None else node.col_offset
+    return (lineno, col_offset, node.node_id)
 
-    def sortkey(key):
-        return float("inf") if key is None else key
 
-    return sorted(
-        node_iterable, key=lambda k: (sortkey(k.lineno), sortkey(k.col_offset), k.node_id),
-    )
+def _sort_nodes(node_iterable):
+    # sorting function for VyperNode.get_children
+    return sorted(node_iterable, key=_sort_key)
+
+
+def _clone(node, parent):
+    new_node = object.__new__(type(node))
+    new_node._parent = parent
+    new_node._children = []
+    new_node._sorted_children = None
+
+    for field_name in node._slot_names:
+        if field_name in ("_parent", "_children", "_sorted_children"):
+            continue
+        if field_name == "_index":
+            # the index of a `Module` refers to the original nodes and is rebuilt on use
+            new_node._index = None
+            continue
+        if field_name == "_metadata":
+            new_node._metadata = node._metadata.copy()
+            continue
+        value = getattr(node, field_name, None)
+        if isinstance(value, VyperNode):
+            value = _clone(value, new_node)
+        elif isinstance(value, list):
+            value = [_clone(i, new_node) if isinstance(i, VyperNode) else i for i in value]
+        setattr(new_node, field_name, value)
+
+    if parent is not None:
+        parent._children.append(new_node)
+    return new_node
+
+
+def _iter_subtree(node):
+    # yield a node and all of its descendants
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node._children)
 
 
 def _raise_syntax_exc(error_msg: str, ast_struct: dict) -> None:
@@ -210,12 +255,47 @@ class VyperNode:
     _translated_fields : Dict, optional
         Field names that are reassigned if encountered. Used to normalize fields
         across different Python versions.
+
+    Field tables are built once for each node class, when the class is created:
+
+    _slot_names : Tuple
+        All slots of the node, including those inherited from base classes.
+    _field_names : FrozenSet
+        Public fields of the node, as returned by `get_fields`.
+    _node_fields : Tuple
+        Public fields that are specific to the node type, i.e. not source offsets.
+    _dict_fields : Tuple
+        Public fields that are included in the output of `to_dict`.
+
+    Instance Attributes
+    -------------------
+    _metadata : Dict
+        Data attached to the node by later compiler phases, e.g. the type of an
+        annotation as resolved during semantic validation. Copied by `clone`, but not
+        included in the output of `to_dict` or in comparisons between nodes.
     """
 
     __slots__ = NODE_BASE_ATTRIBUTES + NODE_SRC_ATTRIBUTES
     _only_empty_fields: tuple = ()
     _translated_fields: dict = {}
 
+    _slot_names: Tuple[str, ...]
+    _field_names: FrozenSet[str]
+    _node_fields: Tuple[str, ...]
+    _dict_fields: Tuple[str, ...]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls._set_field_tables()
+
+    @classmethod
+    def _set_field_tables(cls) -> None:
+        slot_names = set(x for i in cls.__mro__ for x in getattr(i, "__slots__", ()))
+        cls._slot_names = tuple(sorted(slot_names))
+        cls._field_names = frozenset(i for i in slot_names if not i.startswith("_"))
+        cls._node_fields = tuple(sorted(cls._field_names.difference(VyperNode.__slots__)))
+        cls._dict_fields = tuple(sorted(cls._field_names.difference(DICT_AST_SKIPLIST)))
+
     def __init__(self, parent: Optional["VyperNode"] = None, **kwargs: dict):
         """
         AST node initializer method.
@@ -232,23 +312,28 @@ class VyperNode:
         """
         self._parent = parent
         self._depth = getattr(parent, "_depth", -1) + 1
-        self._children: set = set()
+        # children are compared by identity, so a list is used instead of a set
+        self._children: list = []
+        self._sorted_children: Optional[list] = None
+        self._metadata: dict = {}
 
         for field_name in NODE_SRC_ATTRIBUTES:
             # when a source offset is not available, use the parent's source offset
             value = kwargs.get(field_name)
-            if kwargs.get(field_name) is None:
+            if value is None:
                 value = getattr(parent, field_name, None)
             setattr(self, field_name, value)
 
+        field_names = self._field_names
+        translated_fields = self._translated_fields
         for field_name, value in kwargs.items():
             if field_name in NODE_SRC_ATTRIBUTES:
                 continue
 
-            if field_name in self._translated_fields:
-                field_name = self._translated_fields[field_name]
+            if field_name in translated_fields:
+                field_name = translated_fields[field_name]
 
-            if field_name in self.get_fields():
+            if field_name in field_names:
                 if isinstance(value, list):
                     value = [_to_node(i, self) for i in value]
                 else:
@@ -262,9 +347,9 @@ class VyperNode:
                     kwargs,
                 )
 
-        # add to children of parent last to ensure an accurate hash is generated
         if parent is not None:
-            parent._children.add(self)
+            parent._children.append(self)
+            parent._sorted_children = None
 
     @classmethod
     def from_node(cls, node: "VyperNode", **kwargs) -> "VyperNode":
@@ -292,16 +377,36 @@ class VyperNode:
         ast_struct.update(ast_type=cls.__name__, **kwargs)
         return cls(**ast_struct)
 
+    def clone(self: "_NodeT") -> "_NodeT":
+        """
+        Return a copy of this node and all of its descendants.
+
+        Node slots are copied directly, which is much faster than `copy.deepcopy`.
+        Values that are not nodes, such as names, literal values and source code
+        strings, are immutable and shared with the original node.
+
+        The returned node has the same parent as the original node, so that
+        `get_ancestor` continues to work, but it is not a child of that parent.
+        Use `replace_in_tree` to insert it within the tree.
+
+        Returns
+        -------
+        VyperNode
+            Copy of this node.
+        """
+        new_node = _clone(self, None)
+        new_node._parent = self._parent
+        return new_node
+
     @classmethod
-    def get_fields(cls) -> set:
+    def get_fields(cls) -> FrozenSet[str]:
         """
         Return a set of field names for this node.
 
         Attributes that are prepended with an underscore are considered private
         and are not included within this sequence.
         """
-        slot_fields = [x for i in cls.__mro__ for x in getattr(i, "__slots__", [])]
-        return set(i for i in slot_fields if not i.startswith("_"))
+        return cls._field_names
 
     def __hash__(self):
         values = [getattr(self, i, None) for i in VyperNode.__slots__ if not i.startswith("_")]
@@ -312,7 +417,7 @@ class VyperNode:
             return False
         if other.node_id != self.node_id:
             return False
-        for field_name in (i for i in self.get_fields() if i not in VyperNode.__slots__):
+        for field_name in self._node_fields:
             if getattr(self, field_name, None) != getattr(other, field_name, None):
                 return False
         return True
@@ -331,6 +436,19 @@ class VyperNode:
 
         return f"{class_repr}:\n{source_annotation}"
 
+    @property
+    def node_source_code(self) -> Optional[str]:
+        """
+        Property method returning the source code of this node.
+
+        All nodes share a reference to `full_source_code`. The source of an
+        individual node is sliced from it on access, using the `source_start`
+        and `source_end` character offsets.
+        """
+        if self.full_source_code is None or self.source_start is None:
+            return None
+        return self.full_source_code[self.source_start : self.source_end]  # noqa: E203
+
     @property
     def description(self):
         """
@@ -370,7 +488,7 @@ class VyperNode:
         Return the node as a dict. Child nodes and their descendants are also converted.
         """
         ast_dict = {}
-        for key in [i for i in self.get_fields() if i not in DICT_AST_SKIPLIST]:
+        for key in self._dict_fields:
             value = getattr(self, key, None)
             if isinstance(value, list):
                 ast_dict[key] = [_to_dict(i) for i in value]
@@ -440,9 +558,12 @@ class VyperNode:
         list
             Child nodes matching the filter conditions.
         """
-        children = _sort_nodes(self._children)
-        if node_type is not None:
-            children = [i for i in children if isinstance(i, node_type)]
+        if self._sorted_children is None:
+            self._sorted_children = _sort_nodes(self._children)
+        if node_type is None:
+            children = self._sorted_children.copy()
+        else:
+            children = [i for i in self._sorted_children if isinstance(i, node_type)]
         if reverse:
             children.reverse()
         if filters is None:
@@ -492,9 +613,13 @@ class VyperNode:
         list
             Descendant nodes matching the filter conditions.
         """
-        children = self.get_children(node_type, filters)
-        for node in self.get_children():
-            children.extend(node.get_descendants(node_type, filters))
+        subtree = _iter_subtree(self)
+        next(subtree)
+        children = [
+            i
+            for i in subtree
+            if (not node_type or isinstance(i, node_type)) and _node_filter(i, filters)
+        ]
         if (
             include_self
             and (not node_type or isinstance(self, node_type))
@@ -527,6 +652,9 @@ class VyperNode:
         return obj
 
 
+VyperNode._set_field_tables()
+
+
 class TopLevel(VyperNode):
     """
     Inherited class for Module and FunctionDef nodes.
@@ -553,7 +681,87 @@ class TopLevel(VyperNode):
 
 
 class Module(TopLevel):
-    __slots__ = ()
+    """
+    The top-level node of a contract.
+
+    A module maintains an index of every descendant node, grouped by type and
+    sorted in source order. The index is built on the first call to
+    `get_descendants` and is updated by `replace_in_tree`, so type-filtered queries
+    take time proportional to the number of matching nodes rather than the size
+    of the tree. Modifications to the tree must be made via `replace_in_tree` to
+    keep the index accurate.
+    """
+
+    __slots__ = ("_index", "_singleton_ids")
+
+    def __init__(self, parent: Optional["VyperNode"] = None, **kwargs: dict):
+        self._index: Optional[Dict[type, Tuple[list, list]]] = None
+        # node IDs of each occurrence of an operator, by type, used by `reparse_to_ast`
+        self._singleton_ids: Optional[Dict[str, list]] = kwargs.pop("singleton_ids", None)
+        super().__init__(parent, **kwargs)
+
+    def _get_index(self) -> Dict[type, Tuple[list, list]]:
+        # node type -> (sort keys, nodes), both sorted in source order
+        if self._index is None:
+            index: Dict[type, list] = {}
+            subtree = _iter_subtree(self)
+            next(subtree)
+            for node in subtree:
+                index.setdefault(type(node), []).append(node)
+            self._index = {}
+            for key, nodes in index.items():
+                nodes = _sort_nodes(nodes)
+                self._index[key] = ([_sort_key(i) for i in nodes], nodes)
+        return self._index
+
+    def _add_to_index(self, node: VyperNode) -> None:
+        for descendant in _iter_subtree(node):
+            keys, nodes = self._index.setdefault(type(descendant), ([], []))  # type: ignore
+            sort_key = _sort_key(descendant)
+            idx = bisect.bisect_right(keys, sort_key)
+            keys.insert(idx, sort_key)
+            nodes.insert(idx, descendant)
+
+    def _remove_from_index(self, node: VyperNode) -> None:
+        for descendant in _iter_subtree(node):
+            keys, nodes = self._index.get(type(descendant), ([], []))  # type: ignore
+            sort_key = _sort_key(descendant)
+            idx = bisect.bisect_left(keys, sort_key)
+            while idx < len(nodes) and keys[idx] == sort_key:
+                if nodes[idx] is descendant:
+                    del keys[idx]
+                    del nodes[idx]
+                    break
+                idx += 1
+
+    def get_descendants(
+        self,
+        node_type: Union["VyperNode", tuple, None] = None,
+        filters: Optional[dict] = None,
+        include_self: bool = False,
+        reverse: bool = False,
+    ) -> list:
+        index = self._get_index()
+        if node_type is None:
+            node_lists = [v[1] for v in index.values()]
+        else:
+            node_lists = [v[1] for k, v in index.items() if issubclass(k, node_type)]
+
+        if len(node_lists) == 1:
+            descendants = node_lists[0].copy()
+        else:
+            descendants = list(heapq.merge(*node_lists, key=_sort_key))
+        if filters:
+            descendants = [i for i in descendants if _node_filter(i, filters)]
+        if (
+            include_self
+            and (not node_type or isinstance(self, node_type))
+            and _node_filter(self, filters)
+        ):
+            descendants = _sort_nodes(descendants + [self])
+        if reverse:
+            descendants.reverse()
+        return descendants
 
     def replace_in_tree(self, old_node: VyperNode, new_node: VyperNode) -> None:
         """
@@ -572,10 +780,14 @@ class Module(TopLevel):
         None
         """
         parent = old_node._parent
-        if old_node not in self.get_descendants(type(old_node)):
+        ancestor = parent
+        while ancestor is not None and ancestor is not self:
+            ancestor = ancestor._parent
+        if ancestor is None:
             raise CompilerPanic("Node to be replaced does not exist within the tree")
 
-        if old_node not in parent._children:
+        child_idx = next((i for i, n in enumerate(parent._children) if n is old_node), None)
+        if child_idx is None:
             raise CompilerPanic("Node to be replaced does not exist within parent children")
 
         is_replaced = False
@@ -594,11 +806,14 @@ class Module(TopLevel):
         if not is_replaced:
             raise CompilerPanic("Node to be replaced does not exist within parent members")
 
-        parent._children.remove(old_node)
-
         new_node._parent = parent
         new_node._depth = old_node._depth
-        parent._children.add(new_node)
+        parent._children[child_idx] = new_node
+        parent._sorted_children = None
+
+        if self._index is not None:
+            self._remove_from_index(old_node)
+            self._add_to_index(new_node)
 
 
 class FunctionDef(TopLevel):
@@ -971,11 +1186,13 @@ class Compare(VyperNode):
     __slots__ = ("left", "op", "right")
 
     def __init__(self, *args, **kwargs):
-        if len(kwargs["ops"]) > 1 or len(kwargs["comparators"]) > 1:
-            _raise_syntax_exc("Cannot have a comparison with more than two elements", kwargs)
+        # a node created from a vyper AST dict already has `op` and `right`
+        if "ops" in kwargs:
+            if len(kwargs["ops"]) > 1 or len(kwargs["comparators"]) > 1:
+                _raise_syntax_exc("Cannot have a comparison with more than two elements", kwargs)
 
-        kwargs["op"] = kwargs.pop("ops")[0]
-        kwargs["right"] = kwargs.pop("comparators")[0]
+            kwargs["op"] = kwargs.pop("ops")[0]
+            kwargs["right"] = kwargs.pop("comparators")[0]
         super().__init__(*args, **kwargs)
 
     def evaluate(self) -> VyperNode:
@@ -1116,10 +1333,12 @@ class Assign(VyperNode):
     __slots__ = ("target", "value")
 
     def __init__(self, *args, **kwargs):
-        if len(kwargs["targets"]) > 1:
-            _raise_syntax_exc("Assignment statement must have one target", kwargs)
+        # a node created from a vyper AST dict already has a single target
+        if "targets" in kwargs:
+            if len(kwargs["targets"]) > 1:
+                _raise_syntax_exc("Assignment statement must have one target", kwargs)
 
-        kwargs["target"] = kwargs.pop("targets")[0]
+            kwargs["target"] = kwargs.pop("targets")[0]
         super().__init__(*args, **kwargs)
 
 
@@ -1149,11 +1368,13 @@ class _Import(VyperNode):
     __slots__ = ("name", "alias")
 
     def __init__(self, *args, **kwargs):
-        if len(kwargs["names"]) > 1:
-            _raise_syntax_exc("Assignment statement must have one target", kwargs)
-        names = kwargs.pop("names")[0]
-        kwargs["name"] = names.name
-        kwargs["alias"] = names.asname
+        # a node created from a vyper AST dict already has `name` and `alias`
+        if "names" in kwargs:
+            if len(kwargs["names"]) > 1:
+                _raise_syntax_exc("Assignment statement must have one target", kwargs)
+            names = kwargs.pop("names")[0]
+            kwargs["name"] = names.name
+            kwargs["alias"] = names.asname
         super().__init__(*args, **kwargs)
 
 
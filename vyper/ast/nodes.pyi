@@ -1,5 +1,5 @@
 import ast as python_ast
-from typing import Any, Optional, Sequence, Type, Union
+from typing import Any, FrozenSet, Optional, Sequence, Type, TypeVar, Union
 
 from .natspec import parse_natspec as parse_natspec
 from .utils import ast_to_dict as ast_to_dict
@@ -9,24 +9,41 @@ NODE_BASE_ATTRIBUTES: Any
 NODE_SRC_ATTRIBUTES: Any
 DICT_AST_SKIPLIST: Any
 
+_NodeT = TypeVar("_NodeT", bound=VyperNode)
+
 def get_node(
     ast_struct: Union[dict, python_ast.AST], parent: Optional[VyperNode] = ...
 ) -> VyperNode: ...
 def compare_nodes(left_node: VyperNode, right_node: VyperNode) -> bool: ...
 
 class VyperNode:
+    ast_type: str = ...
+    node_id: int = ...
+    lineno: int = ...
+    col_offset: int = ...
+    end_lineno: int = ...
+    end_col_offset: int = ...
+    src: str = ...
     full_source_code: str = ...
-    node_source_code: str = ...
+    source_start: int = ...
+    source_end: int = ...
+    _parent: Optional[VyperNode] = ...
+    _children: list = ...
+    _dict_fields: Sequence[str] = ...
+    _metadata: dict = ...
+    @property
+    def node_source_code(self) -> str: ...
     def __init__(self, parent: Optional[VyperNode] = ..., **kwargs: dict) -> None: ...
     def __hash__(self) -> Any: ...
     def __eq__(self, other: Any) -> Any: ...
     @property
     def description(self): ...
     @classmethod
-    def get_fields(cls: Any) -> set: ...
+    def get_fields(cls: Any) -> FrozenSet[str]: ...
     def evaluate(self) -> VyperNode: ...
     @classmethod
     def from_node(cls, node: VyperNode, **kwargs: Any) -> Any: ...
+    def clone(self: _NodeT) -> _NodeT: ...
     def to_dict(self) -> dict: ...
     def get_children(
         self,
@@ -57,6 +74,7 @@ class TopLevel(VyperNode):
     def __contains__(self, obj: Any) -> bool: ...
 
 class Module(TopLevel):
+    _singleton_ids: Optional[dict] = ...
     def replace_in_tree(self, old_node: VyperNode, new_node: VyperNode) -> None: ...
 
 class FunctionDef(TopLevel):
@@ -172,7 +190,9 @@ class Subscript(VyperNode):
 class Index(VyperNode):
     value: Constant = ...
 
-class Assign(VyperNode): ...
+class Assign(VyperNode):
+    target: VyperNode = ...
+    value: VyperNode = ...
 
 class AnnAssign(VyperNode):
     target: Name = ...
@@ -9,7 +9,7 @@ from tokenize import (
     tokenize,
     untokenize,
 )
-from typing import Tuple
+from typing import List, Tuple
 
 from semantic_version import NpmSpec, Version
 
@@ -80,6 +80,28 @@ VYPER_EXPRESSION_TYPES = {
 
 
 def pre_parse(code: str) -> Tuple[ModificationOffsets, str]:
+    """
+    Re-formats a vyper source string into a python source string.
+
+    See `pre_parse_tokens` for details.
+
+    Parameters
+    ----------
+    code : str
+        The vyper source code to be re-formatted.
+
+    Returns
+    -------
+    dict
+        Mapping of offsets where source was modified.
+    str
+        Reformatted python source string.
+    """
+    modification_offsets, reformatted_code, _ = pre_parse_tokens(code)
+    return modification_offsets, reformatted_code
+
+
+def pre_parse_tokens(code: str) -> Tuple[ModificationOffsets, str, List[TokenInfo]]:
     """
     Re-formats a vyper source string into a python source string and performs
     some validation.  More specifically,
@@ -90,7 +112,8 @@ def pre_parse(code: str) -> Tuple[ModificationOffsets, str]:
     * Prevents use of python semi-colon statement separator
 
     Also returns a mapping of detected interface and struct names to their
-    respective vyper class types ("interface" or "struct").
+    respective vyper class types ("interface" or "struct"), and the tokens of
+    the original source so they can be reused when annotating the AST.
 
     Parameters
     ----------
@@ -103,6 +126,8 @@ def pre_parse(code: str) -> Tuple[ModificationOffsets, str]:
         Mapping of offsets where source was modified.
     str
         Reformatted python source string.
+    list
+        Tokens of the vyper source code.
     """
     result = []
     modification_offsets: ModificationOffsets = {}
@@ -158,4 +183,4 @@ def pre_parse(code: str) -> Tuple[ModificationOffsets, str]:
     except TokenError as e:
         raise SyntaxException(e.args[0], code, e.args[1][0], e.args[1][1]) from e
 
-    return modification_offsets, untokenize(result).decode("utf-8")
+    return modification_offsets, untokenize(result).decode("utf-8"), token_list
@@ -0,0 +1,325 @@
+"""
+Serialization of Vyper AST nodes.
+
+`dump` and `load` convert a node and its descendants to and from a compact binary
+encoding. The encoding holds the same data as `VyperNode.to_dict`:
+
+* node types are written as IDs into a table of node types, and each node type
+  lists its field names once, so a node is written as a type ID followed by the
+  values of its fields
+* all strings (node types, field names and string values) are stored once in a
+  shared string table, and referenced by index
+* integers, including node IDs and source offsets, are written as varints
+
+`dump_json` writes the JSON encoding of `VyperNode.to_dict` incrementally, without
+first creating the dict.
+"""
+
+import decimal
+import json
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from vyper.ast import nodes as vy_ast
+from vyper.exceptions import CompilerPanic
+
+MAGIC = b"VYAST"
+VERSION = 1
+
+# value tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_STR = 4
+_BYTES = 5
+_DECIMAL = 6
+_LIST = 7
+_NODE = 8
+
+# number of chunks buffered by `dump_json` before writing
+_JSON_BUFFER_SIZE = 4096
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    # unsigned LEB128
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_signed(out: bytearray, value: int) -> None:
+    # zigzag encoding, so that small negative values are also short
+    _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.body = bytearray()
+        self.strings: Dict[str, int] = {}
+        self.node_types: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self.type_table: List[Tuple[int, List[int]]] = []
+
+    def intern(self, value: str) -> int:
+        idx = self.strings.get(value)
+        if idx is None:
+            idx = self.strings[value] = len(self.strings)
+        return idx
+
+    def get_node_type(self, node: vy_ast.VyperNode) -> Tuple[int, Tuple[str, ...]]:
+        ast_type = node.ast_type
+        if ast_type not in self.node_types:
+            fields = tuple(i for i in node._dict_fields if i != "ast_type")
+            self.node_types[ast_type] = (len(self.type_table), fields)
+            self.type_table.append((self.intern(ast_type), [self.intern(i) for i in fields]))
+        return self.node_types[ast_type]
+
+    def write_node(self, node: vy_ast.VyperNode) -> None:
+        type_id, fields = self.get_node_type(node)
+        out = self.body
+        out.append(_NODE)
+        _write_varint(out, type_id)
+        for field_name in fields:
+            self.write_value(getattr(node, field_name, None))
+
+    def write_value(self, value: Any) -> None:
+        out = self.body
+        value_type = type(value)
+        if value_type is int:
+            out.append(_INT)
+            if 0 <= value < 0x40:
+                # fast path for small values, which encode to a single byte
+                out.append(value << 1)
+            else:
+                _write_signed(out, value)
+        elif value_type is str:
+            out.append(_STR)
+            _write_varint(out, self.intern(value))
+        elif value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, vy_ast.VyperNode):
+            self.write_node(value)
+        elif value_type is list:
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.write_value(item)
+        elif isinstance(value, bytes):
+            out.append(_BYTES)
+            _write_varint(out, len(value))
+            out += value
+        elif isinstance(value, decimal.Decimal):
+            out.append(_DECIMAL)
+            _write_varint(out, self.intern(str(value)))
+        else:
+            raise CompilerPanic(f"Cannot serialize AST value of type {type(value).__name__}")
+
+    def getvalue(self) -> bytes:
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+
+        _write_varint(out, len(self.strings))
+        for value in self.strings:
+            encoded = value.encode("utf-8")
+            _write_varint(out, len(encoded))
+            out += encoded
+
+        _write_varint(out, len(self.type_table))
+        for name_idx, field_idxs in self.type_table:
+            _write_varint(out, name_idx)
+            _write_varint(out, len(field_idxs))
+            for idx in field_idxs:
+                _write_varint(out, idx)
+
+        out += self.body
+        return bytes(out)
+
+
+class _Decoder:
+    def __init__(self, data: bytes) -> None:
+        if data[: len(MAGIC)] != MAGIC:
+            raise CompilerPanic("Data is not a serialized Vyper AST")
+        if data[len(MAGIC)] != VERSION:
+            raise CompilerPanic(f"Unsupported Vyper AST serialization version: {data[len(MAGIC)]}")
+        self.data = data
+        self.pos = len(MAGIC) + 1
+
+        self.strings: List[str] = []
+        for _ in range(self.read_varint()):
+            length = self.read_varint()
+            self.strings.append(data[self.pos : self.pos + length].decode("utf-8"))  # noqa: E203
+            self.pos += length
+
+        self.type_table: List[Tuple[str, List[str]]] = []
+        for _ in range(self.read_varint()):
+            ast_type = self.strings[self.read_varint()]
+            fields = [self.strings[self.read_varint()] for _ in range(self.read_varint())]
+            self.type_table.append((ast_type, fields))
+
+    def read_varint(self) -> int:
+        data = self.data
+        byte = data[self.pos]
+        if byte < 0x80:
+            # fast path for single byte values
+            self.pos += 1
+            return byte
+        result = 0
+        shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read_signed(self) -> int:
+        value = self.read_varint()
+        return -((value + 1) >> 1) if value & 1 else value >> 1
+
+    def read_value(self) -> Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _NODE:
+            ast_type, fields = self.type_table[self.read_varint()]
+            ast_dict = {"ast_type": ast_type}
+            for field_name in fields:
+                ast_dict[field_name] = self.read_value()
+            return ast_dict
+        if tag == _INT:
+            return self.read_signed()
+        if tag == _STR:
+            return self.strings[self.read_varint()]
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _LIST:
+            return [self.read_value() for _ in range(self.read_varint())]
+        if tag == _BYTES:
+            length = self.read_varint()
+            value = self.data[self.pos : self.pos + length]  # noqa: E203
+            self.pos += length
+            return bytes(value)
+        if tag == _DECIMAL:
+            return decimal.Decimal(self.strings[self.read_varint()])
+        raise CompilerPanic(f"Invalid value tag in serialized Vyper AST: {tag}")
+
+
+def dump(node: vy_ast.VyperNode) -> bytes:
+    """
+    Serialize a Vyper AST node and its descendants.
+
+    Arguments
+    ---------
+    node : VyperNode
+        Node to serialize.
+
+    Returns
+    -------
+    bytes
+        Binary encoding of the node, which can be converted back into a node with `load`.
+    """
+    encoder = _Encoder()
+    encoder.write_node(node)
+    return encoder.getvalue()
+
+
+def load(data: bytes) -> vy_ast.VyperNode:
+    """
+    Deserialize a Vyper AST node that was serialized with `dump`.
+
+    The node is created with `get_node`, in the same way as `dict_to_ast`, and is
+    equal to the original node. The full source code is not included in the
+    encoding, so it is not available on the returned nodes.
+
+    Arguments
+    ---------
+    data : bytes
+        Binary encoding of the node.
+
+    Returns
+    -------
+    VyperNode
+        The deserialized node.
+    """
+    try:
+        decoder = _Decoder(data)
+        ast_dict = decoder.read_value()
+    except (IndexError, UnicodeDecodeError, decimal.InvalidOperation) as exc:
+        raise CompilerPanic("Data is not a serialized Vyper AST") from exc
+    if not isinstance(ast_dict, dict) or decoder.pos != len(data):
+        raise CompilerPanic("Data is not a serialized Vyper AST")
+    return vy_ast.get_node(ast_dict)
+
+
+def dump_json(
+    node: vy_ast.VyperNode, fp: IO[str], default: Optional[Callable[[Any], Any]] = None
+) -> None:
+    """
+    Write the JSON encoding of a Vyper AST node to a file.
+
+    The output is identical to `json.dump(node.to_dict(), fp)`, but is generated
+    incrementally without creating the dict.
+
+    Arguments
+    ---------
+    node : VyperNode
+        Node to write.
+    fp : IO
+        File-like object with a `write` method.
+    default : Callable, optional
+        Function that returns a serializable version of values that cannot
+        otherwise be serialized, as in `json.dump`.
+    """
+    buffer: List[str] = []
+    encode = json.JSONEncoder(default=default).encode
+    # the JSON encoder escapes strings in the same way by default
+    encode_str = json.encoder.encode_basestring_ascii  # type: ignore
+    constants = {None: "null", True: "true", False: "false"}
+    key_prefixes: Dict[type, List[Tuple[str, str]]] = {}
+
+    def write_value(value: Any) -> None:
+        value_type = type(value)
+        if value_type is int:
+            buffer.append(int.__repr__(value))
+        elif value_type is str:
+            buffer.append(encode_str(value))
+        elif value is None or value_type is bool:
+            buffer.append(constants[value])
+        elif isinstance(value, vy_ast.VyperNode):
+            write_node(value)
+        elif value_type is list:
+            buffer.append("[")
+            for idx, item in enumerate(value):
+                if idx:
+                    buffer.append(", ")
+                write_value(item)
+            buffer.append("]")
+        else:
+            buffer.append(encode(value))
+
+    def write_node(node: vy_ast.VyperNode) -> None:
+        node_type = type(node)
+        if node_type not in key_prefixes:
+            key_prefixes[node_type] = [
+                (f"{', ' if idx else '{'}{encode_str(key)}: ", key)
+                for idx, key in enumerate(node._dict_fields)
+            ]
+        for prefix, key in key_prefixes[node_type]:
+            buffer.append(prefix)
+            write_value(getattr(node, key, None))
+        buffer.append("}")
+
+        if len(buffer) >= _JSON_BUFFER_SIZE:
+            fp.write("".join(buffer))
+            buffer.clear()
+
+    write_node(node)
+    fp.write("".join(buffer))
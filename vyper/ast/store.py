@@ -0,0 +1,65 @@
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from vyper import ast as vy_ast
+from vyper.ast.utils import parse_to_ast
+
+
+class ModuleStore:
+    """
+    Store of parsed Vyper modules.
+
+    A single store is shared by every step that needs the AST of a source file,
+    so that import resolution, interface signature extraction and compilation
+    all reuse the same parse. Modules are keyed by contract name, source ID and
+    a hash of the source code, because all three are embedded within the
+    generated nodes.
+
+    Modules returned from the store are shared between callers and must not be
+    modified. Any phase that mutates the AST must operate on a copy.
+
+    Attributes
+    ----------
+    hits : int
+        Number of requests that returned a previously parsed module.
+    misses : int
+        Number of requests that required the source to be parsed.
+    """
+
+    def __init__(self) -> None:
+        self._modules: Dict[Tuple, vy_ast.Module] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def parse(
+        self, source_code: str, source_id: int = 0, contract_name: Optional[str] = None
+    ) -> vy_ast.Module:
+        """
+        Get the Vyper AST for a source string, parsing it only if it has not
+        been parsed before with the same source ID and contract name.
+
+        Arguments
+        ---------
+        source_code : str
+            The Vyper source code to parse.
+        source_id : int, optional
+            Source id to use in the `src` member of each node.
+        contract_name : str, optional
+            Name of the contract, used in exception messages.
+
+        Returns
+        -------
+        vy_ast.Module
+            Untyped, unoptimized Vyper AST. Must not be modified.
+        """
+        digest = hashlib.sha256(source_code.encode("utf-8")).hexdigest()
+        key = (contract_name, source_id, digest)
+        if key in self._modules:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._modules[key] = parse_to_ast(source_code, source_id, contract_name)
+        return self._modules[key]
@@ -0,0 +1,425 @@
+import ast as python_ast
+import bisect
+import numbers
+import re
+import sys
+from tokenize import (
+    COMMENT,
+    ENCODING,
+    ENDMARKER,
+    NAME,
+    NEWLINE,
+    NL,
+    NUMBER,
+    OP,
+    STRING,
+    TokenInfo,
+)
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Token marking follows the rules used by `asttokens` (version 2.0.3), so that node
+# offsets and source maps are identical to those it produces. The tokens are taken
+# from the pre-parser, which saves tokenizing the source code a second time.
+
+_LINE_START_RE = re.compile(r"^", re.M)
+
+_NON_CODING_TOKENS = (NL, COMMENT, ENCODING)
+
+_MATCHING_PAIRS_LEFT = {(OP, "("): (OP, ")"), (OP, "["): (OP, "]"), (OP, "{"): (OP, "}")}
+_MATCHING_PAIRS_RIGHT = {v: k for k, v in _MATCHING_PAIRS_LEFT.items()}
+
+_SINGLETONS = tuple(
+    v
+    for v in python_ast.__dict__.values()
+    if isinstance(v, type)
+    and issubclass(
+        v,
+        (
+            python_ast.expr_context,
+            python_ast.boolop,
+            python_ast.operator,
+            python_ast.unaryop,
+            python_ast.cmpop,
+        ),
+    )
+)
+
+
+class Token(NamedTuple):
+    type: int
+    string: str
+    start: Tuple[int, int]
+    end: Tuple[int, int]
+    idx: int
+    startpos: int
+    endpos: int
+
+
+class SourceTokens:
+    """
+    Tokens of a source string, with helpers to locate the tokens of AST nodes.
+
+    Attributes
+    ----------
+    tokens : List[Token]
+        Tokens in the order they appear in the source, including non-coding
+        tokens such as comments.
+    """
+
+    def __init__(self, source_code: str, token_list: Sequence[TokenInfo]) -> None:
+        self._source_code = source_code
+        self._line_offsets = [m.start(0) for m in _LINE_START_RE.finditer(source_code)]
+        self._utf8_offsets: dict = {}
+
+        # equivalent to `line_to_offset`, inlined as this is called twice per token
+        line_offsets = self._line_offsets
+        line_count = len(line_offsets)
+        source_len = len(source_code)
+
+        self.tokens: List[Token] = []
+        for typ, string, start, end, _ in token_list:
+            if typ == ENCODING:
+                continue
+            if start[0] > line_count:
+                startpos = source_len
+            else:
+                startpos = min(line_offsets[start[0] - 1] + start[1], source_len)
+            if end[0] > line_count:
+                endpos = source_len
+            else:
+                endpos = min(line_offsets[end[0] - 1] + end[1], source_len)
+            self.tokens.append(Token(typ, string, start, end, len(self.tokens), startpos, endpos))
+        self._token_offsets = [i.startpos for i in self.tokens]
+        # indexes of all brackets, used to find unmatched pairs within a range of tokens
+        self._brackets = [
+            i.idx
+            for i in self.tokens
+            if (i.type, i.string) in _MATCHING_PAIRS_LEFT
+            or (i.type, i.string) in _MATCHING_PAIRS_RIGHT
+        ]
+
+    def line_to_offset(self, line: int, column: int) -> int:
+        """
+        Convert a 1-based line number and 0-based column to a character offset.
+        """
+        line -= 1
+        if line >= len(self._line_offsets):
+            return len(self._source_code)
+        if line < 0:
+            return 0
+        return min(self._line_offsets[line] + max(0, column), len(self._source_code))
+
+    def _from_utf8_col(self, line: int, utf8_column: int) -> int:
+        # python AST column offsets are given in bytes, tokens use characters
+        offsets = self._utf8_offsets.get(line)
+        if offsets is None:
+            if line < len(self._line_offsets):
+                end_offset = self._line_offsets[line]
+            else:
+                end_offset = len(self._source_code)
+            start_offset = self._line_offsets[line - 1]
+            line_text = self._source_code[start_offset:end_offset]
+            offsets = [i for i, c in enumerate(line_text) for _ in c.encode("utf8")]
+            offsets.append(len(line_text))
+            self._utf8_offsets[line] = offsets
+
+        return offsets[max(0, min(len(offsets) - 1, utf8_column))]
+
+    def get_token(self, lineno: int, col_offset: int) -> Token:
+        """
+        Return the token at the given position, or the preceding token if the
+        position is between tokens. `col_offset` is a UTF8 offset, as used by `ast`.
+        """
+        offset = self.line_to_offset(lineno, self._from_utf8_col(lineno, col_offset))
+        return self.tokens[bisect.bisect(self._token_offsets, offset) - 1]
+
+    def next_token(self, tok: Token, include_extra: bool = False) -> Token:
+        i = tok.idx + 1
+        if not include_extra:
+            while self.tokens[i].type in _NON_CODING_TOKENS:
+                i += 1
+        return self.tokens[i]
+
+    def prev_token(self, tok: Token, include_extra: bool = False) -> Token:
+        i = tok.idx - 1
+        if not include_extra:
+            while self.tokens[i].type in _NON_CODING_TOKENS:
+                i -= 1
+        return self.tokens[i]
+
+    def find_token(
+        self,
+        start_token: Token,
+        tok_type: int,
+        tok_str: Optional[str] = None,
+        reverse: bool = False,
+    ) -> Token:
+        """
+        Return the first token from `start_token` matching the given type and string.
+
+        Searches backwards if `reverse` is True. The end marker token is returned
+        if no match is found.
+        """
+        tok = start_token
+        advance = self.prev_token if reverse else self.next_token
+        while not _match(tok, tok_type, tok_str) and tok.type != ENDMARKER:
+            tok = advance(tok, include_extra=True)
+        return tok
+
+    def bracket_range(self, first_token: Token, last_token: Token) -> Iterator[Token]:
+        """
+        Yield all bracket tokens from `first_token` through `last_token`.
+        """
+        start = bisect.bisect_left(self._brackets, first_token.idx)
+        end = bisect.bisect_right(self._brackets, last_token.idx)
+        for i in self._brackets[start:end]:
+            yield self.tokens[i]
+
+
+def _match(tok: Token, tok_type: int, tok_str: Optional[str] = None) -> bool:
+    return tok.type == tok_type and (tok_str is None or tok.string == tok_str)
+
+
+def _iter_children(node: python_ast.AST) -> Iterator[python_ast.AST]:
+    if isinstance(node, python_ast.JoinedStr):
+        return
+    if isinstance(node, python_ast.Dict):
+        # yield keys and values in source order
+        for key, value in zip(node.keys, node.values):
+            if key is not None:
+                yield key
+            yield value
+        return
+    for child in python_ast.iter_child_nodes(node):
+        if not isinstance(child, _SINGLETONS):
+            yield child
+
+
+def mark_tokens(tree: python_ast.AST, source_tokens: SourceTokens) -> None:
+    """
+    Annotate each node in a Python AST with `first_token` and `last_token` members.
+
+    Parameters
+    ----------
+    tree : AST
+        Python AST generated from the source code of `source_tokens`.
+    source_tokens : SourceTokens
+        Tokens of the source code.
+    """
+    _TokenMarker(source_tokens).visit(tree, None)
+
+
+_MARKER_METHODS: dict = {}
+
+
+class _TokenMarker:
+    def __init__(self, source_tokens: SourceTokens) -> None:
+        self._code = source_tokens
+
+    def visit(self, node: python_ast.AST, parent_token: Optional[Token]) -> None:
+        col = getattr(node, "col_offset", None)
+        token = self._code.get_token(node.lineno, col) if col is not None else None
+        if not token and isinstance(node, python_ast.Module):
+            token = self._code.get_token(1, 0)
+
+        # the first and last tokens of a node also include those of all its children
+        first = token
+        last = None
+        for child in _iter_children(node):
+            self.visit(child, token or parent_token)
+            if not first or child.first_token.idx < first.idx:  # type: ignore
+                first = child.first_token  # type: ignore
+            if not last or child.last_token.idx > last.idx:  # type: ignore
+                last = child.last_token  # type: ignore
+
+        first = first or parent_token
+        last = last or first
+
+        # statements continue until the end of the line
+        if isinstance(node, python_ast.stmt):
+            newline = self._code.find_token(last, NEWLINE)  # type: ignore
+            last = self._code.prev_token(newline)
+
+        first, last = self._expand_to_matching_pairs(first, last)  # type: ignore
+
+        cls = node.__class__
+        if cls not in _MARKER_METHODS:
+            # unbound methods are stored, bound methods would create a reference cycle
+            _MARKER_METHODS[cls] = getattr(_TokenMarker, f"visit_{cls.__name__.lower()}", None)
+        method = _MARKER_METHODS[cls]
+        if method is not None:
+            new_first, new_last = method(self, node, first, last)
+            if (new_first, new_last) != (first, last):
+                first, last = self._expand_to_matching_pairs(new_first, new_last)
+
+        node.first_token = first  # type: ignore
+        node.last_token = last  # type: ignore
+
+    def _expand_to_matching_pairs(self, first_token: Token, last_token: Token) -> Tuple:
+        # extend the range of tokens to include the closing or opening pair
+        # for any unmatched brackets within the range
+        to_match_right: list = []
+        to_match_left: list = []
+        for tok in self._code.bracket_range(first_token, last_token):
+            tok_info = (tok.type, tok.string)
+            if to_match_right and tok_info == to_match_right[-1]:
+                to_match_right.pop()
+            elif tok_info in _MATCHING_PAIRS_LEFT:
+                to_match_right.append(_MATCHING_PAIRS_LEFT[tok_info])
+            elif tok_info in _MATCHING_PAIRS_RIGHT:
+                to_match_left.append(_MATCHING_PAIRS_RIGHT[tok_info])
+
+        for match in reversed(to_match_right):
+            last = self._code.next_token(last_token)
+            # allow for trailing commas or colons before the closing bracket
+            while _match(last, OP, ",") or _match(last, OP, ":"):
+                last = self._code.next_token(last)
+            if _match(last, *match):
+                last_token = last
+
+        for match in to_match_left:
+            first = self._code.prev_token(first_token)
+            if _match(first, *match):
+                first_token = first
+
+        return first_token, last_token
+
+    # node-specific methods, called with the preliminary first and last tokens
+    # and returning the adjusted pair
+
+    if sys.version_info < (3, 8):
+        # prior to python 3.8, list comprehensions begin at the first child
+        def visit_listcomp(self, node, first_token, last_token):
+            before = self._code.prev_token(first_token)
+            return before, last_token
+
+    def visit_comprehension(self, node, first_token, last_token):
+        first = self._code.find_token(first_token, NAME, "for", reverse=True)
+        return first, last_token
+
+    def visit_if(self, node, first_token, last_token):
+        while first_token.string not in ("if", "elif"):
+            first_token = self._code.prev_token(first_token)
+        return first_token, last_token
+
+    def visit_attribute(self, node, first_token, last_token):
+        dot = self._code.find_token(last_token, OP, ".")
+        return first_token, self._code.next_token(dot)
+
+    def visit_functiondef(self, node, first_token, last_token):
+        # include the `@` of the first decorator
+        if first_token.idx > 0:
+            prev = self._code.prev_token(first_token)
+            if _match(prev, OP, "@"):
+                first_token = prev
+        return first_token, last_token
+
+    visit_classdef = visit_functiondef
+
+    def _following_brackets(self, node, last_token, opening_bracket):
+        # calls and subscripts end with a pair of brackets that may not contain any nodes
+        first_child = next(_iter_children(node))
+        call_start = self._code.find_token(first_child.last_token, OP, opening_bracket)
+        if call_start.idx > last_token.idx:
+            last_token = call_start
+        return last_token
+
+    def visit_call(self, node, first_token, last_token):
+        last_token = self._following_brackets(node, last_token, "(")
+        if _match(first_token, OP, "@"):
+            first_token = self._code.next_token(first_token)
+        return first_token, last_token
+
+    def visit_subscript(self, node, first_token, last_token):
+        return first_token, self._following_brackets(node, last_token, "[")
+
+    def _bare_tuple(self, node, first_token, last_token):
+        # a bare tuple does not include parens, but does include a trailing comma
+        maybe_comma = self._code.next_token(last_token)
+        if _match(maybe_comma, OP, ","):
+            last_token = maybe_comma
+        return first_token, last_token
+
+    def _gobble_parens(self, first_token, last_token, include_all):
+        while first_token.idx > 0:
+            prev = self._code.prev_token(first_token)
+            next_ = self._code.next_token(last_token)
+            if _match(prev, OP, "(") and _match(next_, OP, ")"):
+                first_token, last_token = prev, next_
+                if include_all:
+                    continue
+            break
+        return first_token, last_token
+
+    def visit_tuple(self, node, first_token, last_token):
+        if not node.elts:
+            return first_token, last_token
+        if sys.version_info >= (3, 8):
+            # from python 3.8, parsed tuples include parens when present
+            child = node.elts[0]
+            child_first, _ = self._gobble_parens(child.first_token, child.last_token, True)
+            if first_token == child_first:
+                return self._bare_tuple(node, first_token, last_token)
+            return first_token, last_token
+        first_token, last_token = self._bare_tuple(node, first_token, last_token)
+        return self._gobble_parens(first_token, last_token, False)
+
+    def _str(self, first_token, last_token):
+        # adjacent string tokens form a single string
+        last = self._code.next_token(last_token)
+        while _match(last, STRING):
+            last_token = last
+            last = self._code.next_token(last_token)
+        return first_token, last_token
+
+    def visit_str(self, node, first_token, last_token):
+        return self._str(first_token, last_token)
+
+    visit_bytes = visit_str
+    visit_joinedstr = visit_str
+
+    def _num(self, value, first_token, last_token):
+        # skip the `-` of a negative constant
+        while _match(last_token, OP):
+            last_token = self._code.next_token(last_token)
+        if isinstance(value, complex):
+            value = value.imag
+        if value < 0 and first_token.type == NUMBER:
+            first_token = self._code.prev_token(first_token)
+        return first_token, last_token
+
+    def visit_num(self, node, first_token, last_token):
+        return self._num(node.n, first_token, last_token)
+
+    def visit_constant(self, node, first_token, last_token):
+        if isinstance(node.value, numbers.Number):
+            return self._num(node.value, first_token, last_token)
+        if isinstance(node.value, (str, bytes)):
+            return self._str(first_token, last_token)
+        return first_token, last_token
+
+    def visit_keyword(self, node, first_token, last_token):
+        if node.arg is not None:
+            equals = self._code.find_token(first_token, OP, "=", reverse=True)
+            first_token = self._code.prev_token(equals)
+        return first_token, last_token
+
+    def visit_starred(self, node, first_token, last_token):
+        if not _match(first_token, OP, "*"):
+            star = self._code.prev_token(first_token)
+            if _match(star, OP, "*"):
+                first_token = star
+        return first_token, last_token
+
+    def _async(self, node, first_token, last_token):
+        if first_token.string != "async":
+            first_token = self._code.prev_token(first_token)
+        return first_token, last_token
+
+    visit_asyncfor = _async
+    visit_asyncwith = _async
+
+    def visit_asyncfunctiondef(self, node, first_token, last_token):
+        if _match(first_token, NAME, "def"):
+            first_token = self._code.prev_token(first_token)
+        return self.visit_functiondef(node, first_token, last_token)
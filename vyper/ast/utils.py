@@ -3,7 +3,7 @@ from typing import Dict, List, Optional, Union
 
 from vyper.ast import nodes as vy_ast
 from vyper.ast.annotation import annotate_python_ast
-from vyper.ast.pre_parser import pre_parse
+from vyper.ast.pre_parser import pre_parse_tokens
 from vyper.exceptions import CompilerPanic, ParserException, SyntaxException
 
 
@@ -27,13 +27,13 @@ def parse_to_ast(
     """
     if "\x00" in source_code:
         raise ParserException("No null bytes (\\x00) allowed in the source code.")
-    class_types, reformatted_code = pre_parse(source_code)
+    class_types, reformatted_code, token_list = pre_parse_tokens(source_code)
     try:
         py_ast = python_ast.parse(reformatted_code)
     except SyntaxError as e:
         # TODO: Ensure 1-to-1 match of source_code:reformatted_code SyntaxErrors
         raise SyntaxException(str(e), source_code, e.lineno, e.offset) from e
-    annotate_python_ast(py_ast, source_code, class_types, source_id, contract_name)
+    annotate_python_ast(py_ast, source_code, class_types, source_id, contract_name, token_list)
 
     # Convert to Vyper AST.
     return vy_ast.get_node(py_ast)  # type: ignore
@@ -0,0 +1,263 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import vyper
+from vyper.ast import ModuleStore
+from vyper.cli.utils import extract_file_interface_imports
+from vyper.exceptions import VyperException
+from vyper.typing import ContractCodes
+
+
+class ImportGraph:
+    """
+    Graph of the interface imports within a project.
+
+    Each node is a source path, and each edge is an import of one source by
+    another. Imports are resolved on first use and memoized, and the result of
+    every filesystem lookup is cached, so the graph may be queried for any number
+    of contracts without resolving the same import twice.
+
+    Imports are resolved from the filesystem, relative to the importing file and
+    to the root path. Imports made within an interface are only followed where
+    they can be resolved, because interfaces are never compiled together with
+    their own imports.
+
+    Attributes
+    ----------
+    root_path : Path, optional
+        Base import path.
+    contract_sources : dict
+        Source code of the contracts being compiled, keyed by path.
+    module_store : ModuleStore
+        Store used when parsing sources to find their imports.
+    """
+
+    def __init__(
+        self,
+        root_path: Optional[Path],
+        contract_sources: ContractCodes,
+        module_store: Optional[ModuleStore] = None,
+    ) -> None:
+        self.root_path = root_path
+        self.contract_sources = contract_sources
+        self.module_store = module_store if module_store is not None else ModuleStore()
+        # source IDs are assigned in the same order as `compile_codes`, so that the
+        # parsed contracts are reused during compilation
+        self._source_ids = {k: i for i, k in enumerate(sorted(contract_sources))}
+        self._exists: Dict[Path, bool] = {}
+        self._resolved: Dict[Tuple, str] = {}
+        self._interfaces: Dict[str, Any] = {}
+        self._import_paths: Dict[str, Dict[str, str]] = {}
+        self._imports: Dict[str, Dict[str, str]] = {}
+
+    def exists(self, path: Path) -> bool:
+        """
+        Check if a path exists, caching the result.
+        """
+        if path not in self._exists:
+            self._exists[path] = path.exists()
+        return self._exists[path]
+
+    def get_imports(self, path: str) -> Dict[str, str]:
+        """
+        Get the direct imports of a source.
+
+        Arguments
+        ---------
+        path : str
+            Path of a contract, or of a previously resolved interface.
+
+        Returns
+        -------
+        dict
+            Resolved path of each import, as `{"interface name": "path"}`
+        """
+        if path not in self._imports:
+            self._imports[path] = {
+                name: self._resolve(path, import_path)
+                for name, import_path in self._get_import_paths(path).items()
+            }
+        return self._imports[path]
+
+    def _get_import_paths(self, path: str) -> Dict[str, str]:
+        # unresolved import paths of a source, as `{"interface name": "import path"}`
+        if path not in self._import_paths:
+            if path in self.contract_sources:
+                self._import_paths[path] = extract_file_interface_imports(
+                    self.contract_sources[path], self.module_store, self._source_ids[path], path
+                )
+            else:
+                self._import_paths[path] = extract_file_interface_imports(
+                    self._interfaces[path]["code"], self.module_store, 0, path
+                )
+        return self._import_paths[path]
+
+    def _get_interface_imports(self, path: str) -> List[str]:
+        # resolved imports of an interface, an import that cannot be found is skipped
+        if path in self._imports:
+            return list(self._imports[path].values())
+        try:
+            import_paths = self._get_import_paths(path)
+        except VyperException:
+            return []
+        resolved = []
+        for import_path in import_paths.values():
+            try:
+                resolved.append(self._resolve(path, import_path))
+            except FileNotFoundError:
+                continue
+        return resolved
+
+    def get_interface_codes(self, path: str) -> Dict:
+        """
+        Get the interfaces imported by a contract.
+
+        Returns
+        -------
+        dict
+            Interface definitions formatted as
+            `{"interface name": {"type": "json/vyper", "code": "interface code"}}`
+        """
+        return {name: self._interfaces[key] for name, key in self.get_imports(path).items()}
+
+    def get_dependencies(self, path: str) -> List[str]:
+        """
+        Get the transitive imports of a source, in build order.
+
+        Every path in the returned list appears after all of the paths that
+        it imports. An import within an interface that cannot be resolved is
+        treated as a leaf.
+        """
+        order: List[str] = []
+        seen = {path}
+
+        def visit(key: str) -> None:
+            if key == path:
+                imports = list(self.get_imports(key).values())
+            else:
+                imports = self._get_interface_imports(key)
+            for dependency in imports:
+                if dependency in seen:
+                    continue
+                seen.add(dependency)
+                if _is_vyper_source(self._interfaces[dependency]):
+                    visit(dependency)
+                order.append(dependency)
+
+        visit(path)
+        return order
+
+    def get_dependencies_output(self, path: str) -> Dict:
+        """
+        Generate the `dependencies` output format for a contract.
+        """
+        return {"imports": self.get_imports(path), "dependencies": self.get_dependencies(path)}
+
+    def get_digest(self, path: str, settings: Any = None) -> str:
+        """
+        Get a hash of a contract's source, the sources of its transitive imports
+        and the given compiler settings. The hash changes if any of these inputs
+        are modified.
+        """
+        sources = [(path, self.contract_sources[path])]
+        for key in self.get_dependencies(path):
+            sources.append((key, self._interfaces[key]))
+        data = json.dumps([vyper.__version__, settings, sources], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _resolve(self, path: str, import_path: str) -> str:
+        # resolve an import from the filesystem, returning the path of the interface
+        if self.root_path is None:
+            raise FileNotFoundError(f"Cannot locate interface '{import_path}{{.vy,.json}}'")
+
+        parent_path = self.root_path.joinpath(path).parent
+        base_paths = [parent_path]
+        if not import_path.startswith(".") and self.exists(self.root_path.joinpath(path)):
+            base_paths.append(self.root_path)
+        elif import_path.startswith("../") and len(Path(path).parent.parts) < Path(
+            import_path
+        ).parts.count(".."):
+            raise FileNotFoundError(
+                f"{path} - Cannot perform relative import outside of base folder"
+            )
+        return self._resolve_file(base_paths, import_path)
+
+    def _resolve_file(self, base_paths: Sequence[Path], import_path: str) -> str:
+        lookup_key = (tuple(base_paths), import_path)
+        if lookup_key not in self._resolved:
+            file_path = get_interface_file_path(base_paths, import_path, self.exists)
+            try:
+                key = file_path.resolve().relative_to(self.root_path).as_posix()  # type: ignore
+            except ValueError:
+                key = file_path.as_posix()
+
+            if key not in self._interfaces:
+                if key in self.contract_sources:
+                    self._interfaces[key] = {"type": "vyper", "code": self.contract_sources[key]}
+                else:
+                    with file_path.open() as fh:
+                        code = fh.read()
+                    if file_path.suffix == ".json":
+                        self._interfaces[key] = {"type": "json", "code": json.loads(code.encode())}
+                    else:
+                        self._interfaces[key] = {"type": "vyper", "code": code}
+            self._resolved[lookup_key] = key
+        return self._resolved[lookup_key]
+
+
+def _is_vyper_source(interface: Any) -> bool:
+    return isinstance(interface, dict) and interface.get("type") == "vyper"
+
+
+def get_interface_file_path(
+    base_paths: Sequence, import_path: str, exists: Optional[Callable[[Path], bool]] = None
+) -> Path:
+    if exists is None:
+        exists = Path.exists
+    relative_path = Path(import_path)
+    for path in base_paths:
+        file_path = path.joinpath(relative_path)
+        suffix = next((i for i in (".vy", ".json") if exists(file_path.with_suffix(i))), None)
+        if suffix:
+            return file_path.with_suffix(suffix)
+    raise FileNotFoundError(f" Cannot locate interface '{import_path}{{.vy,.json}}'")
+
+
+class BuildManifest:
+    """
+    Record of the inputs used in the most recent build of each contract.
+
+    The manifest maps each contract path to the digest returned by
+    `ImportGraph.get_digest`. A contract only needs to be rebuilt when its
+    current digest differs from the recorded one.
+
+    Attributes
+    ----------
+    path : Path
+        Location of the manifest file.
+    contracts : dict
+        Digest of each contract, as `{"contract path": "digest"}`
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.contracts: Dict[str, str] = {}
+        if self.path.exists():
+            with self.path.open() as fh:
+                data = json.load(fh)
+            # a manifest from another compiler version is ignored
+            if data.get("compiler") == vyper.__version__:
+                self.contracts = data.get("contracts", {})
+
+    def is_changed(self, contract_path: str, digest: str) -> bool:
+        return self.contracts.get(contract_path) != digest
+
+    def update(self, contract_path: str, digest: str) -> None:
+        self.contracts[contract_path] = digest
+
+    def save(self) -> None:
+        data = {"compiler": vyper.__version__, "contracts": self.contracts}
+        with self.path.open("w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
@@ -1,10 +1,22 @@
+from typing import Optional
+
 from vyper import ast as vy_ast
 from vyper.exceptions import StructureException
 from vyper.typing import InterfaceImports, SourceCode
 
 
-def extract_file_interface_imports(code: SourceCode) -> InterfaceImports:
-    ast_tree = vy_ast.parse_to_ast(code)
+def extract_file_interface_imports(
+    code: SourceCode,
+    module_store: Optional[vy_ast.ModuleStore] = None,
+    source_id: int = 0,
+    contract_name: Optional[str] = None,
+) -> InterfaceImports:
+    if module_store is None:
+        ast_tree = vy_ast.parse_to_ast(code)
+    else:
+        # parse the source exactly as `compile_codes` does, including the trailing
+        # newline, so the same AST is reused when the contract is compiled
+        ast_tree = module_store.parse(f"{code}\n", source_id, contract_name)
 
     imports_dict: InterfaceImports = {}
     for node in ast_tree.get_children((vy_ast.Import, vy_ast.ImportFrom)):
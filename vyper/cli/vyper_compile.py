@@ -5,12 +5,18 @@ import sys
 import warnings
 from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, Sequence, Set, TypeVar
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Set, TypeVar
 
 import vyper
-from vyper.cli.utils import extract_file_interface_imports
+from vyper.ast import ModuleStore
+from vyper.cli.import_graph import (  # noqa: F401
+    BuildManifest,
+    ImportGraph,
+    get_interface_file_path,
+)
+from vyper.compiler.cache import CompilerCache
 from vyper.opcodes import DEFAULT_EVM_VERSION, EVM_VERSIONS
-from vyper.parser import parser_utils
+from vyper.session import get_session
 from vyper.settings import VYPER_TRACEBACK_LIMIT
 from vyper.typing import ContractCodes, ContractPath, OutputFormats
 
@@ -27,11 +33,14 @@ userdoc            - Natspec user documentation
 devdoc             - Natspec developer documentation
 combined_json      - All of the above format options combined as single JSON output
 ast                - AST in JSON format
+call_graph         - Internal calls made by each function, and their maximum depth
 interface          - Vyper interface of a contract
 external_interface - External interface of a contract, used for outside contract calls
 opcodes            - List of opcodes as a string
 opcodes_runtime    - List of runtime opcodes as a string
 ir                 - Intermediate representation in LLL
+dependencies       - Imports of a contract and its transitive dependencies, in build order
+profile            - Time and memory used by each compiler phase, in JSON format
 """
 
 combined_json_outputs = [
@@ -58,7 +67,7 @@ def _parse_args(argv):
         formatter_class=argparse.RawTextHelpFormatter,
     )
     parser.add_argument(
-        "input_files", help="Vyper sourcecode to compile", nargs="+",
+        "input_files", help="Vyper sourcecode to compile", nargs="*",
     )
     parser.add_argument(
         "--version", action="version", version=f"{vyper.__version__}+commit.{vyper.__commit__}",
@@ -84,8 +93,47 @@ def _parse_args(argv):
     parser.add_argument(
         "-p", help="Set the root path for contract imports", default=".", dest="root_folder"
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache the output of each compiler phase within this folder, and reuse it\n"
+        "when compiling unchanged contracts",
+        dest="cache_dir",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of processes used to compile contracts in parallel (default 1)",
+        type=int,
+        default=1,
+        dest="jobs",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print the time and memory used by each compiler phase to stderr",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="Record the inputs of each build in this file, and only compile contracts\n"
+        "whose source or imported interfaces changed since the previous build",
+        dest="manifest",
+    )
+    parser.add_argument(
+        "--daemon",
+        help="Run as a long-lived process that accepts JSON-RPC compile requests, using\n"
+        "the standard JSON input format. Requests are read from stdin unless --socket\n"
+        "is given",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--socket", help="Unix socket to listen on when running with --daemon", dest="socket",
+    )
 
     args = parser.parse_args(argv)
+    if args.socket is not None and not args.daemon:
+        parser.error("--socket requires --daemon")
+    if not args.input_files and not args.daemon:
+        parser.error("the following arguments are required: input_files")
 
     if args.traceback_limit is not None:
         sys.tracebacklimit = args.traceback_limit
@@ -97,6 +145,12 @@ def _parse_args(argv):
         # an error occurred in a Vyper source file.
         sys.tracebacklimit = 0
 
+    if args.daemon:
+        from vyper.cli.vyper_daemon import run_daemon
+
+        run_daemon(args.socket, args.root_folder, args.jobs, args.cache_dir)
+        return
+
     output_formats = tuple(uniq(args.format.split(",")))
 
     compiled = compile_files(
@@ -105,12 +159,28 @@ def _parse_args(argv):
         args.root_folder,
         args.show_gas_estimates,
         args.evm_version,
+        args.cache_dir,
+        args.jobs,
+        args.profile,
+        args.manifest,
     )
 
     if output_formats == ("combined_json",):
         print(json.dumps(compiled))
         return
 
+    if args.profile:
+        for contract_name, contract_data in compiled.items():
+            if isinstance(contract_data, dict) and "profile" in contract_data:
+                print_profile(contract_name, contract_data.pop("profile"))
+
+    cache_stats = compiled.pop("cache", None)
+    if cache_stats is not None:
+        print(
+            f"Compiler cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses",
+            file=sys.stderr,
+        )
+
     for contract_data in compiled.values():
         for data in contract_data.values():
             if isinstance(data, (list, dict)):
@@ -119,6 +189,25 @@ def _parse_args(argv):
                 print(data)
 
 
+def print_profile(contract_name: str, profile: dict) -> None:
+    """
+    Print a human-readable compiler profile to stderr.
+    """
+    print(f"Profile for {contract_name}:", file=sys.stderr)
+    print(
+        f"  {'phase':<28}{'wall (s)':>10}{'cpu (s)':>10}{'peak (KiB)':>12}  nodes", file=sys.stderr
+    )
+    for phase, data in profile["phases"].items():
+        nodes = ", ".join(f"{k}={v}" for k, v in data.items() if k.endswith(("_nodes", "_items")))
+        print(
+            f"  {phase:<28}{data['wall_time']:>10.4f}{data['cpu_time']:>10.4f}"
+            f"{data['peak_memory'] / 1024:>12.1f}  {nodes}",
+            file=sys.stderr,
+        )
+    total = profile["total"]
+    print(f"  {'total':<28}{total['wall_time']:>10.4f}{total['cpu_time']:>10.4f}", file=sys.stderr)
+
+
 def uniq(seq: Iterable[T]) -> Iterator[T]:
     """
     Yield unique items in ``seq`` in order.
@@ -138,49 +227,11 @@ def exc_handler(contract_path: ContractPath, exception: Exception) -> None:
     raise exception
 
 
-def get_interface_codes(root_path: Path, contract_sources: ContractCodes) -> Dict:
-    interface_codes: Dict = {}
-    interfaces: Dict = {}
-
-    for file_path, code in contract_sources.items():
-        interfaces[file_path] = {}
-        parent_path = root_path.joinpath(file_path).parent
-
-        interface_codes = extract_file_interface_imports(code)
-        for interface_name, interface_path in interface_codes.items():
-
-            base_paths = [parent_path]
-            if not interface_path.startswith(".") and root_path.joinpath(file_path).exists():
-                base_paths.append(root_path)
-            elif interface_path.startswith("../") and len(Path(file_path).parent.parts) < Path(
-                interface_path
-            ).parts.count(".."):
-                raise FileNotFoundError(
-                    f"{file_path} - Cannot perform relative import outside of base folder"
-                )
-
-            valid_path = get_interface_file_path(base_paths, interface_path)
-            with valid_path.open() as fh:
-                code = fh.read()
-                if valid_path.suffix == ".json":
-                    interfaces[file_path][interface_name] = {
-                        "type": "json",
-                        "code": json.loads(code.encode()),
-                    }
-                else:
-                    interfaces[file_path][interface_name] = {"type": "vyper", "code": code}
-
-    return interfaces
-
-
-def get_interface_file_path(base_paths: Sequence, import_path: str) -> Path:
-    relative_path = Path(import_path)
-    for path in base_paths:
-        file_path = path.joinpath(relative_path)
-        suffix = next((i for i in (".vy", ".json") if file_path.with_suffix(i).exists()), None)
-        if suffix:
-            return file_path.with_suffix(suffix)
-    raise FileNotFoundError(f" Cannot locate interface '{import_path}{{.vy,.json}}'")
+def get_interface_codes(
+    root_path: Path, contract_sources: ContractCodes, module_store: Optional[ModuleStore] = None
+) -> Dict:
+    import_graph = ImportGraph(root_path, contract_sources, module_store)
+    return {k: import_graph.get_interface_codes(k) for k in contract_sources}
 
 
 def compile_files(
@@ -189,10 +240,14 @@ def compile_files(
     root_folder: str = ".",
     show_gas_estimates: bool = False,
     evm_version: str = DEFAULT_EVM_VERSION,
+    cache_dir: Optional[str] = None,
+    jobs: int = 1,
+    profile: bool = False,
+    manifest_path: Optional[str] = None,
 ) -> OrderedDict:
 
     if show_gas_estimates:
-        parser_utils.LLLnode.repr_show_gas = True
+        get_session().show_gas_estimates = True
 
     root_path = Path(root_folder).resolve()
     if not root_path.exists():
@@ -217,15 +272,62 @@ def compile_files(
 
     translate_map = {"abi_python": "abi", "json": "abi", "ast": "ast_dict"}
     final_formats = [translate_map.get(i, i) for i in output_formats]
+    if profile and "profile" not in final_formats:
+        final_formats.append("profile")
+
+    cache = None
+    if cache_dir is not None:
+        cache = CompilerCache(cache_dir)
+
+    # each source is parsed once, when resolving imports, and reused for compilation
+    module_store = ModuleStore()
+    import_graph = ImportGraph(root_path, contract_sources, module_store)
+    interface_codes = {k: import_graph.get_interface_codes(k) for k in contract_sources}
+
+    # the dependencies output is generated from the import graph, not the compiler
+    compile_formats = [i for i in final_formats if i != "dependencies"]
+    contract_formats: Dict[str, Sequence[str]] = {k: compile_formats for k in contract_sources}
+
+    manifest = None
+    skipped = set()
+    if manifest_path is not None:
+        # unchanged contracts are given no output formats, so they are not compiled
+        # but still receive the same source ID as in a full build
+        manifest = BuildManifest(manifest_path)
+        settings = {"evm_version": evm_version, "formats": sorted(final_formats)}
+        digests = {k: import_graph.get_digest(k, settings) for k in contract_sources}
+        for contract_path, digest in digests.items():
+            if not manifest.is_changed(contract_path, digest):
+                skipped.add(contract_path)
+                contract_formats[contract_path] = []
 
     compiler_data = vyper.compile_codes(
         contract_sources,
-        final_formats,
+        contract_formats,
         exc_handler=exc_handler,
-        interface_codes=get_interface_codes(root_path, contract_sources),
+        interface_codes=interface_codes,
         evm_version=evm_version,
+        cache=cache,
+        max_workers=jobs,
+        module_store=module_store,
     )
+
+    if "dependencies" in final_formats:
+        output: OrderedDict = OrderedDict()
+        for contract_path in sorted(k for k in contract_sources if k not in skipped):
+            data = compiler_data.get(contract_path, {})
+            data["dependencies"] = import_graph.get_dependencies_output(contract_path)
+            output[contract_path] = {k: data[k] for k in final_formats}
+        compiler_data = output
+
+    if manifest is not None:
+        for contract_path, digest in digests.items():
+            manifest.update(contract_path, digest)
+        manifest.save()
+
     if show_version:
         compiler_data["version"] = vyper.__version__
+    if cache is not None:
+        compiler_data["cache"] = cache.stats()
 
     return compiler_data
@@ -0,0 +1,252 @@
+import json
+import os
+import socketserver
+import sys
+import threading
+from typing import IO, Any, Dict, Optional, Union
+
+import vyper
+from vyper.cli.vyper_json import compile_json, exc_handler_to_dict
+from vyper.compiler.cache import CompilerCache
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+WARMUP_CODE = """
+event Transfer:
+    sender: indexed(address)
+    value: uint256
+
+balances: public(HashMap[address, uint256])
+
+@external
+def transfer(to: address, value: uint256) -> bool:
+    self.balances[msg.sender] -= value
+    self.balances[to] += value
+    log Transfer(msg.sender, value)
+    return True
+"""
+
+
+class CompilerDaemon:
+    """
+    Long-running compiler process that accepts JSON-RPC 2.0 requests.
+
+    Each request is a single line of JSON. The following methods are supported:
+
+    * `compile`: `params` is a standard JSON input, as accepted by `vyper-json`.
+      The result is the standard JSON output.
+    * `version`: returns the compiler version.
+    * `shutdown`: stops the daemon once the response has been sent.
+
+    Responses are written as a single line of JSON and include the `id` of the
+    request, so clients may send several requests without waiting for each
+    response. Requests without an `id` are notifications and receive no response.
+
+    Because the process persists between requests, imports and any data cached
+    within the compiler are only loaded once.
+
+    Attributes
+    ----------
+    root_folder : str, optional
+        Base import path, used to locate interfaces that are not included in
+        the JSON input.
+    jobs : int
+        Number of processes used to compile the contracts within one request.
+    cache : CompilerCache, optional
+        Cache of compiler phase outputs, shared between all requests.
+    is_running : bool
+        False once a `shutdown` request has been received.
+    """
+
+    def __init__(
+        self,
+        root_folder: Optional[str] = None,
+        jobs: int = 1,
+        cache: Optional[CompilerCache] = None,
+    ) -> None:
+        self.root_folder = root_folder
+        self.jobs = jobs
+        self.cache = cache
+        self.is_running = True
+        # compilation records warnings, which is not thread-safe
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """
+        Compile a small contract, so that the first request does not include
+        the time spent on imports and initialization.
+        """
+        input_dict = {
+            "language": "Vyper",
+            "sources": {"warmup.vy": {"content": WARMUP_CODE}},
+            "settings": {"outputSelection": {"*": ["*"]}},
+        }
+        with self._lock:
+            compile_json(input_dict, exc_handler_to_dict)
+
+    def handle_request(self, request: Any) -> Optional[Dict]:
+        """
+        Process a single JSON-RPC request.
+
+        Arguments
+        ---------
+        request : Any
+            Decoded JSON-RPC request.
+
+        Returns
+        -------
+        dict, optional
+            JSON-RPC response, or None if the request was a notification.
+        """
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0":
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params")
+
+        if method == "compile":
+            if not isinstance(params, dict):
+                response = _error_response(
+                    request_id, INVALID_PARAMS, "'params' must be a standard JSON input"
+                )
+            else:
+                try:
+                    with self._lock:
+                        result = compile_json(
+                            params,
+                            exc_handler_to_dict,
+                            self.root_folder,
+                            None,
+                            self.jobs,
+                            cache=self.cache,
+                        )
+                    response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+                except Exception as exc:
+                    response = _error_response(
+                        request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}"
+                    )
+        elif method == "version":
+            result = {"version": vyper.__version__, "commit": vyper.__commit__}
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        elif method == "shutdown":
+            self.is_running = False
+            response = {"jsonrpc": "2.0", "id": request_id, "result": None}
+        else:
+            response = _error_response(request_id, METHOD_NOT_FOUND, f"Unknown method: {method}")
+
+        if "id" not in request:
+            return None
+        return response
+
+    def handle_line(self, line: Union[str, bytes]) -> Optional[str]:
+        """
+        Process a single line of input, containing one JSON-RPC request.
+
+        Returns
+        -------
+        str, optional
+            Encoded JSON-RPC response, or None if no response is required.
+        """
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as exc:
+            response: Optional[Dict] = _error_response(None, PARSE_ERROR, f"Parse error: {exc}")
+        else:
+            response = self.handle_request(request)
+
+        if response is None:
+            return None
+        return json.dumps(response, sort_keys=True, default=str)
+
+    def serve_stdio(self, infile: IO = sys.stdin, outfile: IO = sys.stdout) -> None:
+        """
+        Read requests from `infile` and write responses to `outfile`, until the
+        input is closed or a `shutdown` request is received.
+        """
+        for line in infile:
+            response = self.handle_line(line)
+            if response is not None:
+                outfile.write(response + "\n")
+                outfile.flush()
+            if not self.is_running:
+                break
+
+    def serve_socket(self, socket_path: str) -> None:
+        """
+        Listen for connections on a Unix socket, until a `shutdown` request is
+        received. Each connection may send any number of requests.
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    response = daemon.handle_line(line)
+                    if response is not None:
+                        self.wfile.write(response.encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                    if not daemon.is_running:
+                        # shutdown blocks until serve_forever returns, so it is
+                        # called from a separate thread
+                        threading.Thread(target=server.shutdown).start()
+                        return
+
+        server = _DaemonServer(socket_path, _Handler)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _error_response(request_id: Any, code: int, message: str) -> Dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def run_daemon(
+    socket_path: Optional[str] = None,
+    root_folder: Optional[str] = None,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """
+    Start a compiler daemon.
+
+    Arguments
+    ---------
+    socket_path : str, optional
+        Path of a Unix socket to listen on. If not given, requests are read from
+        stdin and responses are written to stdout.
+    root_folder : str, optional
+        Base import path for interfaces that are not included in the JSON input.
+    jobs : int, optional
+        Number of processes used to compile the contracts within one request.
+    cache_dir : str, optional
+        Folder used to cache compiler phase outputs between requests.
+    """
+    cache = CompilerCache(cache_dir) if cache_dir is not None else None
+    daemon = CompilerDaemon(root_folder, jobs, cache)
+    daemon.warm_up()
+
+    if socket_path is None:
+        daemon.serve_stdio()
+    else:
+        print(f"Listening on {socket_path}", file=sys.stderr)
+        daemon.serve_socket(socket_path)
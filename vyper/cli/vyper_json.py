@@ -5,11 +5,12 @@ import json
 import sys
 import warnings
 from pathlib import Path
-from typing import Callable, Dict, Tuple, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 
 import vyper
-from vyper.cli.utils import extract_file_interface_imports
-from vyper.cli.vyper_compile import get_interface_file_path
+from vyper.ast import ModuleStore
+from vyper.cli.import_graph import BuildManifest, ImportGraph
+from vyper.compiler.cache import CompilerCache
 from vyper.exceptions import JSONError
 from vyper.opcodes import DEFAULT_EVM_VERSION, EVM_VERSIONS
 from vyper.typing import ContractCodes, ContractPath
@@ -18,6 +19,8 @@ from vyper.utils import keccak256
 TRANSLATE_MAP = {
     "abi": "abi",
     "ast": "ast_dict",
+    "callGraph": "call_graph",
+    "dependencies": "dependencies",
     "devdoc": "devdoc",
     "evm.methodIdentifiers": "method_identifiers",
     "evm.bytecode.object": "bytecode",
@@ -66,6 +69,25 @@ def _parse_args(argv):
         help="Show python traceback on error instead of returning JSON",
         action="store_true",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of processes used to compile contracts in parallel (default 1)",
+        type=int,
+        default=1,
+        dest="jobs",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Include the time and memory used by each compiler phase in the output",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="Record the inputs of each build in this file, and only compile contracts\n"
+        "whose source or imported interfaces changed since the previous build",
+        dest="manifest",
+    )
 
     args = parser.parse_args(argv)
     if args.input_file:
@@ -78,7 +100,15 @@ def _parse_args(argv):
 
     exc_handler = exc_handler_raises if args.traceback else exc_handler_to_dict
     output_json = json.dumps(
-        compile_json(input_json, exc_handler, args.root_folder, json_path),
+        compile_json(
+            input_json,
+            exc_handler,
+            args.root_folder,
+            json_path,
+            args.jobs,
+            args.profile,
+            manifest_path=args.manifest,
+        ),
         indent=2 if args.pretty_json else None,
         sort_keys=True,
         default=str,
@@ -230,62 +260,74 @@ def get_input_dict_output_formats(input_dict: Dict, contract_sources: ContractCo
     return output_formats
 
 
-def get_interface_codes(
-    root_path: Union[Path, None],
-    contract_path: ContractPath,
-    contract_sources: ContractCodes,
-    interface_sources: Dict,
-) -> Dict:
-    interface_codes: Dict = {}
-    interfaces: Dict = {}
-
-    code = contract_sources[contract_path]
-    interface_codes = extract_file_interface_imports(code)
-    for interface_name, interface_path in interface_codes.items():
-        path = Path(contract_path).parent.joinpath(interface_path).as_posix()
-        keys = [_standardize_path(path)]
-        if not interface_path.startswith("."):
-            keys.append(interface_path)
-
-        key = next((i for i in keys if i in interface_sources), None)
+class JSONImportGraph(ImportGraph):
+    """
+    Import graph for a standard JSON input.
+
+    Imports are resolved from the interfaces given in the input, then from the
+    contracts given in the input, and finally from the filesystem.
+    """
+
+    def __init__(
+        self,
+        root_path: Union[Path, None],
+        contract_sources: ContractCodes,
+        interface_sources: Dict,
+        module_store: Optional[ModuleStore] = None,
+    ) -> None:
+        super().__init__(root_path, contract_sources, module_store)
+        self.interface_sources = interface_sources
+
+    def _resolve(self, path: str, import_path: str) -> str:
+        full_path = Path(path).parent.joinpath(import_path).as_posix()
+        keys = [_standardize_path(full_path)]
+        if not import_path.startswith("."):
+            keys.append(import_path)
+
+        key = next((i for i in keys if i in self.interface_sources), None)
         if key:
-            interfaces[interface_name] = interface_sources[key]
-            continue
+            self._interfaces.setdefault(key, self.interface_sources[key])
+            return key
 
-        key = next((i + ".vy" for i in keys if i + ".vy" in contract_sources), None)
+        key = next((i + ".vy" for i in keys if i + ".vy" in self.contract_sources), None)
         if key:
-            interfaces[interface_name] = {"type": "vyper", "code": contract_sources[key]}
-            continue
+            self._interfaces.setdefault(key, {"type": "vyper", "code": self.contract_sources[key]})
+            return key
 
-        if root_path is None:
-            raise FileNotFoundError(f"Cannot locate interface '{interface_path}{{.vy,.json}}'")
+        if self.root_path is None:
+            raise FileNotFoundError(f"Cannot locate interface '{import_path}{{.vy,.json}}'")
 
-        parent_path = root_path.joinpath(contract_path).parent
+        parent_path = self.root_path.joinpath(path).parent
         base_paths = [parent_path]
-        if not interface_path.startswith("."):
-            base_paths.append(root_path)
-        elif interface_path.startswith("../") and len(Path(contract_path).parent.parts) < Path(
-            interface_path
+        if not import_path.startswith("."):
+            base_paths.append(self.root_path)
+        elif import_path.startswith("../") and len(Path(path).parent.parts) < Path(
+            import_path
         ).parts.count(".."):
             raise FileNotFoundError(
-                f"{contract_path} - Cannot perform relative import outside of base folder"
+                f"{path} - Cannot perform relative import outside of base folder"
             )
+        return self._resolve_file(base_paths, import_path)
 
-        valid_path = get_interface_file_path(base_paths, interface_path)
-        with valid_path.open() as fh:
-            code = fh.read()
-        if valid_path.suffix == ".json":
-            interfaces[interface_name] = {"type": "json", "code": json.loads(code.encode())}
-        else:
-            interfaces[interface_name] = {"type": "vyper", "code": code}
 
-    return interfaces
+def get_interface_codes(
+    root_path: Union[Path, None],
+    contract_path: ContractPath,
+    contract_sources: ContractCodes,
+    interface_sources: Dict,
+) -> Dict:
+    import_graph = JSONImportGraph(root_path, contract_sources, interface_sources)
+    return import_graph.get_interface_codes(contract_path)
 
 
 def compile_from_input_dict(
     input_dict: Dict,
     exc_handler: Callable = exc_handler_raises,
     root_folder: Union[str, None] = None,
+    jobs: int = 1,
+    profile: bool = False,
+    cache: Optional[CompilerCache] = None,
+    manifest_path: Optional[str] = None,
 ) -> Tuple[Dict, Dict]:
     root_path = None
     if root_folder is not None:
@@ -301,30 +343,145 @@ def compile_from_input_dict(
     contract_sources: ContractCodes = get_input_dict_contracts(input_dict)
     interface_sources = get_input_dict_interfaces(input_dict)
     output_formats = get_input_dict_output_formats(input_dict, contract_sources)
-
-    compiler_data, warning_data = {}, {}
-    warnings.simplefilter("always")
-    for id_, contract_path in enumerate(sorted(contract_sources)):
-        with warnings.catch_warnings(record=True) as caught_warnings:
+    if profile:
+        output_formats = {k: v + ["profile"] for k, v in output_formats.items()}
+
+    # shared by all contracts, so each import is resolved and each source parsed only once
+    import_graph = JSONImportGraph(root_path, contract_sources, interface_sources)
+
+    manifest = None
+    digests: Dict = {}
+    if manifest_path is not None:
+        # contracts whose source and imports are unchanged since the last build are skipped
+        manifest = BuildManifest(manifest_path)
+        for contract_path in sorted(contract_sources):
             try:
-                interface_codes = get_interface_codes(
-                    root_path, contract_path, contract_sources, interface_sources
+                digests[contract_path] = import_graph.get_digest(
+                    contract_path, [settings, output_formats[contract_path]]
                 )
             except Exception as exc:
                 return exc_handler(contract_path, exc, "parser"), {}
-            try:
-                data = vyper.compile_codes(
-                    {contract_path: contract_sources[contract_path]},
-                    output_formats[contract_path],
-                    interface_codes=interface_codes,
-                    initial_id=id_,
-                    evm_version=settings["evm_version"],
-                )
-            except Exception as exc:
-                return exc_handler(contract_path, exc, "compiler"), {}
-            compiler_data[contract_path] = data[contract_path]
-            if caught_warnings:
-                warning_data[contract_path] = caught_warnings
+        output_formats = {
+            k: v for k, v in output_formats.items() if manifest.is_changed(k, digests[k])
+        }
+
+    if jobs > 1 and len(output_formats) > 1:
+        compiler_data, warning_data = _compile_parallel(
+            contract_sources, import_graph, output_formats, settings, exc_handler, jobs, cache,
+        )
+        if "errors" in compiler_data:
+            return compiler_data, warning_data
+    else:
+        compiler_data, warning_data = {}, {}
+        warnings.simplefilter("always")
+        for id_, contract_path in enumerate(sorted(contract_sources)):
+            if contract_path not in output_formats:
+                continue
+            with warnings.catch_warnings(record=True) as caught_warnings:
+                try:
+                    interface_codes, dependencies = _resolve_imports(
+                        import_graph, contract_path, output_formats[contract_path]
+                    )
+                except Exception as exc:
+                    return exc_handler(contract_path, exc, "parser"), {}
+                try:
+                    data = vyper.compile_codes(
+                        {contract_path: contract_sources[contract_path]},
+                        _get_compile_formats(output_formats[contract_path]),
+                        interface_codes=interface_codes,
+                        initial_id=id_,
+                        evm_version=settings["evm_version"],
+                        cache=cache,
+                        module_store=import_graph.module_store,
+                    )
+                except Exception as exc:
+                    return exc_handler(contract_path, exc, "compiler"), {}
+                compiler_data[contract_path] = data.get(contract_path, {})
+                if dependencies is not None:
+                    compiler_data[contract_path]["dependencies"] = dependencies
+                if caught_warnings:
+                    warning_data[contract_path] = caught_warnings
+
+    if manifest is not None:
+        for contract_path, digest in digests.items():
+            manifest.update(contract_path, digest)
+        manifest.save()
+
+    return compiler_data, warning_data
+
+
+def _resolve_imports(
+    import_graph: ImportGraph, contract_path: ContractPath, output_formats: list
+) -> Tuple[Dict, Optional[Dict]]:
+    # resolve the interfaces imported by a contract, and the dependencies output if requested
+    dependencies = None
+    if "dependencies" in output_formats:
+        dependencies = import_graph.get_dependencies_output(contract_path)
+    return import_graph.get_interface_codes(contract_path), dependencies
+
+
+def _get_compile_formats(output_formats: list) -> list:
+    # the dependencies output is generated from the import graph, not the compiler
+    return [i for i in output_formats if i != "dependencies"]
+
+
+def _compile_parallel(
+    contract_sources: ContractCodes,
+    import_graph: ImportGraph,
+    output_formats: Dict,
+    settings: Dict,
+    exc_handler: Callable,
+    jobs: int,
+    cache: Optional[CompilerCache],
+) -> Tuple[Dict, Dict]:
+    # interfaces are resolved up front, contracts are compiled concurrently by
+    # `compile_codes` and then errors are handled in the same order as `compile_from_input_dict`
+    contract_paths = sorted(contract_sources)
+    resolved: Dict = {}
+    for contract_path in contract_paths:
+        if contract_path not in output_formats:
+            continue
+        try:
+            resolved[contract_path] = _resolve_imports(
+                import_graph, contract_path, output_formats[contract_path]
+            )
+        except Exception as exc:
+            resolved[contract_path] = exc
+            # contracts after an interface error are never reached
+            break
+
+    # every source is included so that source IDs match a serial build
+    compile_formats: Dict = {k: [] for k in contract_paths}
+    for contract_path, value in resolved.items():
+        if not isinstance(value, Exception):
+            compile_formats[contract_path] = _get_compile_formats(output_formats[contract_path])
+
+    errors: Dict = {}
+    warning_data: Dict = {}
+    compiled = vyper.compile_codes(
+        contract_sources,
+        compile_formats,
+        exc_handler=lambda k, exc: errors.setdefault(k, exc),
+        interface_codes={k: v[0] for k, v in resolved.items() if not isinstance(v, Exception)},
+        evm_version=settings["evm_version"],
+        cache=cache,
+        max_workers=jobs,
+        warning_handler=lambda k, msg: warning_data.setdefault(k, []).append(msg),
+    )
+
+    compiler_data = {}
+    for contract_path in contract_paths:
+        if contract_path not in output_formats:
+            continue
+        if isinstance(resolved[contract_path], Exception):
+            return exc_handler(contract_path, resolved[contract_path], "parser"), {}
+        if contract_path in errors:
+            return exc_handler(contract_path, errors[contract_path], "compiler"), {}
+        data = compiled.get(contract_path, {})
+        dependencies = resolved[contract_path][1]
+        if dependencies is not None:
+            data["dependencies"] = dependencies
+        compiler_data[contract_path] = data
 
     return compiler_data, warning_data
 
@@ -345,10 +502,13 @@ def format_to_output_dict(compiler_data: Dict) -> Dict:
         output_dict["contracts"][path] = {name: {}}
         output_contracts = output_dict["contracts"][path][name]
 
-        for key in ("abi", "devdoc", "interface", "ir", "userdoc"):
+        for key in ("abi", "dependencies", "devdoc", "interface", "ir", "profile", "userdoc"):
             if key in data:
                 output_contracts[key] = data[key]
 
+        if "call_graph" in data:
+            output_contracts["callGraph"] = data["call_graph"]
+
         if "method_identifiers" in data:
             output_contracts["evm"] = {"methodIdentifiers": data["method_identifiers"]}
 
@@ -377,6 +537,10 @@ def compile_json(
     exc_handler: Callable = exc_handler_raises,
     root_path: Union[str, None] = None,
     json_path: Union[str, None] = None,
+    jobs: int = 1,
+    profile: bool = False,
+    cache: Optional[CompilerCache] = None,
+    manifest_path: Optional[str] = None,
 ) -> Dict:
     try:
         if isinstance(input_json, str):
@@ -389,7 +553,9 @@ def compile_json(
             input_dict = input_json
 
         try:
-            compiler_data, warn_data = compile_from_input_dict(input_dict, exc_handler, root_path)
+            compiler_data, warn_data = compile_from_input_dict(
+                input_dict, exc_handler, root_path, jobs, profile, cache, manifest_path
+            )
             if "errors" in compiler_data:
                 return compiler_data
         except KeyError as exc:
@@ -6,6 +6,7 @@ import vyper
 from vyper import compile_lll, optimizer
 from vyper.parser.parser_utils import LLLnode
 from vyper.parser.s_expressions import parse_s_exp
+from vyper.session import get_session
 
 
 def _parse_cli_args():
@@ -44,7 +45,7 @@ def compile_to_lll(input_file, output_formats, show_gas_estimates=False):
         s_expressions = parse_s_exp(fh.read())
 
     if show_gas_estimates:
-        LLLnode.repr_show_gas = True
+        get_session().show_gas_estimates = True
 
     compiler_data = {}
     lll = LLLnode.from_list(s_expressions[0])
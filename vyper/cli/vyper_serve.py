@@ -1,16 +1,40 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
+import hashlib
 import json
+import os
 import sys
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from socketserver import ThreadingMixIn
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import vyper
+from vyper.cli.vyper_json import compile_json, exc_handler_to_dict
+from vyper.compiler import OUTPUT_FORMATS
 from vyper.exceptions import VyperException
-from vyper.opcodes import DEFAULT_EVM_VERSION
+from vyper.opcodes import DEFAULT_EVM_VERSION, EVM_VERSIONS
 from vyper.parser import lll_node
 
+# outputs generated when a request does not specify any formats
+DEFAULT_FORMATS = tuple(i for i in OUTPUT_FORMATS if i != "profile")
+
+# upper bounds of the request latency histogram, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
 
 def _parse_cli_args():
     return _parse_args(sys.argv[1:])
@@ -25,101 +49,462 @@ def _parse_args(argv):
         default="localhost:8000",
         dest="bind_address",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of compiler processes (default: number of CPUs)",
+        type=int,
+        default=None,
+        dest="workers",
+    )
+    parser.add_argument(
+        "--queue-size",
+        help="Number of requests that may wait for a free worker before new requests are\n"
+        "rejected with status 429 (default: 64)",
+        type=int,
+        default=64,
+        dest="queue_size",
+    )
+    parser.add_argument(
+        "--cache-size",
+        help="Number of compilation results kept in memory (default: 1024)",
+        type=int,
+        default=1024,
+        dest="cache_size",
+    )
 
     args = parser.parse_args(argv)
 
     if ":" in args.bind_address:
         lll_node.VYPER_COLOR_OUTPUT = False
-        runserver(*args.bind_address.split(":"))
+        host, port = args.bind_address.split(":")
+        runserver(host, port, args.workers, args.queue_size, args.cache_size)
     else:
         print('Provide bind address in "{address}:{port}" format')
 
 
-class VyperRequestHandler(BaseHTTPRequestHandler):
-    def send_404(self):
-        self.send_response(404)
-        self.end_headers()
-        return
+def _compile_code(code: str, output_formats: Sequence[str], evm_version: str) -> Tuple[Dict, int]:
+    # executed within a worker process
+    # errors are converted to a response here, as exceptions may not be picklable
+    lll_node.VYPER_COLOR_OUTPUT = False
+    try:
+        compiler_output = vyper.compile_codes(
+            {"": code}, list(output_formats), evm_version=evm_version
+        )
+        out_dict = compiler_output[""]
+    except VyperException as e:
+        return (
+            {"status": "failed", "message": str(e), "column": e.col_offset, "line": e.lineno},
+            400,
+        )
+    except SyntaxError as e:
+        return (
+            {"status": "failed", "message": str(e), "column": e.offset, "line": e.lineno},
+            400,
+        )
 
-    def send_cors_all(self):
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Headers", "X-Requested-With, Content-type")
+    if "ir" in out_dict:
+        out_dict["ir"] = str(out_dict["ir"])
+    out_dict.update({"status": "success"})
 
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self.send_cors_all()
-        self.end_headers()
+    return out_dict, 200
+
+
+def _compile_standard_json(input_dict: Dict) -> Tuple[Dict, int]:
+    # executed within a worker process
+    lll_node.VYPER_COLOR_OUTPUT = False
+    output = compile_json(input_dict, exc_handler_to_dict)
+    # round-trip through JSON so the result only contains basic types
+    return json.loads(json.dumps(output, default=str)), 200
+
+
+def _warm_up() -> None:
+    # executed within a worker process, so the first request does not include imports
+    _compile_code("@external\ndef foo() -> uint256:\n    return 1\n", DEFAULT_FORMATS, "istanbul")
+
+
+class LatencyHistogram:
+    """
+    Cumulative histogram of request latencies, in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+
+    def to_metrics(self, name: str, labels: str) -> List[str]:
+        lines = []
+        for bound, count in zip(self.buckets, self.counts):
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ResultCache:
+    """
+    In-memory, least-recently-used cache of compilation results.
+
+    Attributes
+    ----------
+    max_size : int
+        Maximum number of results held in the cache.
+    hits : int
+        Number of results that were served from the cache.
+    misses : int
+        Number of results that had to be compiled.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Tuple[Dict, int]]:
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: str, value: Tuple[Dict, int]) -> None:
+        if self.max_size <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
-    def do_GET(self):
-        if self.path == "/":
-            self.send_response(200)
-            self.send_cors_all()
-            self.end_headers()
-            self.wfile.write(f"Vyper Compiler. Version: {vyper.__version__}\n".encode())
-        else:
-            self.send_404()
 
-        return
+class VyperServer:
+    """
+    Asynchronous HTTP server for the Vyper compiler.
 
-    def do_POST(self):
+    Compilation is performed within a pool of worker processes. Results are
+    cached in memory, and identical requests that arrive while a compilation is
+    in progress share the same result. When every worker is busy and the queue
+    is full, further requests are rejected with status 429.
 
-        if self.path == "/compile":
-            content_len = int(self.headers.get("content-length"))
-            post_body = self.rfile.read(content_len)
-            data = json.loads(post_body)
+    Endpoints
+    ---------
+    GET /
+        Compiler version.
+    POST /compile
+        Compile a single contract. The body is a JSON object containing `code`,
+        and optionally `evm_version` and a list of output `formats`.
+    POST /compile_json
+        Compile using the standard JSON input format of `vyper-json`.
+    GET /metrics
+        Queue depth, latency histograms and cache statistics, in the Prometheus
+        text format.
 
-            response, status_code = self._compile(data)
+    Attributes
+    ----------
+    workers : int
+        Number of compiler worker processes.
+    queue_size : int
+        Maximum number of requests waiting for a free worker.
+    cache : ResultCache
+        Cache of compilation results.
+    """
 
-            self.send_response(status_code)
-            self.send_header("Content-type", "application/json")
-            self.send_cors_all()
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+    def __init__(
+        self, workers: Optional[int] = None, queue_size: int = 64, cache_size: int = 1024
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.queue_size = queue_size
+        self.cache = ResultCache(cache_size)
+        self.pending = 0
 
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self._responses: Dict[Tuple[str, int], int] = {}
+
+    def warm_up(self) -> None:
+        """
+        Start the worker processes and perform an initial compilation in each.
+        """
+        futures = [self.executor.submit(_warm_up) for i in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of admitted requests that are waiting for a free worker.
+        """
+        return max(self.pending - self.workers, 0)
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """
+        Start the worker processes and listen for connections.
+
+        Workers are started first, so that forked processes do not inherit
+        client connections.
+        """
+        self.warm_up()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Read a single HTTP request from a connection and write the response.
+        """
+        request: Optional[Tuple[str, str, bytes]]
+        status: int
+        body: Any
+        try:
+            request = await _read_request(reader)
+        except (ValueError, asyncio.IncompleteReadError):
+            request = None
+            status, body = 400, {"status": "failed", "message": "Malformed request"}
+        except _BodyTooLarge:
+            request = None
+            status, body = 413, {"status": "failed", "message": "Request body is too large"}
+
+        if request is not None:
+            method, path, body_bytes = request
+            status, body = await self.dispatch(method, path, body_bytes)
+
+        if isinstance(body, str):
+            content, content_type = body.encode(), "text/plain; version=0.0.4"
         else:
-            self.send_404()
+            content, content_type = json.dumps(body).encode(), "application/json"
+        headers = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(content)}",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Allow-Headers: X-Requested-With, Content-type",
+            "Connection: close",
+        ]
+        if status == 429:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + content)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
 
-        return
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """
+        Route a request to the matching endpoint.
 
-    def _compile(self, data):
-        code = data.get("code")
-        if not code:
-            return {"status": "failed", "message": 'No "code" key supplied'}, 400
+        Returns
+        -------
+        int
+            HTTP status code.
+        dict | str
+            Response body. Dicts are returned as JSON, strings as plain text.
+        """
+        start = time.perf_counter()
+        response: Any
+        if method == "OPTIONS":
+            status, response = 200, ""
+        elif method == "GET" and path == "/":
+            status, response = 200, f"Vyper Compiler. Version: {vyper.__version__}\n"
+        elif method == "GET" and path == "/metrics":
+            status, response = 200, self.metrics()
+        elif method == "POST" and path in ("/compile", "/compile_json"):
+            try:
+                data = json.loads(body)
+            except ValueError:
+                status, response = 400, {"status": "failed", "message": "Invalid JSON"}
+            else:
+                if path == "/compile":
+                    status, response = await self._compile(data)
+                else:
+                    status, response = await self._compile_json(data)
+        else:
+            status, response = 404, {"status": "failed", "message": "Not found"}
+
+        endpoint = path if status != 404 else "other"
+        self._responses[(endpoint, status)] = self._responses.get((endpoint, status), 0) + 1
+        if endpoint in ("/compile", "/compile_json"):
+            histogram = self._latency.setdefault(endpoint, LatencyHistogram())
+            histogram.observe(time.perf_counter() - start)
+        return status, response
+
+    async def _compile(self, data: Any) -> Tuple[int, Dict]:
+        if not isinstance(data, dict) or not data.get("code"):
+            return 400, {"status": "failed", "message": 'No "code" key supplied'}
+        code = data["code"]
         if not isinstance(code, str):
-            return {"status": "failed", "message": '"code" must be a non-empty string'}, 400
+            return 400, {"status": "failed", "message": '"code" must be a non-empty string'}
+
+        evm_version = data.get("evm_version", DEFAULT_EVM_VERSION)
+        if evm_version not in EVM_VERSIONS:
+            return 400, {"status": "failed", "message": f"Unknown EVM version: {evm_version}"}
+
+        output_formats = data.get("formats", DEFAULT_FORMATS)
+        if not isinstance(output_formats, (list, tuple)) or not output_formats:
+            return 400, {"status": "failed", "message": '"formats" must be a non-empty list'}
+        invalid = next((i for i in output_formats if i not in OUTPUT_FORMATS), None)
+        if invalid is not None:
+            return 400, {"status": "failed", "message": f"Unsupported format: {invalid}"}
+        output_formats = tuple(sorted(set(output_formats)))
+
+        key_data = [_hash(code), output_formats, evm_version]
+        return await self._run(key_data, _compile_code, code, output_formats, evm_version)
+
+    async def _compile_json(self, data: Any) -> Tuple[int, Dict]:
+        if not isinstance(data, dict):
+            return 400, {"status": "failed", "message": "Input must be a JSON object"}
+        key_data = ["standard_json", _hash(json.dumps(data, sort_keys=True))]
+        return await self._run(key_data, _compile_standard_json, data)
+
+    async def _run(self, key_data: list, fn: Callable, *args: Any) -> Tuple[int, Dict]:
+        # fetch a result from the cache or an identical in-flight request,
+        # otherwise compile it in the worker pool
+        key = _hash(json.dumps(key_data))
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.hits += 1
+            response, status = cached
+            return status, response
+
+        if key in self._in_flight:
+            self.cache.hits += 1
+            future = self._in_flight[key]
+        elif self.pending >= self.workers + self.queue_size:
+            return 429, {"status": "failed", "message": "Server is busy, retry later"}
+        else:
+            self.cache.misses += 1
+            self.pending += 1
+            future = asyncio.wrap_future(self.executor.submit(fn, *args))
+            future.add_done_callback(lambda f: self._complete(key, f))
+            self._in_flight[key] = future
 
         try:
-            code = data["code"]
-            out_dict = vyper.compile_codes(
-                {"": code},
-                list(vyper.compiler.OUTPUT_FORMATS.keys()),
-                evm_version=data.get("evm_version", DEFAULT_EVM_VERSION),
-            )[""]
-            out_dict["ir"] = str(out_dict["ir"])
-        except VyperException as e:
-            return (
-                {"status": "failed", "message": str(e), "column": e.col_offset, "line": e.lineno},
-                400,
+            response, status = await asyncio.shield(future)
+        except Exception as exc:
+            return 500, {"status": "failed", "message": f"{type(exc).__name__}: {exc}"}
+        return status, response
+
+    def _complete(self, key: str, future: asyncio.Future) -> None:
+        # called when a compilation finishes, even if the client has disconnected
+        self.pending -= 1
+        del self._in_flight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.set(key, future.result())
+
+    def metrics(self) -> str:
+        """
+        Return server metrics in the Prometheus text format.
+        """
+        lines = [
+            "# HELP vyper_serve_queue_depth Requests waiting for a free compiler worker.",
+            "# TYPE vyper_serve_queue_depth gauge",
+            f"vyper_serve_queue_depth {self.queue_depth}",
+            "# HELP vyper_serve_pending Requests admitted and not yet completed.",
+            "# TYPE vyper_serve_pending gauge",
+            f"vyper_serve_pending {self.pending}",
+            "# HELP vyper_serve_workers Number of compiler worker processes.",
+            "# TYPE vyper_serve_workers gauge",
+            f"vyper_serve_workers {self.workers}",
+            "# HELP vyper_serve_responses_total Responses sent, by endpoint and status.",
+            "# TYPE vyper_serve_responses_total counter",
+        ]
+        for (endpoint, status), count in sorted(self._responses.items()):
+            lines.append(
+                f'vyper_serve_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}'
             )
-        except SyntaxError as e:
-            return (
-                {"status": "failed", "message": str(e), "column": e.offset, "line": e.lineno},
-                400,
+        lines += [
+            "# HELP vyper_serve_request_duration_seconds Latency of compile requests.",
+            "# TYPE vyper_serve_request_duration_seconds histogram",
+        ]
+        for endpoint, histogram in sorted(self._latency.items()):
+            lines += histogram.to_metrics(
+                "vyper_serve_request_duration_seconds", f'endpoint="{endpoint}"'
             )
+        lines += [
+            "# HELP vyper_serve_cache_hits_total Compile requests served from the cache.",
+            "# TYPE vyper_serve_cache_hits_total counter",
+            f"vyper_serve_cache_hits_total {self.cache.hits}",
+            "# HELP vyper_serve_cache_misses_total Compile requests that were compiled.",
+            "# TYPE vyper_serve_cache_misses_total counter",
+            f"vyper_serve_cache_misses_total {self.cache.misses}",
+            "# HELP vyper_serve_cache_hit_rate Fraction of compile requests served from the cache.",
+            "# TYPE vyper_serve_cache_hit_rate gauge",
+            f"vyper_serve_cache_hit_rate {self.cache.hit_rate}",
+            "# HELP vyper_serve_cache_entries Results held in the cache.",
+            "# TYPE vyper_serve_cache_entries gauge",
+            f"vyper_serve_cache_entries {len(self.cache)}",
+        ]
+        return "\n".join(lines) + "\n"
+
 
-        out_dict.update({"status": "success"})
+class _BodyTooLarge(Exception):
+    pass
 
-        return out_dict, 200
 
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        raise ValueError("Empty request")
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
 
-class VyperHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in a separate thread."""
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_SIZE:
+        raise _BodyTooLarge
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), path.split("?", 1)[0], body
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
 
-    pass
 
+def runserver(
+    host: str = "",
+    port: int = 8000,
+    workers: Optional[int] = None,
+    queue_size: int = 64,
+    cache_size: int = 1024,
+) -> None:
+    server = VyperServer(workers, queue_size, cache_size)
 
-def runserver(host="", port=8000):
-    server_address = (host, int(port))
-    httpd = VyperHTTPServer(server_address, VyperRequestHandler)
+    loop = asyncio.get_event_loop()
+    listener = loop.run_until_complete(server.start(host, int(port)))
     print(f"Listening on http://{host}:{port}")
-    httpd.serve_forever()
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+        server.close()
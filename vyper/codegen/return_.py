@@ -1,5 +1,6 @@
 from vyper.parser.lll_node import LLLnode
 from vyper.parser.parser_utils import getpos, zero_pad
+from vyper.session import get_session
 from vyper.types import BaseType, ByteArrayLike, get_size_of_type
 from vyper.types.check import check_assign
 from vyper.utils import MemoryPositions
@@ -17,7 +18,7 @@ def make_return_stmt(stmt, context, begin_pos, _size, loop_memory_position=None)
             loop_memory_position = context.new_placeholder(typ=BaseType("uint256"))
 
         # Make label for stack push loop.
-        label_id = "_".join([str(x) for x in (context.method_id, stmt.lineno, stmt.col_offset)])
+        label_id = f"{context.method_id}{get_session().mksymbol()}"
         exit_label = f"make_return_loop_exit_{label_id}"
         start_label = f"make_return_loop_start_{label_id}"
 
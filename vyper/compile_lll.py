@@ -2,6 +2,7 @@ import functools
 
 from vyper.exceptions import CompilerPanic
 from vyper.parser.parser import LLLnode
+from vyper.session import get_session
 from vyper.utils import MemoryPositions
 
 from .opcodes import get_opcodes
@@ -10,8 +11,6 @@ PUSH_OFFSET = 0x5F
 DUP_OFFSET = 0x7F
 SWAP_OFFSET = 0x8F
 
-next_symbol = [0]
-
 CLAMP_OP_NAMES = {
     "uclamplt",
     "uclample",
@@ -33,8 +32,7 @@ def num_to_bytearray(x):
 
 
 def mksymbol():
-    next_symbol[0] += 1
-    return "_sym_" + str(next_symbol[0])
+    return get_session().mksymbol()
 
 
 def mkdebug(pc_debugger, pos):
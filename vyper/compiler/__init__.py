@@ -1,9 +1,16 @@
+import pickle
+import warnings
 from collections import OrderedDict
-from typing import Any, Callable, Optional, Sequence, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
 
+from vyper.ast import ModuleStore
 from vyper.compiler import output
+from vyper.compiler.cache import CompilerCache
 from vyper.compiler.phases import CompilerData
-from vyper.opcodes import DEFAULT_EVM_VERSION, evm_wrapper
+from vyper.exceptions import CompilerPanic
+from vyper.opcodes import DEFAULT_EVM_VERSION
+from vyper.session import CompilationSession
 from vyper.typing import (
     ContractCodes,
     InterfaceDict,
@@ -15,6 +22,7 @@ from vyper.typing import (
 OUTPUT_FORMATS = {
     # requires vyper_module
     "ast_dict": output.build_ast_dict,
+    "call_graph": output.build_call_graph_output,
     # requires global_ctx
     "devdoc": output.build_devdoc,
     "userdoc": output.build_userdoc,
@@ -32,16 +40,22 @@ OUTPUT_FORMATS = {
     "bytecode_runtime": output.build_bytecode_runtime_output,
     "opcodes": output.build_opcodes_output,
     "opcodes_runtime": output.build_opcodes_runtime_output,
+    # requires all other outputs
+    "profile": output.build_profile_output,
 }
 
 
-@evm_wrapper
 def compile_codes(
     contract_sources: ContractCodes,
     output_formats: Union[OutputDict, OutputFormats, None] = None,
     exc_handler: Union[Callable, None] = None,
     interface_codes: Union[InterfaceDict, InterfaceImports, None] = None,
     initial_id: int = 0,
+    cache: Optional[CompilerCache] = None,
+    evm_version: str = DEFAULT_EVM_VERSION,
+    max_workers: Optional[int] = None,
+    module_store: Optional[ModuleStore] = None,
+    warning_handler: Optional[Callable] = None,
 ) -> OrderedDict:
     """
     Generate compiler output(s) from one or more contract source codes.
@@ -71,6 +85,21 @@ def compile_codes(
 
         * Interface definitions are formatted as: `{'type': "json/vyper", 'code': "interface code"}`
         * JSON interfaces are given as lists, vyper interfaces as strings
+    cache: CompilerCache, optional
+        On-disk cache of compiler phase outputs. When given, contracts that were
+        previously compiled with identical inputs are loaded from the cache.
+    max_workers: int, optional
+        Maximum number of processes used to compile contracts in parallel. If not
+        given or set to 1, all contracts are compiled serially within the current
+        process. The output is identical regardless of the number of workers.
+    module_store: ModuleStore, optional
+        Store of parsed modules, shared by every contract in the batch so that
+        each contract and interface is only parsed once. If not given, a new store
+        is created. Worker processes always use their own store.
+    warning_handler: Callable, optional
+        Callable used to handle warnings raised during compilation. Should accept
+        two arguments - the name of the contract, and a `warnings.WarningMessage`.
+        If not given, warnings are emitted in the usual way.
 
     Returns
     -------
@@ -83,7 +112,7 @@ def compile_codes(
     if isinstance(output_formats, Sequence):
         output_formats = dict((k, output_formats) for k in contract_sources.keys())
 
-    out: OrderedDict = OrderedDict()
+    contracts = []
     for source_id, contract_name in enumerate(sorted(contract_sources), start=initial_id):
         # trailing newline fixes python parsing bug when source ends in a comment
         # https://bugs.python.org/issue35107
@@ -96,19 +125,150 @@ def compile_codes(
         ):
             interfaces = interfaces[contract_name]
 
-        compiler_data = CompilerData(source_code, contract_name, interfaces, source_id)
         for output_format in output_formats[contract_name]:
             if output_format not in OUTPUT_FORMATS:
                 raise ValueError(f"Unsupported format type {repr(output_format)}")
+        contracts.append(
+            (contract_name, source_code, output_formats[contract_name], interfaces, source_id)
+        )
+
+    if max_workers is not None and max_workers > 1 and len(contracts) > 1:
+        return _compile_parallel(
+            contracts, exc_handler, warning_handler, cache, evm_version, max_workers
+        )
+
+    if module_store is None:
+        module_store = ModuleStore()
+
+    out: OrderedDict = OrderedDict()
+    for contract in contracts:
+        contract_name, _, formats, _, _ = contract
+        if warning_handler is None:
+            result = _compile_contract(*contract, cache, exc_handler, evm_version, module_store)
+        else:
+            with warnings.catch_warnings(record=True) as caught_warnings:
+                warnings.simplefilter("always")
+                result = _compile_contract(*contract, cache, exc_handler, evm_version, module_store)
+            for message in caught_warnings:
+                warning_handler(contract_name, message)
+        if formats:
+            out[contract_name] = result
+
+    return out
+
+
+def _compile_contract(
+    contract_name: str,
+    source_code: str,
+    output_formats: OutputFormats,
+    interface_codes: Any,
+    source_id: int,
+    cache: Optional[CompilerCache],
+    exc_handler: Optional[Callable],
+    evm_version: str,
+    module_store: Optional[ModuleStore] = None,
+) -> dict:
+    # generate the requested outputs for a single contract
+    # each contract is compiled within a new session, so that output does not depend
+    # on which contracts were previously compiled, or are compiled concurrently
+    out: dict = {}
+    profile = "profile" in output_formats
+    with CompilationSession(evm_version=evm_version, module_store=module_store):
+        compiler_data = CompilerData(
+            source_code, contract_name, interface_codes, source_id, cache, profile
+        )
+        # the profile is generated last, so that it includes every other output
+        for output_format in sorted(output_formats, key=lambda k: k == "profile"):
             try:
-                out.setdefault(contract_name, {})
-                out[contract_name][output_format] = OUTPUT_FORMATS[output_format](compiler_data)
+                out[output_format] = OUTPUT_FORMATS[output_format](compiler_data)
             except Exception as exc:
                 if exc_handler is not None:
                     exc_handler(contract_name, exc)
                 else:
                     raise exc
 
+    if profile:
+        out = {k: out[k] for k in output_formats if k in out}
+    return out
+
+
+def _compile_worker(
+    contract: Tuple[str, str, OutputFormats, Any, int],
+    cache: Optional[CompilerCache],
+    evm_version: str,
+) -> Tuple[dict, list, list, Tuple[int, int]]:
+    # compile a contract within a worker process
+    # exceptions and warnings are collected so they can be handled in the parent process
+    errors: list = []
+
+    def exc_handler(contract_name: str, exc: Exception) -> None:
+        try:
+            pickle.dumps(exc)
+        except Exception:
+            exc = CompilerPanic(f"{type(exc).__name__}: {exc}")
+        errors.append(exc)
+
+    if cache is not None:
+        cache.hits, cache.misses = 0, 0
+
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter("always")
+        contract_name, source_code, output_formats, interface_codes, source_id = contract
+        out = _compile_contract(
+            contract_name,
+            source_code,
+            output_formats,
+            interface_codes,
+            source_id,
+            cache,
+            exc_handler,
+            evm_version,
+        )
+
+    warning_data = [(i.message, i.category, i.filename, i.lineno) for i in caught_warnings]
+    cache_stats = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    return out, errors, warning_data, cache_stats
+
+
+def _compile_parallel(
+    contracts: list,
+    exc_handler: Optional[Callable],
+    warning_handler: Optional[Callable],
+    cache: Optional[CompilerCache],
+    evm_version: str,
+    max_workers: int,
+) -> OrderedDict:
+    # contracts without any outputs produce no results, so they are not sent to a worker
+    contracts = [i for i in contracts if i[2]]
+    out: OrderedDict = OrderedDict()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_compile_worker, i, cache, evm_version) for i in contracts]
+        try:
+            # results are processed in the same order as the serial path
+            for contract, future in zip(contracts, futures):
+                contract_name = contract[0]
+                result, errors, warning_data, (hits, misses) = future.result()
+
+                for message, category, filename, lineno in warning_data:
+                    if warning_handler is not None:
+                        warning = warnings.WarningMessage(message, category, filename, lineno)
+                        warning_handler(contract_name, warning)
+                    else:
+                        warnings.warn_explicit(message, category, filename, lineno)
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+
+                for exc in errors:
+                    if exc_handler is not None:
+                        exc_handler(contract_name, exc)
+                    else:
+                        raise exc
+                out[contract_name] = result
+        finally:
+            for future in futures:
+                future.cancel()
+
     return out
 
 
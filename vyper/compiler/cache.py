@@ -0,0 +1,397 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from vyper import ast as vy_ast
+from vyper.parser.function_definitions import parse_function
+from vyper.parser.global_context import GlobalContext
+from vyper.parser.lll_node import LLLnode
+from vyper.session import get_session
+from vyper.signatures.function_signature import FunctionSignature
+from vyper.typing import InterfaceImports
+
+# default upper bound for the total size of a cache folder, in bytes
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# once the size bound is exceeded, entries are evicted until the cache is reduced
+# to this fraction of the bound, so that eviction does not happen on every write
+_EVICTION_TARGET = 0.9
+
+_SUFFIX = ".pickle"
+
+
+class CompilerCache:
+    """
+    Persistent, content-addressed cache of compiler phase outputs.
+
+    Each artifact generated by `CompilerData` (ASTs, LLL, assembly, bytecode and
+    the source map) is stored as a single file within the cache folder. Files are
+    named according to a cache key that is derived from the inputs used in
+    compilation, so an unchanged contract is found again on the next run and an
+    edited one simply misses.
+
+    The total size of the cache folder is bounded. When it is exceeded, the least
+    recently used files are evicted.
+
+    Cached data is stored using `pickle`. The cache folder must only be writable
+    by trusted users.
+
+    Attributes
+    ----------
+    cache_dir : Path
+        Folder where cached artifacts are stored.
+    max_size : int
+        Maximum total size of the cache folder, in bytes.
+    hits : int
+        Number of artifacts that were successfully loaded from the cache.
+    misses : int
+        Number of artifacts that were not found in the cache.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = sum(i.stat().st_size for i in self._iter_files())
+
+    def _iter_files(self):
+        return (i for i in self.cache_dir.iterdir() if i.suffix == _SUFFIX and i.is_file())
+
+    def _get_path(self, key: str, artifact: str) -> Path:
+        return self.cache_dir.joinpath(f"{key}-{artifact}{_SUFFIX}")
+
+    def get(self, key: str, artifact: str) -> Tuple[bool, Any]:
+        """
+        Load an artifact from the cache.
+
+        Arguments
+        ---------
+        key : str
+            Cache key, as generated by `get_cache_key`.
+        artifact : str
+            Name of the artifact to load.
+
+        Returns
+        -------
+        bool
+            True if the artifact was found within the cache.
+        Any
+            The cached artifact, or None if it was not found.
+        """
+        path = self._get_path(key, artifact)
+        try:
+            with path.open("rb") as fp:
+                value = pickle.load(fp)
+        except FileNotFoundError:
+            self.misses += 1
+            return False, None
+        except Exception:
+            # the file is corrupted or was written by an incompatible version
+            self._remove(path)
+            self.misses += 1
+            return False, None
+
+        try:
+            # update the modification time so the eviction policy is least-recently-used
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return True, value
+
+    def set(self, key: str, artifact: str, value: Any) -> None:
+        """
+        Store an artifact within the cache.
+
+        Arguments
+        ---------
+        key : str
+            Cache key, as generated by `get_cache_key`.
+        artifact : str
+            Name of the artifact to store.
+        value : Any
+            The artifact to store. Must be serializable with `pickle`.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError):
+            return
+
+        path = self._get_path(key, artifact)
+        # write to a temporary file first, so that concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(Path(tmp_path))
+            return
+
+        self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used artifacts until the size of the cache folder
+        is comfortably below `max_size`.
+        """
+        files = []
+        for path in self._iter_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        files.sort()
+        self._size = sum(i[1] for i in files)
+        target = self.max_size * _EVICTION_TARGET
+        for _, size, path in files:
+            if self._size <= target:
+                break
+            self._remove(path)
+            self._size -= size
+
+    def clear(self) -> None:
+        """
+        Remove all artifacts from the cache.
+        """
+        for path in list(self._iter_files()):
+            self._remove(path)
+        self._size = 0
+
+    def stats(self) -> dict:
+        """
+        Return a dict of cache hit and miss counters.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _hash(value: Union[str, bytes]) -> str:
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def _get_compiler_version() -> str:
+    from vyper import __commit__, __version__
+
+    return f"{__version__}+commit.{__commit__}"
+
+
+def get_cache_key(
+    source_code: str,
+    contract_name: str,
+    source_id: int,
+    interface_codes: Optional[InterfaceImports],
+) -> str:
+    """
+    Generate a cache key for the compilation of a single contract.
+
+    The key covers every input that affects the compiler output: the source code,
+    the contract name and source ID (both are included in the AST), the resolved
+    interface codes, the active EVM ruleset and the compiler version.
+
+    Arguments
+    ---------
+    source_code : str
+        Vyper source code.
+    contract_name : str
+        The name of the contract being compiled.
+    source_id : int
+        ID number used to identify this contract in the source map.
+    interface_codes: Dict, optional
+        Interfaces that may be imported by the contract during compilation.
+
+    Returns
+    -------
+    str
+        Hex string of the key.
+    """
+    interface_hashes = {}
+    for name, interface in (interface_codes or {}).items():
+        interface_hashes[name] = _hash(json.dumps(interface, sort_keys=True))
+
+    key_data = {
+        "compiler": _get_compiler_version(),
+        "evm_ruleset": get_session().evm_version_id,
+        "contract_name": contract_name,
+        "source_id": source_id,
+        "source": _hash(source_code),
+        "interfaces": interface_hashes,
+    }
+    return _hash(json.dumps(key_data, sort_keys=True))
+
+
+class FunctionCache:
+    """
+    Cache of the LLL generated for individual functions within a contract.
+
+    When a contract is modified, the LLL for every function is normally
+    regenerated. With this cache, only functions that were modified (or that
+    depend on something which was modified) are parsed again. The LLL of all
+    other functions is loaded from the underlying `CompilerCache`.
+
+    Each function is cached according to a fingerprint of:
+
+    * the function AST, with line numbers relative to the start of the function
+    * all module-level declarations (storage layout, structs, events, interfaces
+      and constants) and the imported interface codes
+    * the signatures and gas estimates of called internal functions
+    * the storage slots already assigned to nonreentrant locks
+    * the active EVM ruleset and the compiler version
+
+    Because the fingerprint does not include the absolute position of a function,
+    a function that has only moved within the source is still loaded from the
+    cache. Positions within the cached LLL are adjusted accordingly.
+
+    Attributes
+    ----------
+    cache : CompilerCache
+        Cache where generated LLL is stored.
+    """
+
+    def __init__(
+        self,
+        cache: CompilerCache,
+        vyper_module: vy_ast.Module,
+        interface_codes: Optional[InterfaceImports] = None,
+    ) -> None:
+        self.cache = cache
+
+        declarations = [
+            _get_node_data(i, None)
+            for i in vyper_module.body
+            if not isinstance(i, vy_ast.FunctionDef)
+        ]
+        interface_hashes = {}
+        for name, interface in (interface_codes or {}).items():
+            interface_hashes[name] = _hash(json.dumps(interface, sort_keys=True))
+
+        key_data = {
+            "compiler": _get_compiler_version(),
+            "evm_ruleset": get_session().evm_version_id,
+            "declarations": _hash(repr(declarations)),
+            "interfaces": interface_hashes,
+        }
+        self._module_key = _hash(json.dumps(key_data, sort_keys=True))
+
+    def parse_function(
+        self, code: vy_ast.FunctionDef, sigs: dict, origcode: str, global_ctx: GlobalContext
+    ) -> LLLnode:
+        """
+        Generate LLL for a function, or load it from the cache.
+
+        Accepts the same arguments as `vyper.parser.function_definitions.parse_function`,
+        and has the same side effects on `global_ctx`.
+
+        Returns
+        -------
+        LLLnode
+            LLL for the function.
+        """
+        key = self._get_function_key(code, sigs["self"], global_ctx)
+        is_cached, value = self.cache.get(key, "function")
+        if is_cached:
+            lll_node, lineno, nonreentrant_keys = value
+            # replay the nonreentrant lock allocation performed when the function was parsed
+            for nonreentrant_key in nonreentrant_keys:
+                global_ctx.get_nonrentrant_counter(nonreentrant_key)
+            _shift_positions(lll_node, code.lineno - lineno)
+            return lll_node
+
+        previous_keys = set(global_ctx._nonrentrant_keys)
+        lll_node = parse_function(code, sigs, origcode, global_ctx)
+        nonreentrant_keys = [i for i in global_ctx._nonrentrant_keys if i not in previous_keys]
+
+        # the function context references the entire global context, it is not cached
+        context = lll_node.context
+        del lll_node.context
+        try:
+            self.cache.set(key, "function", (lll_node, code.lineno, nonreentrant_keys))
+        finally:
+            lll_node.context = context
+
+        return lll_node
+
+    def _get_function_key(
+        self, code: vy_ast.FunctionDef, self_sigs: dict, global_ctx: GlobalContext
+    ) -> str:
+        called_names = set(
+            i.attr for i in code.get_descendants(vy_ast.Attribute, {"value.id": "self"})
+        )
+        called_sigs = sorted(
+            (sig.sig, repr(sig.output_type), sig.mutability, sig.internal, sig.gas)
+            for sig in self_sigs.values()
+            if isinstance(sig, FunctionSignature) and sig.name in called_names
+        )
+        key_data = {
+            "module": self._module_key,
+            "function": _hash(repr(_get_node_data(code, code.lineno))),
+            "called_functions": repr(called_sigs),
+            "nonreentrant_keys": sorted(global_ctx._nonrentrant_keys.items()),
+        }
+        return _hash(json.dumps(key_data, sort_keys=True))
+
+
+def _get_node_data(node: vy_ast.VyperNode, lineno: Optional[int]) -> List:
+    # position independent representation of a node and its descendants
+    # line numbers are given relative to `lineno`, or omitted if `lineno` is None
+    data: List = [node.ast_type]
+    if lineno is not None:
+        for attr in ("lineno", "end_lineno"):
+            value = getattr(node, attr, None)
+            data.append(None if value is None else value - lineno)
+        data.extend(getattr(node, i, None) for i in ("col_offset", "end_col_offset"))
+
+    fields: Dict[str, Any] = {}
+    for field_name in sorted(node.get_fields()):
+        if field_name in vy_ast.VyperNode.__slots__ or field_name == "pos":
+            # source positions are handled above
+            continue
+        value = getattr(node, field_name, None)
+        if isinstance(value, list):
+            value = [
+                _get_node_data(i, lineno) if isinstance(i, vy_ast.VyperNode) else i for i in value
+            ]
+        elif isinstance(value, vy_ast.VyperNode):
+            value = _get_node_data(value, lineno)
+        fields[field_name] = value
+    data.append(fields)
+    return data
+
+
+def _shift_positions(lll_node: LLLnode, offset: int) -> None:
+    # move the source positions within a cached function by `offset` lines
+    if not offset:
+        return
+    seen = set()
+    stack = [lll_node]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if node.pos is not None:
+            lineno, col_offset, end_lineno, end_col_offset = node.pos
+            if end_lineno is not None:
+                end_lineno += offset
+            node.pos = (lineno + offset, col_offset, end_lineno, end_col_offset)
+        stack.extend(node.args)
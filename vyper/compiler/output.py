@@ -2,7 +2,7 @@ from collections import OrderedDict, deque
 
 import asttokens
 
-from vyper import compile_lll, opcodes
+from vyper import opcodes
 from vyper.ast import ast_to_dict, parse_natspec
 from vyper.compiler.phases import CompilerData
 from vyper.compiler.utils import build_gas_estimates
@@ -22,6 +22,10 @@ def build_ast_dict(compiler_data: CompilerData) -> dict:
     return ast_dict
 
 
+def build_call_graph_output(compiler_data: CompilerData) -> dict:
+    return compiler_data.call_graph.to_dict()
+
+
 def build_devdoc(compiler_data: CompilerData) -> dict:
     userdoc, devdoc = parse_natspec(compiler_data.vyper_module_folded, compiler_data.global_ctx)
     return devdoc
@@ -92,7 +96,7 @@ def _build_asm(asm_list):
 
 
 def build_source_map_output(compiler_data: CompilerData) -> OrderedDict:
-    _, line_number_map = compile_lll.assembly_to_evm(compiler_data.assembly_runtime)
+    line_number_map = compiler_data.source_map
     # Sort line_number_map
     out = OrderedDict()
     for k in sorted(line_number_map.keys()):
@@ -163,3 +167,10 @@ def _build_opcodes(bytecode: bytes) -> str:
             opcode_output.append(f"0x{''.join(push_values).upper()}")
 
     return " ".join(opcode_output)
+
+
+def build_profile_output(compiler_data: CompilerData) -> dict:
+    # only includes phases that were executed to generate the other requested outputs
+    if compiler_data.profiler is None:
+        return {"phases": {}, "total": {"wall_time": 0, "cpu_time": 0}}
+    return compiler_data.profiler.as_dict()
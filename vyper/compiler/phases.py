@@ -1,12 +1,20 @@
-import copy
 import warnings
-from typing import Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 from vyper import ast as vy_ast
 from vyper import compile_lll, optimizer
+from vyper.compiler.cache import CompilerCache, FunctionCache, get_cache_key
+from vyper.compiler.profiling import (
+    PhaseProfiler,
+    count_assembly_items,
+    count_ast_nodes,
+    count_lll_nodes,
+)
 from vyper.context import validate_semantics
+from vyper.context.validation.call_graph import CallGraph
 from vyper.parser import parser
 from vyper.parser.global_context import GlobalContext
+from vyper.session import get_session
 from vyper.typing import InterfaceImports
 
 
@@ -24,6 +32,8 @@ class CompilerData:
         Top-level Vyper AST node
     vyper_module_folded : vy_ast.Module
         Folded Vyper AST
+    call_graph : CallGraph
+        Internal function calls made within the contract
     global_ctx : GlobalContext
         Sorted, contextualized representation of the Vyper AST
     lll_nodes : LLLnode
@@ -38,6 +48,11 @@ class CompilerData:
         Deployment bytecode
     bytecode_runtime : bytes
         Runtime bytecode
+    source_map : dict
+        Line number and program counter maps for the runtime bytecode
+    profiler : PhaseProfiler
+        Resource usage of each executed phase. Only available if profiling
+        is enabled.
     """
 
     def __init__(
@@ -46,6 +61,8 @@ class CompilerData:
         contract_name: str = "VyperContract",
         interface_codes: Optional[InterfaceImports] = None,
         source_id: int = 0,
+        cache: Optional[CompilerCache] = None,
+        profile: bool = False,
     ) -> None:
         """
         Initialization method.
@@ -62,39 +79,121 @@ class CompilerData:
             * JSON interfaces are given as lists, vyper interfaces as strings
         source_id : int, optional
             ID number used to identify this contract in the source map.
+        cache : CompilerCache, optional
+            On-disk cache used to store and retrieve the output of each phase.
+        profile : bool, optional
+            If True, the resource usage of each phase is recorded.
         """
         self.contract_name = contract_name
         self.source_code = source_code
         self.interface_codes = interface_codes
         self.source_id = source_id
+        self.cache = cache
+        self.profiler = PhaseProfiler() if profile else None
+
+    def _run_phase(self, phase: str, generate: Callable, *args: Any, **kwargs: Any) -> Any:
+        # execute a single compiler phase, recording its resource usage if profiling
+        # arguments must be evaluated prior to calling so prior phases are not included
+        if self.profiler is None:
+            return generate(*args)
+        return self.profiler.run(phase, generate, *args, **kwargs)
+
+    def _load_or_generate(self, artifact: str, generate: Callable[[], Any]) -> Any:
+        # fetch an artifact from the cache, or generate it and add it to the cache
+        if self.cache is None:
+            return generate()
+
+        if not hasattr(self, "_cache_key"):
+            self._cache_key = get_cache_key(
+                self.source_code, self.contract_name, self.source_id, self.interface_codes
+            )
+        is_cached, value = self.cache.get(self._cache_key, artifact)
+        if not is_cached:
+            value = generate()
+            self.cache.set(self._cache_key, artifact, value)
+
+        return value
 
     @property
     def vyper_module(self) -> vy_ast.Module:
         if not hasattr(self, "_vyper_module"):
-            self._vyper_module = generate_ast(self.source_code, self.source_id, self.contract_name)
+            self._vyper_module = self._load_or_generate(
+                "vyper_module",
+                lambda: self._run_phase(
+                    "generate_ast",
+                    generate_ast,
+                    self.source_code,
+                    self.source_id,
+                    self.contract_name,
+                    count_nodes=count_ast_nodes,
+                ),
+            )
 
         return self._vyper_module
 
+    def _gen_folded_ast(self) -> vy_ast.Module:
+        vyper_module_folded = self._run_phase(
+            "generate_folded_ast",
+            generate_folded_ast,
+            self.vyper_module,
+            count_nodes=count_ast_nodes,
+        )
+        self._run_phase(
+            "validate_semantics", validate_semantics, vyper_module_folded, self.interface_codes
+        )
+        return vyper_module_folded
+
     @property
     def vyper_module_folded(self) -> vy_ast.Module:
         if not hasattr(self, "_vyper_module_folded"):
-            self._vyper_module_folded = generate_folded_ast(self.vyper_module)
-            validate_semantics(self._vyper_module_folded, self.interface_codes)
+            self._vyper_module_folded = self._load_or_generate(
+                "vyper_module_folded", self._gen_folded_ast
+            )
 
         return self._vyper_module_folded
 
+    @property
+    def call_graph(self) -> CallGraph:
+        # the graph is built during semantic validation of the folded AST
+        return self.vyper_module_folded._metadata["call_graph"]
+
     @property
     def global_ctx(self) -> GlobalContext:
         if not hasattr(self, "_global_ctx"):
-            self._global_ctx = generate_global_context(
-                self.vyper_module_folded, self.interface_codes
+            self._global_ctx = self._run_phase(
+                "generate_global_context",
+                generate_global_context,
+                self.vyper_module_folded,
+                self.interface_codes,
             )
 
         return self._global_ctx
 
+    def _gen_lll_nodes(self) -> Tuple[parser.LLLnode, parser.LLLnode]:
+        # equivalent to `generate_lll_nodes`, with LLL generation and optimization
+        # executed as separate phases
+        function_cache = None
+        if self.cache is not None:
+            function_cache = FunctionCache(
+                self.cache, self.vyper_module_folded, self.interface_codes
+            )
+        lll_nodes, lll_runtime = self._run_phase(
+            "parse_tree_to_lll",
+            parser.parse_tree_to_lll,
+            self.source_code,
+            self.global_ctx,
+            function_cache,
+            count_nodes=count_lll_nodes,
+        )
+        return self._run_phase(
+            "optimize",
+            lambda: (optimizer.optimize(lll_nodes), optimizer.optimize(lll_runtime)),
+            count_nodes=count_lll_nodes,
+        )
+
     def _gen_lll(self) -> None:
         # fetch both deployment and runtime LLL
-        self._lll_nodes, self._lll_runtime = generate_lll_nodes(self.source_code, self.global_ctx)
+        self._lll_nodes, self._lll_runtime = self._load_or_generate("lll", self._gen_lll_nodes)
 
     @property
     def lll_nodes(self) -> parser.LLLnode:
@@ -111,27 +210,62 @@ class CompilerData:
     @property
     def assembly(self) -> list:
         if not hasattr(self, "_assembly"):
-            self._assembly = generate_assembly(self.lll_nodes)
+            self._assembly = self._load_or_generate(
+                "assembly",
+                lambda: self._run_phase(
+                    "compile_to_assembly",
+                    generate_assembly,
+                    self.lll_nodes,
+                    count_nodes=count_assembly_items,
+                ),
+            )
         return self._assembly
 
     @property
     def assembly_runtime(self) -> list:
         if not hasattr(self, "_assembly_runtime"):
-            self._assembly_runtime = generate_assembly(self.lll_runtime)
+            self._assembly_runtime = self._load_or_generate(
+                "assembly_runtime",
+                lambda: self._run_phase(
+                    "compile_to_assembly_runtime",
+                    generate_assembly,
+                    self.lll_runtime,
+                    count_nodes=count_assembly_items,
+                ),
+            )
         return self._assembly_runtime
 
     @property
     def bytecode(self) -> bytes:
         if not hasattr(self, "_bytecode"):
-            self._bytecode = generate_bytecode(self.assembly)
+            self._bytecode = self._load_or_generate(
+                "bytecode",
+                lambda: self._run_phase("assembly_to_evm", generate_bytecode, self.assembly),
+            )
         return self._bytecode
 
     @property
     def bytecode_runtime(self) -> bytes:
         if not hasattr(self, "_bytecode_runtime"):
-            self._bytecode_runtime = generate_bytecode(self.assembly_runtime)
+            self._bytecode_runtime = self._load_or_generate(
+                "bytecode_runtime",
+                lambda: self._run_phase(
+                    "assembly_to_evm_runtime", generate_bytecode, self.assembly_runtime
+                ),
+            )
         return self._bytecode_runtime
 
+    @property
+    def source_map(self) -> dict:
+        if not hasattr(self, "_source_map"):
+            self._source_map = self._load_or_generate(
+                "source_map",
+                lambda: self._run_phase(
+                    "generate_source_map", generate_source_map, self.assembly_runtime
+                ),
+            )
+        return self._source_map
+
 
 def generate_ast(source_code: str, source_id: int, contract_name: str) -> vy_ast.Module:
     """
@@ -149,9 +283,10 @@ def generate_ast(source_code: str, source_id: int, contract_name: str) -> vy_ast
     Returns
     -------
     vy_ast.Module
-        Top-level Vyper AST node
+        Top-level Vyper AST node. If the active session has a module store, the
+        node is shared via the store and so must not be modified.
     """
-    return vy_ast.parse_to_ast(source_code, source_id, contract_name)
+    return get_session().parse(source_code, source_id, contract_name)
 
 
 def generate_folded_ast(vyper_module: vy_ast.Module) -> vy_ast.Module:
@@ -170,7 +305,7 @@ def generate_folded_ast(vyper_module: vy_ast.Module) -> vy_ast.Module:
     """
     vy_ast.validation.validate_literal_nodes(vyper_module)
 
-    vyper_module_folded = copy.deepcopy(vyper_module)
+    vyper_module_folded = vyper_module.clone()
     vy_ast.folding.fold(vyper_module_folded)
 
     return vyper_module_folded
@@ -274,3 +409,20 @@ def generate_bytecode(assembly: list) -> bytes:
         Final compiled bytecode.
     """
     return compile_lll.assembly_to_evm(assembly)[0]
+
+
+def generate_source_map(assembly: list) -> dict:
+    """
+    Generate the line number and program counter maps for assembly instructions.
+
+    Arguments
+    ---------
+    assembly : list
+        Assembly instructions. Can be deployment or runtime assembly.
+
+    Returns
+    -------
+    dict
+        Line number map, as generated by `compile_lll.assembly_to_evm`.
+    """
+    return compile_lll.assembly_to_evm(assembly)[1]
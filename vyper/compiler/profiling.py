@@ -0,0 +1,134 @@
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from vyper import ast as vy_ast
+from vyper.parser.lll_node import LLLnode
+
+
+class PhaseProfiler:
+    """
+    Records resource usage for each phase executed by `CompilerData`.
+
+    For every phase, the following values are recorded:
+
+    * `wall_time`: elapsed wall clock time, in seconds
+    * `cpu_time`: CPU time consumed by the process, in seconds
+    * `peak_memory`: peak memory allocated during the phase, in bytes
+    * a node count for the generated data, where applicable (`ast_nodes`,
+      `lll_nodes` or `assembly_items`)
+
+    Memory is measured using `tracemalloc`, which adds significant overhead to
+    the compilation. Timings are therefore useful for comparing phases with one
+    another, not as an absolute measure of compilation speed.
+
+    Attributes
+    ----------
+    phases : Dict[str, dict]
+        Recorded data for each phase, in the order the phases were executed.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, dict] = {}
+
+    def run(
+        self,
+        phase: str,
+        generate: Callable[..., Any],
+        *args: Any,
+        count_nodes: Optional[Callable[[Any], dict]] = None,
+    ) -> Any:
+        """
+        Execute a compiler phase and record its resource usage.
+
+        Arguments
+        ---------
+        phase : str
+            Name of the phase.
+        generate : Callable
+            Function that executes the phase.
+        *args : Any
+            Arguments to call `generate` with.
+        count_nodes : Callable, optional
+            Function which is called with the return value of `generate`. It
+            should return a dict of node counts to include in the phase data.
+
+        Returns
+        -------
+        Any
+            The return value of `generate`.
+        """
+        is_tracing = tracemalloc.is_tracing()
+        if not is_tracing:
+            tracemalloc.start()
+        _reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+
+        try:
+            value = generate(*args)
+        finally:
+            wall_time = time.perf_counter() - start_wall
+            cpu_time = time.process_time() - start_cpu
+            peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+            if not is_tracing:
+                tracemalloc.stop()
+
+        data = {"wall_time": wall_time, "cpu_time": cpu_time, "peak_memory": max(peak_memory, 0)}
+        if count_nodes is not None:
+            data.update(count_nodes(value))
+        self.phases[phase] = data
+
+        return value
+
+    def as_dict(self) -> dict:
+        """
+        Return the recorded data for all phases, and the total time.
+        """
+        return {
+            "phases": self.phases,
+            "total": {
+                "wall_time": sum(i["wall_time"] for i in self.phases.values()),
+                "cpu_time": sum(i["cpu_time"] for i in self.phases.values()),
+            },
+        }
+
+
+def _reset_peak() -> None:
+    reset_peak = getattr(tracemalloc, "reset_peak", None)
+    if reset_peak is not None:
+        reset_peak()
+    else:
+        # python < 3.9, clearing traces also resets the peak
+        tracemalloc.clear_traces()
+
+
+def count_ast_nodes(vyper_module: vy_ast.Module) -> dict:
+    return {"ast_nodes": len(vyper_module.get_descendants()) + 1}
+
+
+def count_lll_nodes(lll_nodes: Union[LLLnode, Tuple[LLLnode, ...]]) -> dict:
+    # accepts a single LLLnode, or a tuple of (deployment, runtime) LLL
+    if isinstance(lll_nodes, LLLnode):
+        stack = [lll_nodes]
+    else:
+        stack = list(lll_nodes)
+
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.args)
+    return {"lll_nodes": count}
+
+
+def count_assembly_items(assembly: list) -> dict:
+    count = 0
+    stack = [assembly]
+    while stack:
+        for item in stack.pop():
+            if isinstance(item, list):
+                stack.append(item)
+            else:
+                count += 1
+    return {"assembly_items": count}
@@ -1,45 +1,100 @@
+from types import MappingProxyType
+from typing import Mapping, Optional
+
 from vyper.exceptions import (
     CompilerPanic,
     NamespaceCollision,
     UndeclaredDefinition,
 )
+from vyper.session import get_session
 
+_builtins: Optional[Mapping] = None
 
-class Namespace(dict):
-    """
-    Dictionary subclass that represents the namespace of a contract.
 
-    Attributes
-    ----------
-    _scopes : List[Set]
-        List of sets containing the key names for each scope
+def get_builtins() -> Mapping:
     """
+    Get the builtin types, environment variables and builtin functions.
 
-    def __init__(self):
-        super().__init__()
-        self._scopes = []
+    The builtins are the same for every contract, so they are created once and
+    shared by every namespace within the process. The returned mapping is
+    read-only.
+    """
+    global _builtins
+    if _builtins is None:
         from vyper.context import environment
         from vyper.context.types import get_types
         from vyper.functions.functions import get_builtin_functions
 
-        self.update(get_types())
-        self.update(environment.get_constant_vars())
-        self.update(get_builtin_functions())
+        builtins: dict = {}
+        for items in (get_types(), environment.get_constant_vars(), get_builtin_functions()):
+            for key, value in items.items():
+                if key in builtins:
+                    raise CompilerPanic(f"Builtin '{key}' is defined more than once")
+                builtins[key] = value
+        _builtins = MappingProxyType(builtins)
+    return _builtins
+
+
+class Namespace:
+    """
+    Scope chain that represents the namespace of a contract.
+
+    The namespace is made up of layers, searched from the innermost outward:
+
+    * one layer for each scope entered with `enter_scope`, e.g. the module,
+      a function, or the body of a `for` loop
+    * names assigned outside of any scope, which are treated as builtins
+    * builtin types, environment variables and builtin functions, shared by all
+      namespaces (see `get_builtins`)
+
+    Names cannot be shadowed, so every name is declared in at most one layer.
+    The names of all scopes are also kept in a single dict, so lookups and
+    collision checks take constant time regardless of the number of scopes.
+    Exiting a scope only removes the names declared within it.
+
+    Attributes
+    ----------
+    _scopes : List[List]
+        List of lists containing the key names for each scope
+    type_cache : Dict
+        Possible types of expression nodes that have been type-checked within the
+        current scope, keyed by node id. Cleared whenever a scope is entered or
+        exited, as the types of names may change.
+    """
+
+    def __init__(self):
+        self._builtins = get_builtins()
+        self._globals: dict = {}
+        self._values: dict = {}
+        self._scopes: list = []
+        self.type_cache: dict = {}
 
     def __eq__(self, other):
         return self is other
 
+    def __hash__(self):
+        return id(self)
+
+    def __contains__(self, key):
+        return key in self._values or key in self._globals or key in self._builtins
+
     def __setitem__(self, attr, obj):
         self.validate_assignment(attr)
 
         if self._scopes:
-            self._scopes[-1].add(attr)
-        super().__setitem__(attr, obj)
+            self._scopes[-1].append(attr)
+            self._values[attr] = obj
+        else:
+            self._globals[attr] = obj
 
     def __getitem__(self, key):
-        if key not in self:
-            raise UndeclaredDefinition(f"'{key}' has not been declared")
-        return super().__getitem__(key)
+        if key in self._values:
+            return self._values[key]
+        if key in self._globals:
+            return self._globals[key]
+        if key in self._builtins:
+            return self._builtins[key]
+        raise UndeclaredDefinition(f"'{key}' has not been declared")
 
     def __enter__(self):
         if not self._scopes:
@@ -48,8 +103,10 @@ class Namespace(dict):
     def __exit__(self, exc_type, exc_value, traceback):
         if not self._scopes:
             raise CompilerPanic("Bad use of namespace as a context manager")
+        self.type_cache.clear()
+        values = self._values
         for key in self._scopes.pop():
-            del self[key]
+            del values[key]
 
     def enter_scope(self):
         """
@@ -60,7 +117,8 @@ class Namespace(dict):
         """
         from vyper.context import environment
 
-        self._scopes.append(set())
+        self.type_cache.clear()
+        self._scopes.append([])
 
         if len(self._scopes) == 1:
             # add mutable vars (`self`) to the initial scope
@@ -73,24 +131,24 @@ class Namespace(dict):
             self.__setitem__(key, value)
 
     def clear(self):
-        super().clear()
-        self.__init__()
+        """
+        Remove all names from the namespace, except for the builtins.
+        """
+        self._globals.clear()
+        self._values.clear()
+        self._scopes.clear()
+        self.type_cache.clear()
 
     def validate_assignment(self, attr):
-        if attr in self:
-            if attr not in [x for i in self._scopes for x in i]:
-                raise NamespaceCollision(f"Cannot assign to '{attr}', it is a builtin")
-            obj = super().__getitem__(attr)
+        if attr in self._values:
+            obj = self._values[attr]
             raise NamespaceCollision(f"'{attr}' has already been declared as a {obj}")
+        if attr in self._globals or attr in self._builtins:
+            raise NamespaceCollision(f"Cannot assign to '{attr}', it is a builtin")
 
 
 def get_namespace():
     """
-    Get the active namespace object.
+    Get the namespace object for the active compilation session.
     """
-    global _namespace
-    try:
-        return _namespace
-    except NameError:
-        _namespace = Namespace()
-        return _namespace
+    return get_session().namespace
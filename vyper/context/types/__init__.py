@@ -1,8 +1,19 @@
+from typing import Dict, Optional
+
 from vyper.context.types import indexable, meta, value
 from vyper.context.types.bases import BasePrimitive
 
+_primitive_types: Optional[Dict] = None
+
 
 def get_primitive_types():
+    global _primitive_types
+    if _primitive_types is None:
+        _primitive_types = _find_primitive_types()
+    return _primitive_types.copy()
+
+
+def _find_primitive_types():
     result = {}
 
     for module in (indexable, value):
@@ -0,0 +1,155 @@
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from vyper import ast as vy_ast
+from vyper.exceptions import CompilerPanic
+
+
+class CallGraph:
+    """
+    Graph of the internal function calls made within a contract.
+
+    The graph is divided into strongly connected components using Tarjan's
+    algorithm, so that cycle detection, reachability and call depths are each
+    resolved in a single pass over the components.
+
+    Attributes
+    ----------
+    internal_calls : Dict[str, List[str]]
+        Names of the internal functions called by each function, in the order they
+        are first called. May include functions which are not defined.
+    components : List[List[str]]
+        Strongly connected components of the graph. Components are ordered so that
+        each appears before any of the components that call into it.
+    reachable : Dict[str, Set[str]]
+        Names of all functions that may be called, directly or indirectly, by each
+        function.
+    call_depths : Dict[str, int]
+        Maximum depth of nested internal calls made by each function. Calls between
+        functions within the same cycle are not counted.
+    """
+
+    def __init__(self, vyper_module: vy_ast.Module) -> None:
+        self.internal_calls: Dict[str, List[str]] = {}
+        for node in vyper_module.get_children(vy_ast.FunctionDef):
+            calls = node.get_descendants(vy_ast.Call, {"func.value.id": "self"})
+            self.internal_calls[node.name] = list(dict.fromkeys(i.func.attr for i in calls))
+
+        self.components = self._find_components()
+
+        self.reachable: Dict[str, Set[str]] = {}
+        self.call_depths: Dict[str, int] = {}
+        for component in self.components:
+            members = set(component)
+            reachable: Set[str] = set()
+            depth = 0
+            for name in component:
+                for callee in self.get_callees(name):
+                    reachable.add(callee)
+                    if callee not in members:
+                        reachable.update(self.reachable[callee])
+                        depth = max(depth, self.call_depths[callee] + 1)
+            for name in component:
+                self.reachable[name] = set(reachable)
+                self.call_depths[name] = depth
+
+    def get_callees(self, name: str) -> List[str]:
+        """
+        Return the names of the defined functions that are called by a function.
+        """
+        return [i for i in self.internal_calls[name] if i in self.internal_calls]
+
+    def _find_components(self) -> List[List[str]]:
+        # iterative implementation of Tarjan's algorithm, to avoid exceeding the
+        # recursion limit on long chains of calls
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components: List[List[str]] = []
+
+        for root in self.internal_calls:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.get_callees(root)))]
+
+            while work:
+                name, callees = work[-1]
+                for callee in callees:
+                    if callee not in index:
+                        index[callee] = lowlink[callee] = len(index)
+                        stack.append(callee)
+                        on_stack.add(callee)
+                        work.append((callee, iter(self.get_callees(callee))))
+                        break
+                    if callee in on_stack:
+                        lowlink[name] = min(lowlink[name], index[callee])
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        lowlink[caller] = min(lowlink[caller], lowlink[name])
+                    if lowlink[name] == index[name]:
+                        component: List[str] = []
+                        while not component or component[-1] != name:
+                            component.append(stack.pop())
+                            on_stack.discard(component[-1])
+                        components.append(component)
+
+        return components
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """
+        Find a cyclic sequence of internal calls.
+
+        Returns
+        -------
+        List, optional
+            Function names making up the cycle, beginning and ending with the same
+            function, e.g. `["foo", "bar", "foo"]`. None if there are no cycles.
+        """
+        cyclic = [i for i in self.components if len(i) > 1 or i[0] in self.internal_calls[i[0]]]
+        if not cyclic:
+            return None
+
+        component = set(min(cyclic, key=min))
+        start = min(component)
+
+        # breadth-first search for the shortest path back to the first function
+        callers: Dict[str, str] = {}
+        queue = deque([start])
+        while queue:
+            name = queue.popleft()
+            for callee in self.get_callees(name):
+                if callee == start:
+                    sequence = [name]
+                    while sequence[-1] != start:
+                        sequence.append(callers[sequence[-1]])
+                    return sequence[::-1] + [start]
+                if callee in component and callee not in callers:
+                    callers[callee] = name
+                    queue.append(callee)
+
+        raise CompilerPanic("Unable to find a cycle within a strongly connected component")
+
+    def to_dict(self) -> Dict:
+        """
+        Return the call graph as a dict, for use as a compiler output.
+
+        Returns
+        -------
+        dict
+            Formatted as `{"function name": {"calls": [...], "reachable": [...],
+            "max_call_depth": int}}`
+        """
+        return {
+            name: {
+                "calls": self.get_callees(name),
+                "reachable": sorted(self.reachable[name]),
+                "max_call_depth": self.call_depths[name],
+            }
+            for name in self.internal_calls
+        }
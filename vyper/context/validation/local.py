@@ -180,6 +180,7 @@ class FunctionNodeVisitor(VyperNodeVisitorBase):
             raise NamespaceCollision("Variable name shadows an existing storage-scoped value", node)
 
         type_definition = get_type_from_annotation(node.annotation, DataLocation.MEMORY)
+        node.annotation._metadata["type"] = type_definition
         validate_expected_type(node.value, type_definition)
 
         try:
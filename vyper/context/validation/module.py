@@ -1,6 +1,5 @@
-import importlib
-import pkgutil
-from typing import Optional, Union
+import heapq
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import vyper.interfaces
 from vyper import ast as vy_ast
@@ -11,6 +10,7 @@ from vyper.context.types.function import ContractFunction
 from vyper.context.types.meta.event import Event
 from vyper.context.types.utils import check_literal, get_type_from_annotation
 from vyper.context.validation.base import VyperNodeVisitorBase
+from vyper.context.validation.call_graph import CallGraph
 from vyper.context.validation.utils import validate_expected_type
 from vyper.exceptions import (
     CallViolation,
@@ -25,6 +25,7 @@ from vyper.exceptions import (
     VariableDeclarationException,
     VyperException,
 )
+from vyper.session import get_session
 from vyper.typing import InterfaceDict
 
 
@@ -36,19 +37,96 @@ def add_module_namespace(vy_module: vy_ast.Module, interface_codes: InterfaceDic
     ModuleNodeVisitor(vy_module, interface_codes, namespace)
 
 
-def _find_cyclic_call(fn_names: list, self_members: dict) -> Optional[list]:
-    if fn_names[-1] not in self_members:
-        return None
-    internal_calls = self_members[fn_names[-1]].internal_calls
-    for name in internal_calls:
-        if name in fn_names:
-            return fn_names + [name]
-        sequence = _find_cyclic_call(fn_names + [name], self_members)
-        if sequence:
-            return sequence
+def _get_declared_name(node: vy_ast.VyperNode) -> Optional[str]:
+    # name added to the namespace when visiting a module-level node
+    if isinstance(node, (vy_ast.EventDef, vy_ast.InterfaceDef, vy_ast.StructDef)):
+        return node.name
+    if isinstance(node, vy_ast.Import):
+        return node.alias
+    if isinstance(node, vy_ast.ImportFrom):
+        return node.alias or node.name
+    if isinstance(node, vy_ast.AnnAssign) and node.get("annotation.func.id") == "constant":
+        return node.get("target.id")
     return None
 
 
+def _get_referenced_names(node: vy_ast.VyperNode) -> Set[str]:
+    # names that must be declared prior to visiting a module-level node
+    if isinstance(node, (vy_ast.EventDef, vy_ast.InterfaceDef, vy_ast.StructDef)):
+        names: Set[str] = set()
+        return names.union(*(_get_referenced_names(i) for i in node.body))
+    if isinstance(node, vy_ast.FunctionDef):
+        nodes = [node.args, node.returns] + node.decorator_list
+    elif isinstance(node, vy_ast.AnnAssign):
+        nodes = [node.annotation, node.value]
+    else:
+        return set()
+    return set(
+        i.id
+        for n in nodes
+        if n is not None
+        for i in n.get_descendants(vy_ast.Name, include_self=True)
+    )
+
+
+def _sort_module_nodes(module_nodes: List) -> Tuple[List, List]:
+    """
+    Sort module-level nodes so that each is visited after the declarations it references.
+
+    Declarations are ordered with a topological sort of the names referenced within
+    annotations and constant values. `implements` statements depend on every other
+    statement, as the interface is checked against the functions and public storage
+    variables of the contract. Independent nodes retain their order in the source.
+
+    Arguments
+    ---------
+    module_nodes : List
+        Top-level nodes of the module.
+
+    Returns
+    -------
+    List
+        Sorted module-level nodes.
+    List
+        Nodes that are part of, or depend upon, a cyclic reference, in source order.
+    """
+    declarations: Dict[str, List[int]] = {}
+    for idx, node in enumerate(module_nodes):
+        name = _get_declared_name(node)
+        if name is not None:
+            declarations.setdefault(name, []).append(idx)
+
+    implements = set(
+        idx for idx, node in enumerate(module_nodes) if node.get("target.id") == "implements"
+    )
+    others = [idx for idx in range(len(module_nodes)) if idx not in implements]
+
+    dependents: List[List[int]] = [[] for i in module_nodes]
+    unvisited_dependencies = [0] * len(module_nodes)
+    for idx, node in enumerate(module_nodes):
+        names = _get_referenced_names(node)
+        dependencies = set(i for name in names for i in declarations.get(name, ()))
+        if idx in implements:
+            dependencies.update(others)
+        dependencies.discard(idx)
+        for i in dependencies:
+            dependents[i].append(idx)
+        unvisited_dependencies[idx] = len(dependencies)
+
+    queue = [idx for idx, count in enumerate(unvisited_dependencies) if not count]
+    sorted_nodes = []
+    while queue:
+        idx = heapq.heappop(queue)
+        sorted_nodes.append(module_nodes[idx])
+        for i in dependents[idx]:
+            unvisited_dependencies[i] -= 1
+            if not unvisited_dependencies[i]:
+                heapq.heappush(queue, i)
+
+    cyclic_nodes = [n for n, count in zip(module_nodes, unvisited_dependencies) if count]
+    return sorted_nodes, cyclic_nodes
+
+
 class ModuleNodeVisitor(VyperNodeVisitorBase):
 
     scope_name = "module"
@@ -60,7 +138,19 @@ class ModuleNodeVisitor(VyperNodeVisitorBase):
         self.interface_codes = interface_codes or {}
         self.namespace = namespace
 
-        module_nodes = module_node.body.copy()
+        sorted_nodes, module_nodes = _sort_module_nodes(module_node.body)
+        for node in sorted_nodes:
+            try:
+                self.visit(node)
+            except (InvalidLiteral, InvalidType, VariableDeclarationException):
+                raise
+            except VyperException:
+                module_nodes.append(node)
+
+        # nodes which could not be visited in dependency order, e.g. because of a cyclic
+        # or undeclared reference, are retried until no further progress is made
+        node_order = {id(node): idx for idx, node in enumerate(module_node.body)}
+        module_nodes.sort(key=lambda node: node_order[id(node)])
         while module_nodes:
             count = len(module_nodes)
             err_list = ExceptionList()
@@ -81,48 +171,34 @@ class ModuleNodeVisitor(VyperNodeVisitorBase):
                 err_list.raise_if_not_empty()
 
         # get list of internal function calls made by each function
-        call_function_names = set()
+        call_graph = CallGraph(self.ast)
+        # the graph is reused by later phases, via `CompilerData.call_graph`
+        self.ast._metadata["call_graph"] = call_graph
         self_members = namespace["self"].members
         for node in self.ast.get_children(vy_ast.FunctionDef):
-            call_function_names.add(node.name)
-            self_members[node.name].internal_calls = set(
-                i.func.attr for i in node.get_descendants(vy_ast.Call, {"func.value.id": "self"})
-            )
-            if node.name in self_members[node.name].internal_calls:
+            internal_calls = set(call_graph.internal_calls[node.name])
+            self_members[node.name].internal_calls = internal_calls
+            if node.name in internal_calls:
                 self_node = node.get_descendants(
                     vy_ast.Attribute, {"value.id": "self", "attr": node.name}
                 )[0]
                 raise CallViolation(f"Function '{node.name}' calls into itself", self_node)
 
-        for fn_name in sorted(call_function_names):
-
-            if fn_name not in self_members:
-                # the referenced function does not exist - this is an issue, but we'll report
-                # it later when parsing the function so we can give more meaningful output
-                continue
-
-            # check for circular function calls
-            sequence = _find_cyclic_call([fn_name], self_members)
-            if sequence is not None:
-                nodes = []
-                for i in range(len(sequence) - 1):
-                    fn_node = self.ast.get_children(vy_ast.FunctionDef, {"name": sequence[i]})[0]
-                    call_node = fn_node.get_descendants(
-                        vy_ast.Attribute, {"value.id": "self", "attr": sequence[i + 1]}
-                    )[0]
-                    nodes.append(call_node)
-
-                raise CallViolation("Contract contains cyclic function call", *nodes)
-
-            # get complete list of functions that are reachable from this function
-            function_set = set(i for i in self_members[fn_name].internal_calls if i in self_members)
-            while True:
-                expanded = set(x for i in function_set for x in self_members[i].internal_calls)
-                expanded |= function_set
-                if expanded == function_set:
-                    break
-                function_set = expanded
+        # check for circular function calls
+        sequence = call_graph.find_cycle()
+        if sequence is not None:
+            nodes = []
+            for i in range(len(sequence) - 1):
+                fn_node = self.ast.get_children(vy_ast.FunctionDef, {"name": sequence[i]})[0]
+                call_node = fn_node.get_descendants(
+                    vy_ast.Attribute, {"value.id": "self", "attr": sequence[i + 1]}
+                )[0]
+                nodes.append(call_node)
 
+            raise CallViolation("Contract contains cyclic function call", *nodes)
+
+        # set the complete list of functions that are reachable from each function
+        for fn_name, function_set in call_graph.reachable.items():
             self_members[fn_name].recursive_calls = function_set
 
     def visit_AnnAssign(self, node):
@@ -154,6 +230,7 @@ class ModuleNodeVisitor(VyperNodeVisitorBase):
         type_definition = get_type_from_annotation(
             annotation, DataLocation.STORAGE, is_immutable, is_public
         )
+        annotation._metadata["type"] = type_definition
 
         if is_immutable:
             if not node.value:
@@ -186,6 +263,7 @@ class ModuleNodeVisitor(VyperNodeVisitorBase):
 
     def visit_EventDef(self, node):
         obj = Event.from_EventDef(node)
+        _set_member_types(node, obj.arguments)
         try:
             self.namespace[node.name] = obj
         except VyperException as exc:
@@ -193,6 +271,13 @@ class ModuleNodeVisitor(VyperNodeVisitorBase):
 
     def visit_FunctionDef(self, node):
         func = ContractFunction.from_FunctionDef(node)
+        for arg in node.args.args:
+            arg.annotation._metadata["type"] = func.arguments[arg.arg]
+        if isinstance(node.returns, vy_ast.Tuple):
+            for item, type_definition in zip(node.returns.elements, func.return_type.value_type):
+                item._metadata["type"] = type_definition
+        if node.returns is not None:
+            node.returns._metadata["type"] = func.return_type
         try:
             self.namespace["self"].add_member(func.name, func)
         except VyperException as exc:
@@ -224,12 +309,22 @@ class ModuleNodeVisitor(VyperNodeVisitorBase):
 
     def visit_StructDef(self, node):
         obj = self.namespace["struct"].build_primitive_from_node(node)
+        _set_member_types(node, obj.members)
         try:
             self.namespace[node.name] = obj
         except VyperException as exc:
             raise exc.with_annotation(node) from None
 
 
+def _set_member_types(node: Union[vy_ast.EventDef, vy_ast.StructDef], members: dict) -> None:
+    # store the type of each member in the metadata of its annotation, for use in codegen
+    for item in node.get_children(vy_ast.AnnAssign):
+        annotation = item.annotation
+        if annotation.get("func.id") == "indexed":
+            annotation = annotation.args[0]
+        annotation._metadata["type"] = members[item.target.id]
+
+
 def _add_import(
     node: Union[vy_ast.Import, vy_ast.ImportFrom],
     module: str,
@@ -238,13 +333,17 @@ def _add_import(
     interface_codes: InterfaceDict,
     namespace: dict,
 ) -> None:
-    if module == "vyper.interfaces":
-        interface_codes = _get_builtin_interfaces()
+    is_builtin = module == "vyper.interfaces"
+    if is_builtin:
+        interface_codes = vyper.interfaces.get_builtin_interface_codes()
     if name not in interface_codes:
         raise UndeclaredDefinition(f"Unknown interface: {name}", node)
 
     if interface_codes[name]["type"] == "vyper":
-        interface_ast = vy_ast.parse_to_ast(interface_codes[name]["code"], contract_name=name)
+        if is_builtin:
+            interface_ast = vyper.interfaces.parse_builtin_interface(name)
+        else:
+            interface_ast = get_session().parse(interface_codes[name]["code"], contract_name=name)
         type_ = namespace["interface"].build_primitive_from_node(interface_ast)
     elif interface_codes[name]["type"] == "json":
         type_ = namespace["interface"].build_primitive_from_abi(name, interface_codes[name]["code"])
@@ -255,14 +354,3 @@ def _add_import(
         namespace[alias] = type_
     except VyperException as exc:
         raise exc.with_annotation(node) from None
-
-
-def _get_builtin_interfaces():
-    interface_names = [i.name for i in pkgutil.iter_modules(vyper.interfaces.__path__)]
-    return {
-        name: {
-            "type": "vyper",
-            "code": importlib.import_module(f"vyper.interfaces.{name}").interface_code,
-        }
-        for name in interface_names
-    }
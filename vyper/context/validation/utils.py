@@ -1,9 +1,10 @@
 import itertools
-from typing import Callable, List
+from typing import Callable, Dict, List, Optional
 
 from vyper import ast as vy_ast
 from vyper.context import types
 from vyper.context.namespace import get_namespace
+from vyper.context.types.abstract import ArrayValueAbstractType
 from vyper.context.types.bases import BaseTypeDefinition
 from vyper.context.types.indexable.sequence import (
     ArrayDefinition,
@@ -53,6 +54,9 @@ class _ExprTypeChecker:
     according to the Vyper ast node class. Calls to `get_exact_type_from_node` and
     `get_possible_types_from_node` are forwarded to this class, where the node
     class's method resolution order is examined to decide which method to call.
+
+    Results are memoized per node in `Namespace.type_cache`, which is cleared
+    whenever a scope is entered or exited.
     """
 
     def __init__(self):
@@ -99,8 +103,17 @@ class _ExprTypeChecker:
         List
             A list of type objects
         """
-        fn = self._find_fn(node)
-        types_list = fn(node)
+        # results are memoized per node until the namespace scope changes. the node is
+        # stored alongside the result so that its id cannot be reused while cached
+        type_cache = self.namespace.type_cache
+        cached = type_cache.get(id(node))
+        if cached is None or cached[0] is not node:
+            fn = self._find_fn(node)
+            cached = (node, fn(self, node))
+            if not next((i for i in cached[1] if _has_literal_length(i)), False):
+                type_cache[id(node)] = cached
+        types_list = list(cached[1])
+
         if only_definitions:
             invalid = next((i for i in types_list if not isinstance(i, BaseTypeDefinition)), None)
             if invalid:
@@ -113,15 +126,22 @@ class _ExprTypeChecker:
         return types_list
 
     def _find_fn(self, node):
-        # look for a type-check method for each class in the given class mro
-        for name in [i.__name__ for i in type(node).mro()]:
-            if name == "VyperNode":
-                break
-            fn = getattr(self, f"types_from_{name}", None)
-            if fn is not None:
-                return fn
-
-        raise StructureException("Cannot determine type of this object", node)
+        node_class = type(node)
+        if node_class not in _TYPE_CHECK_FNS:
+            # look for a type-check method for each class in the given class mro
+            _TYPE_CHECK_FNS[node_class] = None
+            for name in [i.__name__ for i in node_class.mro()]:
+                if name == "VyperNode":
+                    break
+                fn = getattr(_ExprTypeChecker, f"types_from_{name}", None)
+                if fn is not None:
+                    _TYPE_CHECK_FNS[node_class] = fn
+                    break
+
+        fn = _TYPE_CHECK_FNS[node_class]
+        if fn is None:
+            raise StructureException("Cannot determine type of this object", node)
+        return fn
 
     def types_from_Attribute(self, node):
         # variable attribute, e.g. `foo.bar`
@@ -250,6 +270,21 @@ class _ExprTypeChecker:
         return _validate_op(node, types_list, "validate_numeric_op")
 
 
+# type-check method for each node class, populated as node classes are encountered
+_TYPE_CHECK_FNS: Dict[type, Optional[Callable]] = {}
+
+
+def _has_literal_length(type_):
+    # literal bytes and strings are given a fixed length when compared to another type,
+    # so types which contain them cannot be shared between queries
+    if isinstance(type_, ArrayValueAbstractType):
+        return not getattr(type_, "_length", True)
+    value_type = getattr(type_, "value_type", None)
+    if isinstance(value_type, tuple):
+        return next((True for i in value_type if _has_literal_length(i)), False)
+    return value_type is not None and _has_literal_length(value_type)
+
+
 def _is_type_in_list(obj, types_list):
     # check if a type object is in a list of types
     return next((True for i in types_list if i.compare_type(obj)), False)
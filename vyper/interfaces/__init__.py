@@ -0,0 +1,60 @@
+import importlib
+import pkgutil
+import threading
+from typing import Dict, Optional
+
+from vyper import ast as vy_ast
+
+_interface_codes: Optional[Dict[str, dict]] = None
+_module_store: Optional["vy_ast.ModuleStore"] = None
+# built-in interfaces are shared by every thread within the process
+_lock = threading.Lock()
+
+
+def get_builtin_interface_codes() -> Dict[str, dict]:
+    """
+    Get the source of each built-in interface.
+
+    The interface modules are only loaded on the first call.
+
+    Returns
+    -------
+    dict
+        Interface definitions formatted as
+        `{"interface name": {"type": "vyper", "code": "interface code"}}`
+    """
+    global _interface_codes
+    with _lock:
+        if _interface_codes is None:
+            _interface_codes = {}
+            for module_info in pkgutil.iter_modules(__path__):  # type: ignore
+                module = importlib.import_module(f"vyper.interfaces.{module_info.name}")
+                code = module.interface_code  # type: ignore
+                _interface_codes[module_info.name] = {"type": "vyper", "code": code}
+        return _interface_codes.copy()
+
+
+def parse_builtin_interface(name: str) -> "vy_ast.Module":
+    """
+    Get the Vyper AST of a built-in interface.
+
+    The built-in interfaces are the same for every compilation, so each interface
+    is parsed once within the process. Each call returns a copy of the parsed
+    module, so that concurrent compilations do not share nodes.
+
+    Arguments
+    ---------
+    name : str
+        Name of the built-in interface.
+
+    Returns
+    -------
+    vy_ast.Module
+        Untyped, unoptimized Vyper AST of the interface.
+    """
+    global _module_store
+    code = get_builtin_interface_codes()[name]["code"]
+    with _lock:
+        if _module_store is None:
+            _module_store = vy_ast.ModuleStore()
+        return _module_store.parse(code, contract_name=name).clone()
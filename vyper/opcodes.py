@@ -1,6 +1,7 @@
 from typing import Dict, Optional
 
 from vyper.exceptions import CompilerPanic
+from vyper.session import CompilationSession, get_session
 from vyper.typing import (
     OpcodeGasCost,
     OpcodeMap,
@@ -9,8 +10,6 @@ from vyper.typing import (
     OpcodeValue,
 )
 
-active_evm_version: int = 0
-
 # EVM version rules work as follows:
 # 1. Fork rules go from oldest (lowest value) to newest (highest value).
 # 2. Fork versions aren't actually tied to anything. They are not a part of our
@@ -216,13 +215,9 @@ COMB_OPCODES: OpcodeMap = {**OPCODES, **PSEUDO_OPCODES}
 
 def evm_wrapper(fn, *args, **kwargs):
     def _wrapper(*args, **kwargs):
-        global active_evm_version
         evm_version = kwargs.pop("evm_version", None) or DEFAULT_EVM_VERSION
-        active_evm_version = EVM_VERSIONS[evm_version]
-        try:
+        with CompilationSession(evm_version=evm_version):
             return fn(*args, **kwargs)
-        finally:
-            active_evm_version = EVM_VERSIONS[DEFAULT_EVM_VERSION]
 
     return _wrapper
 
@@ -255,11 +250,11 @@ _evm_combined: Dict[int, OpcodeRulesetMap] = dict(
 
 
 def get_opcodes() -> OpcodeRulesetMap:
-    return _evm_opcodes[active_evm_version]
+    return _evm_opcodes[get_session().evm_version_id]
 
 
 def get_comb_opcodes() -> OpcodeRulesetMap:
-    return _evm_combined[active_evm_version]
+    return _evm_combined[get_session().evm_version_id]
 
 
 def version_check(begin: Optional[str] = None, end: Optional[str] = None) -> bool:
@@ -273,4 +268,4 @@ def version_check(begin: Optional[str] = None, end: Optional[str] = None) -> boo
         end_idx = max(EVM_VERSIONS.values())
     else:
         end_idx = EVM_VERSIONS[end]
-    return begin_idx <= active_evm_version <= end_idx
+    return begin_idx <= get_session().evm_version_id <= end_idx
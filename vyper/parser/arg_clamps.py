@@ -1,7 +1,7 @@
 import functools
-import uuid
 
 from vyper.parser.lll_node import LLLnode
+from vyper.session import get_session
 from vyper.types.types import (
     ByteArrayLike,
     ListType,
@@ -106,7 +106,8 @@ def make_arg_clamper(datapos, mempos, typ, is_init=False):
             i_incr = get_size_of_type(subtype) * 32
 
             mem_to = type_size * 32
-            loop_label = f"_check_list_loop_{str(uuid.uuid4())}"
+            # use the assembly symbol counter so labels are deterministic between builds
+            loop_label = f"_check_list_loop{get_session().mksymbol()}"
 
             lll_node = [
                 ["mstore", offset, 0],  # init loop
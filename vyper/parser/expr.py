@@ -20,6 +20,7 @@ from vyper.parser.parser_utils import (
     make_setter,
     unwrap_location,
 )
+from vyper.session import get_session
 from vyper.types import (
     BaseType,
     ByteArrayLike,
@@ -798,7 +799,7 @@ class Expr:
             o = ["if", condition, true, false]
             return o
 
-        jump_label = f"_boolop_{self.expr.src}"
+        jump_label = f"_boolop{get_session().mksymbol()}"
         if isinstance(self.expr.op, vy_ast.And):
             if len(self.expr.values) == 2:
                 # `x and y` is a special case, it doesn't require jumping
@@ -6,6 +6,7 @@ from vyper.parser.function_definitions.parse_internal_function import (  # NOTE
     parse_internal_function,
 )
 from vyper.parser.memory_allocator import MemoryAllocator
+from vyper.session import get_session
 from vyper.signatures import FunctionSignature
 from vyper.utils import calc_mem_gas
 
@@ -51,10 +52,13 @@ def parse_function(code, sigs, origcode, global_ctx, _vars=None):
         sig=sig,
     )
 
-    if sig.internal:
-        o = parse_internal_function(code=code, sig=sig, context=context,)
-    else:
-        o = parse_external_function(code=code, sig=sig, context=context,)
+    # labels are scoped to the function, so the generated LLL does not depend on
+    # the location of the function within the contract
+    with get_session().symbol_scope(sig.name):
+        if sig.internal:
+            o = parse_internal_function(code=code, sig=sig, context=context,)
+        else:
+            o = parse_external_function(code=code, sig=sig, context=context,)
 
     o.context = context
     o.total_gas = o.gas + calc_mem_gas(o.context.memory_allocator.get_next_memory_position())
@@ -1,3 +1,4 @@
+import itertools
 from typing import Optional
 
 from vyper import ast as vy_ast
@@ -6,7 +7,7 @@ from vyper.exceptions import (
     StructureException,
     VariableDeclarationException,
 )
-from vyper.parser.parser_utils import getpos, set_offsets
+from vyper.parser.parser_utils import getpos
 from vyper.signatures.function_signature import ContractRecord, VariableRecord
 from vyper.types import (
     BaseType,
@@ -14,6 +15,7 @@ from vyper.types import (
     InterfaceType,
     ListType,
     MappingType,
+    StringType,
     StructType,
     parse_type,
 )
@@ -23,6 +25,35 @@ from vyper.utils import VALID_GLOBAL_KEYWORDS, check_valid_varname
 NONRENTRANT_STORAGE_OFFSET = 0xFFFFFF
 
 
+def _mk_name(name):
+    return {"ast_type": "Name", "id": name}
+
+
+def _mk_type_node(typ):
+    # AST of the type annotation for a getter input or output type
+    if isinstance(typ, ByteArrayLike):
+        return {
+            "ast_type": "Subscript",
+            "value": _mk_name("String" if isinstance(typ, StringType) else "Bytes"),
+            "slice": {"ast_type": "Index", "value": {"ast_type": "Int", "value": typ.maxlen}},
+        }
+    if isinstance(typ, StructType):
+        return _mk_name(typ.name)
+    return _mk_name(repr(typ))
+
+
+def _set_node_ids(fields, counter):
+    # assign node IDs in the same order as `annotate_python_ast`
+    fields["node_id"] = next(counter)
+    for value in list(fields.values()):
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, dict):
+                _set_node_ids(item, counter)
+    if fields.get("ast_type") in ("Attribute", "Name", "Subscript"):
+        # the python expression context is visited last, and is then discarded
+        next(counter)
+
+
 # Datatype to store all global context information.
 class GlobalContext:
     def __init__(self):
@@ -45,10 +76,8 @@ class GlobalContext:
     def get_global_context(
         cls, vyper_module: "vy_ast.Module", interface_codes: Optional[InterfaceImports] = None
     ) -> "GlobalContext":
-        from vyper.signatures.interface import (
-            extract_sigs,
-            get_builtin_interfaces,
-        )
+        from vyper.interfaces import get_builtin_interface_codes
+        from vyper.signatures.interface import extract_sigs
 
         interface_codes = {} if interface_codes is None else interface_codes
         global_ctx = cls()
@@ -90,14 +119,14 @@ class GlobalContext:
                     raise StructureException(f"Duplicate import of {interface_name}", item)
 
                 if not item.level and item.module == "vyper.interfaces":
-                    built_in_interfaces = get_builtin_interfaces()
+                    built_in_interfaces = get_builtin_interface_codes()
                     if interface_name not in built_in_interfaces:
                         raise StructureException(
                             f"Built-In interface {interface_name} does not exist.", item
                         )
-                    global_ctx._interfaces[assigned_name] = built_in_interfaces[
-                        interface_name
-                    ].copy()
+                    global_ctx._interfaces[assigned_name] = extract_sigs(
+                        built_in_interfaces[interface_name], interface_name
+                    )
                 else:
                     if interface_name not in interface_codes:
                         raise StructureException(f"Unknown interface {interface_name}", item)
@@ -128,79 +157,71 @@ class GlobalContext:
         global_ctx._defs += global_ctx._getters
         return global_ctx
 
-    # Make a getter for a variable. This function gives an output that
-    # contains lists of 4-tuples:
-    # (i) the tail of the function name for the getter
-    # (ii) the code for the arguments that the function takes
-    # (iii) the code for the return
-    # (iv) the output type
+    # Make the input types and output type of the getter for a variable.
     #
     # Here is an example:
     #
-    # Input: my_variable: {foo: int128, bar: decimal[5]}
-    #
-    # Output:
+    # Input: my_variable: HashMap[address, decimal[5]]
     #
-    # [('__foo', '', '.foo', 'int128'),
-    #  ('__bar', 'arg0: int128, ', '.bar[arg0]', 'decimal')]
+    # Output: ([address, uint256], decimal)
     #
-    # The getters will have code:
-    # def get_my_variable__foo() -> int128: return self.foo
-    # def get_my_variable__bar(arg0: nun) -> decimal: return self.bar[arg0]
+    # The getter will have code:
+    # def my_variable(arg0: address, arg1: uint256) -> decimal:
+    #     return self.my_variable[arg0][arg1]
 
-    @classmethod
-    def _mk_getter_helper(cls, typ, depth=0):
-        # Base type and byte array type: do not extend the getter function
-        # name, add no input arguments, add nothing to the return statement,
-        # output type is the base type
-        if isinstance(typ, (BaseType, ByteArrayLike)):
-            return [("", "", "", repr(typ))]
-        # List type: do not extend the getter name, add an input argument for
-        # the index in the list, add an item access to the return statement
-        elif isinstance(typ, ListType):
-            o = []
-            for funname, head, tail, base in cls._mk_getter_helper(typ.subtype, depth + 1):
-                o.append(
-                    (funname, (f"arg{depth}: uint256, ") + head, (f"[arg{depth}]") + tail, base,)
-                )
-            return o
-        # Mapping type: do not extend the getter name, add an input argument for
-        # the key in the map, add a value access to the return statement
-        elif isinstance(typ, MappingType):
-            o = []
-            for funname, head, tail, base in cls._mk_getter_helper(typ.valuetype, depth + 1):
-                o.append(
-                    (
-                        funname,
-                        (f"arg{depth}: {typ.keytype}, ") + head,
-                        (f"[arg{depth}]") + tail,
-                        base,
-                    )
-                )
-            return o
-        # Struct type: return type is just the abi-encoded struct
-        elif isinstance(typ, StructType):
-            return [("", "", "", typ.name)]
-        else:
+    @staticmethod
+    def _mk_getter_types(typ):
+        input_types = []
+        # List type: add an input argument for the index in the list
+        # Mapping type: add an input argument for the key in the map
+        while isinstance(typ, (ListType, MappingType)):
+            if isinstance(typ, ListType):
+                input_types.append(BaseType("uint256"))
+                typ = typ.subtype
+            else:
+                input_types.append(typ.keytype)
+                typ = typ.valuetype
+        # Base type, byte array type and struct type: output type is the type itself
+        if not isinstance(typ, (BaseType, ByteArrayLike, StructType)):
             raise Exception("Unexpected type")
+        return input_types, typ
 
-    # Make a list of getters for a given variable name with a given type
+    # Make the getter for a variable with a given type. The getter node is
+    # built directly, with the source offsets of the variable declaration.
     @classmethod
-    def mk_getter(cls, varname, typ):
-        funs = cls._mk_getter_helper(typ)
-        return [
-            f"""@view
-@external
-def {varname}{funname}({head.rstrip(', ')}) -> {base}:
-    return self.{varname}{tail}"""
-            for (funname, head, tail, base) in funs  # noqa: E501
-        ]
-
-    # Parser for a single line
-    @staticmethod
-    def parse_line(source_code: str) -> list:
-        parsed_ast = vy_ast.parse_to_ast(source_code)[0]
-        return parsed_ast
+    def mk_getter(cls, item, typ):
+        varname = item.target.id
+        input_types, output_type = cls._mk_getter_types(typ)
+
+        return_value = {"ast_type": "Attribute", "value": _mk_name("self"), "attr": varname}
+        for idx in range(len(input_types)):
+            return_value = {
+                "ast_type": "Subscript",
+                "value": return_value,
+                "slice": {"ast_type": "Index", "value": _mk_name(f"arg{idx}")},
+            }
+        fields = {
+            "name": varname,
+            "args": {
+                "ast_type": "arguments",
+                "args": [
+                    {"ast_type": "arg", "arg": f"arg{idx}", "annotation": _mk_type_node(i)}
+                    for idx, i in enumerate(input_types)
+                ],
+                "defaults": [],
+            },
+            "body": [{"ast_type": "Return", "value": return_value}],
+            "decorator_list": [_mk_name("view"), _mk_name("external")],
+            "returns": _mk_type_node(output_type),
+        }
+        # the getter was previously parsed from source, where the module takes ID 0
+        _set_node_ids(fields, itertools.count(1))
+
+        getter = vy_ast.FunctionDef.from_node(item, **fields)
+        getter.pos = getpos(item)
+        # as with `VyperNode.clone`, the getter is not a child of the module
+        getter._parent = item.get_ancestor()
+        return getter
 
     # A struct is a list of members
     def make_struct(self, node: "vy_ast.StructDef") -> list:
@@ -322,10 +343,7 @@ def {varname}{funname}({head.rstrip(', ')}) -> {base}:
             )
             if item_attributes["public"]:
                 typ = InterfaceType(item_name)
-                for getter in self.mk_getter(item.target.id, typ):
-                    self._getters.append(self.parse_line("\n" * (item.lineno - 1) + getter))
-                    self._getters[-1].pos = getpos(item)
-                    set_offsets(self._getters[-1], self._getters[-1].pos)
+                self._getters.append(self.mk_getter(item, typ))
         elif self.get_call_func_name(item) == "public":
             if isinstance(item.annotation.args[0], vy_ast.Name) and item_name in self._contracts:
                 typ = InterfaceType(item_name)
@@ -335,10 +353,7 @@ def {varname}{funname}({head.rstrip(', ')}) -> {base}:
                 item.target.id, len(self._globals), typ, True,
             )
             # Adding getters here
-            for getter in self.mk_getter(item.target.id, typ):
-                self._getters.append(self.parse_line("\n" * (item.lineno - 1) + getter))
-                self._getters[-1].pos = getpos(item)
-                set_offsets(self._getters[-1], self._getters[-1].pos)
+            self._getters.append(self.mk_getter(item, typ))
 
         elif isinstance(item.annotation, (vy_ast.Name, vy_ast.Call, vy_ast.Subscript)):
             self._globals[item.target.id] = VariableRecord(
@@ -3,6 +3,7 @@ from typing import Any, List, Optional, Tuple, Union
 
 from vyper.exceptions import CompilerPanic
 from vyper.opcodes import get_comb_opcodes
+from vyper.session import get_session
 from vyper.settings import VYPER_COLOR_OUTPUT
 from vyper.types import BaseType, NodeType, ceil32
 from vyper.utils import VALID_LLL_MACROS
@@ -10,6 +11,9 @@ from vyper.utils import VALID_LLL_MACROS
 # Set default string representation for ints in LLL output.
 AS_HEX_DEFAULT = False
 
+# source position of a node: (lineno, col_offset, end_lineno, end_col_offset)
+SourcePosition = Tuple[int, int, Optional[int], Optional[int]]
+
 if VYPER_COLOR_OUTPUT:
     OKBLUE = "\033[94m"
     OKMAGENTA = "\033[35m"
@@ -49,7 +53,7 @@ class LLLnode:
         args: List["LLLnode"] = None,
         typ: "BaseType" = None,
         location: str = None,
-        pos: Optional[Tuple[int, int]] = None,
+        pos: Optional[SourcePosition] = None,
         annotation: Optional[str] = None,
         mutable: bool = True,
         add_gas_estimate: int = 0,
@@ -290,7 +294,7 @@ class LLLnode:
         o = ""
         if self.annotation:
             o += f"/* {self.annotation} */ \n"
-        if self.repr_show_gas and self.gas:
+        if (self.repr_show_gas or get_session().show_gas_estimates) and self.gas:
             o += OKBLUE + "{" + ENDC + str(self.gas) + OKBLUE + "} " + ENDC  # add gas for info.
         o += "[" + self._colorise_keywords(self.repr_value)
         prev_lineno = self.pos[0] if self.pos else None
@@ -330,7 +334,7 @@ class LLLnode:
         obj: Any,
         typ: "BaseType" = None,
         location: str = None,
-        pos: Tuple[int, int] = None,
+        pos: Optional[SourcePosition] = None,
         annotation: Optional[str] = None,
         mutable: bool = True,
         add_gas_estimate: int = 0,
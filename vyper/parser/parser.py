@@ -94,15 +94,34 @@ def parse_external_interfaces(external_interfaces, global_ctx):
     return external_interfaces
 
 
+def _parse_function(code, sigs, origcode, global_ctx, function_cache):
+    if function_cache is None:
+        return parse_function(code, sigs, origcode, global_ctx)
+    return function_cache.parse_function(code, sigs, origcode, global_ctx)
+
+
 def parse_other_functions(
-    o, otherfuncs, sigs, external_interfaces, origcode, global_ctx, default_function
+    o,
+    otherfuncs,
+    sigs,
+    external_interfaces,
+    origcode,
+    global_ctx,
+    default_function,
+    function_cache=None,
 ):
     sub = ["seq", func_init_lll()]
     add_gas = func_init_lll().gas
 
     for _def in otherfuncs:
         sub.append(
-            parse_function(_def, {**{"self": sigs}, **external_interfaces}, origcode, global_ctx)
+            _parse_function(
+                _def,
+                {**{"self": sigs}, **external_interfaces},
+                origcode,
+                global_ctx,
+                function_cache,
+            )
         )
         sub[-1].total_gas += add_gas
         add_gas += 30
@@ -112,8 +131,12 @@ def parse_other_functions(
 
     # Add fallback function
     if default_function:
-        default_func = parse_function(
-            default_function[0], {**{"self": sigs}, **external_interfaces}, origcode, global_ctx,
+        default_func = _parse_function(
+            default_function[0],
+            {**{"self": sigs}, **external_interfaces},
+            origcode,
+            global_ctx,
+            function_cache,
         )
         fallback = default_func
     else:
@@ -124,7 +147,28 @@ def parse_other_functions(
 
 
 # Main python parse tree => LLL method
-def parse_tree_to_lll(source_code: str, global_ctx: GlobalContext) -> Tuple[LLLnode, LLLnode]:
+def parse_tree_to_lll(
+    source_code: str, global_ctx: GlobalContext, function_cache: Any = None
+) -> Tuple[LLLnode, LLLnode]:
+    """
+    Generate deployment and runtime LLL from the contextualized AST.
+
+    Arguments
+    ---------
+    source_code : str
+        Vyper source code.
+    global_ctx : GlobalContext
+        Contextualized Vyper AST
+    function_cache : FunctionCache, optional
+        Cache of previously generated LLL for individual functions. When given,
+        functions that are unchanged since a prior compilation are not parsed again.
+
+    Returns
+    -------
+    (LLLnode, LLLnode)
+        LLL to generate deployment bytecode
+        LLL to generate runtime bytecode
+    """
     _names_def = [_def.name for _def in global_ctx._defs]
     # Checks for duplicate function names
     if len(set(_names_def)) < len(_names_def):
@@ -159,15 +203,26 @@ def parse_tree_to_lll(source_code: str, global_ctx: GlobalContext) -> Tuple[LLLn
     if initfunc:
         o.append(init_func_init_lll())
         o.append(
-            parse_function(
-                initfunc[0], {**{"self": sigs}, **external_interfaces}, source_code, global_ctx,
+            _parse_function(
+                initfunc[0],
+                {**{"self": sigs}, **external_interfaces},
+                source_code,
+                global_ctx,
+                function_cache,
             )
         )
 
     # If there are regular functions...
     if otherfuncs or defaultfunc:
         o, runtime = parse_other_functions(
-            o, otherfuncs, sigs, external_interfaces, source_code, global_ctx, defaultfunc
+            o,
+            otherfuncs,
+            sigs,
+            external_interfaces,
+            source_code,
+            global_ctx,
+            defaultfunc,
+            function_cache,
         )
     else:
         runtime = o.copy()
@@ -7,6 +7,7 @@ from vyper.exceptions import (
 )
 from vyper.parser.lll_node import LLLnode
 from vyper.parser.parser_utils import getpos, pack_arguments
+from vyper.session import get_session
 from vyper.signatures.function_signature import FunctionSignature
 from vyper.types import (
     BaseType,
@@ -89,7 +90,7 @@ def _call_self_internal(stmt_expr, context, sig):
         mem_from, mem_to = var_slots[0][0], var_slots[-1][0] + var_slots[-1][1] * 32
 
         i_placeholder = context.new_placeholder(BaseType("uint256"))
-        local_save_ident = f"_{stmt_expr.lineno}_{stmt_expr.col_offset}"
+        local_save_ident = get_session().mksymbol()
         push_loop_label = "save_locals_start" + local_save_ident
         pop_loop_label = "restore_locals_start" + local_save_ident
 
@@ -126,7 +127,7 @@ def _call_self_internal(stmt_expr, context, sig):
         needs_dyn_section = any([has_dynamic_data(arg.typ) for arg in expr_args])
 
         if needs_dyn_section:
-            ident = f"push_args_{sig.method_id}_{stmt_expr.lineno}_{stmt_expr.col_offset}"
+            ident = f"push_args_{sig.method_id}{get_session().mksymbol()}"
             start_label = ident + "_start"
             end_label = ident + "_end"
             i_placeholder = context.new_placeholder(BaseType("uint256"))
@@ -231,7 +232,7 @@ def _call_self_internal(stmt_expr, context, sig):
             # append dynamic unpacker.
             dyn_idx = 0
             for in_memory_offset, _out_type in dynamic_offsets:
-                ident = f"{stmt_expr.lineno}_{stmt_expr.col_offset}_arg_{dyn_idx}"
+                ident = f"{get_session().mksymbol()}_arg_{dyn_idx}"
                 dyn_idx += 1
                 start_label = "dyn_unpack_start_" + ident
                 end_label = "dyn_unpack_end_" + ident
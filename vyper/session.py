@@ -0,0 +1,136 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+_local = threading.local()
+
+
+class CompilationSession:
+    """
+    Mutable state that is used throughout the compilation of a single contract.
+
+    Each thread has its own stack of sessions, so that multiple contracts may be
+    compiled concurrently within the same process. A session is activated by
+    using it as a context manager:
+
+        with CompilationSession(evm_version="byzantium"):
+            ...
+
+    When no session has been activated, `get_session` returns a default session
+    which is unique to the current thread.
+
+    Attributes
+    ----------
+    evm_version : str
+        Name of the active EVM ruleset.
+    show_gas_estimates : bool
+        If True, gas estimates are included in the string representation of LLL.
+    module_store : ModuleStore, optional
+        Store of parsed modules for a batch of compilations. May be shared between
+        several sessions, so that a source which is used by multiple contracts is
+        only parsed once. If not given, each source is parsed separately and no
+        parsed modules are retained by the session.
+    """
+
+    def __init__(
+        self,
+        evm_version: Optional[str] = None,
+        show_gas_estimates: bool = False,
+        module_store: Any = None,
+    ):
+        from vyper.opcodes import DEFAULT_EVM_VERSION, EVM_VERSIONS
+
+        if evm_version is None:
+            evm_version = DEFAULT_EVM_VERSION
+        self.evm_version = evm_version
+        self.evm_version_id = EVM_VERSIONS[evm_version]
+        self.show_gas_estimates = show_gas_estimates
+        self.next_symbol = 0
+        self._symbol_scope: Optional[str] = None
+        self._namespace = None
+        self.module_store = module_store
+
+    def __enter__(self) -> "CompilationSession":
+        _get_stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stack = _get_stack()
+        if not stack or stack[-1] is not self:
+            from vyper.exceptions import CompilerPanic
+
+            raise CompilerPanic("Compilation sessions must be exited in the order they are entered")
+        stack.pop()
+
+    @property
+    def namespace(self):
+        """
+        The namespace used during type checking, created on first access.
+        """
+        if self._namespace is None:
+            from vyper.context.namespace import Namespace
+
+            self._namespace = Namespace()
+        return self._namespace
+
+    def parse(
+        self, source_code: str, source_id: int = 0, contract_name: Optional[str] = None
+    ) -> Any:
+        """
+        Parse a source string, reusing a previously parsed module if the session
+        has a module store.
+
+        Modules returned from a store are shared and must not be modified. Without
+        a store, the returned module is private to the caller.
+        """
+        if self.module_store is None:
+            from vyper.ast import parse_to_ast
+
+            return parse_to_ast(source_code, source_id, contract_name)
+        return self.module_store.parse(source_code, source_id, contract_name)
+
+    def mksymbol(self) -> str:
+        """
+        Generate a unique assembly label.
+        """
+        self.next_symbol += 1
+        if self._symbol_scope is not None:
+            return f"_sym_{self._symbol_scope}_{self.next_symbol}"
+        return f"_sym_{self.next_symbol}"
+
+    @contextmanager
+    def symbol_scope(self, name: str) -> Iterator[None]:
+        """
+        Generate assembly labels within a named scope.
+
+        Labels generated inside the scope are prefixed with `name` and numbered
+        from zero, independent of any labels generated before or after. This
+        allows the LLL for a single function to be generated identically no
+        matter where the function is located within a contract.
+
+        Arguments
+        ---------
+        name : str
+            Name of the scope. Must be unique within a contract.
+        """
+        previous = self._symbol_scope, self.next_symbol
+        self._symbol_scope, self.next_symbol = name, 0
+        try:
+            yield
+        finally:
+            self._symbol_scope, self.next_symbol = previous
+
+
+def _get_stack() -> list:
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = [CompilationSession()]
+        return _local.stack
+
+
+def get_session() -> CompilationSession:
+    """
+    Get the active compilation session for the current thread.
+    """
+    return _get_stack()[-1]
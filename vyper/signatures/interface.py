@@ -1,5 +1,8 @@
-import importlib
-import pkgutil
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Sequence, Tuple
 
@@ -7,24 +10,27 @@ import vyper.interfaces
 from vyper import ast as vy_ast
 from vyper.exceptions import StructureException
 from vyper.parser.global_context import GlobalContext
+from vyper.session import get_session
 from vyper.signatures import sig_utils
 from vyper.signatures.event_signature import EventSignature
 from vyper.signatures.function_signature import FunctionSignature
 from vyper.types.types import ByteArrayLike, TupleLike
 
+# Maximum number of interfaces with memoized signatures.
+SIGNATURE_CACHE_SIZE = 256
+
+# Signatures extracted from each interface, keyed by interface type, name and a hash
+# of the interface code. The cache is shared by all compilations within the process,
+# so that an interface used by many contracts is only processed once.
+_signature_cache: "OrderedDict[Tuple[str, str, str], list]" = OrderedDict()
+_signature_cache_lock = threading.Lock()
+
 
 # Populate built-in interfaces.
 def get_builtin_interfaces():
-    interface_names = [x.name for x in pkgutil.iter_modules(vyper.interfaces.__path__)]
     return {
-        name: extract_sigs(
-            {
-                "type": "vyper",
-                "code": importlib.import_module(f"vyper.interfaces.{name}",).interface_code,
-            },
-            name,
-        )
-        for name in interface_names
+        name: extract_sigs(sig_code, name)
+        for name, sig_code in vyper.interfaces.get_builtin_interface_codes().items()
     }
 
 
@@ -103,25 +109,72 @@ def mk_full_signature_from_json(abi):
 
 
 def extract_sigs(sig_code, interface_name=None):
+    """
+    Extract the function and event signatures of an interface.
+
+    Results are memoized for the lifetime of the process, based on a hash of the
+    interface code. Each call returns shallow copies of the memoized signature
+    objects, so the caller may set attributes on them. Nested values such as
+    `args` and `output_type` are shared with every other caller and must not be
+    modified.
+
+    Arguments
+    ---------
+    sig_code : dict
+        Interface definition formatted as `{"type": "json/vyper", "code": "interface code"}`
+    interface_name : str, optional
+        Name of the interface, used in exception messages.
+
+    Returns
+    -------
+    list
+        `FunctionSignature` and `EventSignature` objects for the interface.
+    """
+    if sig_code["type"] == "vyper":
+        code_hash = hashlib.sha256(sig_code["code"].encode("utf-8")).hexdigest()
+    elif sig_code["type"] == "json":
+        code = json.dumps(sig_code["code"], sort_keys=True)
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    else:
+        raise Exception(
+            (
+                f"Unknown interface signature type '{sig_code['type']}' supplied. "
+                "'vyper' & 'json' are supported"
+            )
+        )
+
+    key = (sig_code["type"], interface_name, code_hash)
+    with _signature_cache_lock:
+        sigs = _signature_cache.get(key)
+        if sigs is not None:
+            _signature_cache.move_to_end(key)
+
+    if sigs is None:
+        # signatures are extracted without holding the lock, concurrent calls for
+        # the same interface may each extract them
+        sigs = _extract_sigs(sig_code, interface_name)
+        with _signature_cache_lock:
+            _signature_cache[key] = sigs
+            if len(_signature_cache) > SIGNATURE_CACHE_SIZE:
+                _signature_cache.popitem(last=False)
+
+    return [copy.copy(i) for i in sigs]
+
+
+def _extract_sigs(sig_code, interface_name):
     if sig_code["type"] == "vyper":
+        vyper_module = get_session().parse(sig_code["code"], contract_name=interface_name)
         interface_ast = [
             i
-            for i in vy_ast.parse_to_ast(sig_code["code"], contract_name=interface_name)
+            for i in vyper_module
             if isinstance(i, vy_ast.FunctionDef)
             or isinstance(i, vy_ast.EventDef)
             or (isinstance(i, vy_ast.AnnAssign) and i.target.id != "implements")
         ]
         global_ctx = GlobalContext.get_global_context(interface_ast)
         return sig_utils.mk_full_signature(global_ctx, sig_formatter=lambda x: x)
-    elif sig_code["type"] == "json":
-        return mk_full_signature_from_json(sig_code["code"])
     else:
-        raise Exception(
-            (
-                f"Unknown interface signature type '{sig_code['type']}' supplied. "
-                "'vyper' & 'json' are supported"
-            )
-        )
+        return mk_full_signature_from_json(sig_code["code"])
 
 
 def extract_interface_str(global_ctx):
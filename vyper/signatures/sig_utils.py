@@ -1,5 +1,3 @@
-import copy
-
 from vyper.signatures.event_signature import EventSignature
 from vyper.signatures.function_signature import FunctionSignature
 
@@ -27,8 +25,8 @@ def generate_default_arg_sigs(code, interfaces, global_ctx):
     default_sig_strs = []
     sig_fun_defs = []
     for truth_row in table:
-        new_code = copy.deepcopy(code)
-        new_code.args.args = copy.deepcopy(base_args)
+        new_code = code.clone()
+        new_code.args.args = [i.clone() for i in base_args]
         new_code.args.default = []
         # Add necessary default args.
         for idx, val in enumerate(truth_row):
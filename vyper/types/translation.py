@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from typing import Optional
+
+from vyper.context.types.bases import BaseTypeDefinition
+from vyper.context.types.indexable.mapping import MappingDefinition
+from vyper.context.types.indexable.sequence import (
+    ArrayDefinition,
+    TupleDefinition,
+)
+from vyper.context.types.meta.struct import StructDefinition
+from vyper.context.types.value.array_value import (
+    BytesArrayDefinition,
+    StringDefinition,
+)
+from vyper.types.types import (
+    BaseType,
+    ByteArrayType,
+    ListType,
+    MappingType,
+    NodeType,
+    StringType,
+    StructType,
+    TupleType,
+)
+from vyper.utils import BASE_TYPES
+
+
+def translate_type_definition(type_definition: BaseTypeDefinition) -> Optional[NodeType]:
+    """
+    Return the code generation type for a type definition from `vyper.context.types`.
+
+    A new type object is returned on each call, so the result may be modified.
+
+    Arguments
+    ---------
+    type_definition : BaseTypeDefinition
+        Type definition object, as resolved during semantic validation.
+
+    Returns
+    -------
+    NodeType, optional
+        The equivalent code generation type, or `None` if the type definition has
+        no direct equivalent, e.g. an interface.
+    """
+    if isinstance(type_definition, StructDefinition):
+        members = OrderedDict()
+        for name, member_type in type_definition.members.items():
+            typ = translate_type_definition(member_type)
+            if typ is None:
+                return None
+            members[name] = typ
+        return StructType(members, type_definition._id)
+
+    if isinstance(type_definition, ArrayDefinition):
+        subtype = translate_type_definition(type_definition.value_type)
+        if subtype is None:
+            return None
+        return ListType(subtype, type_definition.length)
+
+    if isinstance(type_definition, TupleDefinition):
+        tuple_members = [
+            translate_type_definition(i) for i in type_definition.value_type  # type: ignore
+        ]
+        if None in tuple_members:
+            return None
+        return TupleType(tuple_members)
+
+    if isinstance(type_definition, MappingDefinition):
+        keytype = translate_type_definition(type_definition.key_type)
+        valuetype = translate_type_definition(type_definition.value_type)
+        if keytype is None or valuetype is None:
+            return None
+        return MappingType(keytype, valuetype)
+
+    if isinstance(type_definition, BytesArrayDefinition):
+        return ByteArrayType(type_definition.length)
+
+    if isinstance(type_definition, StringDefinition):
+        return StringType(type_definition.length)
+
+    type_id = getattr(type_definition, "_id", None)
+    if type_id in BASE_TYPES:
+        return BaseType(type_id)
+
+    return None
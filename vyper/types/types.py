@@ -195,6 +195,15 @@ def make_struct_type(name, location, members, custom_structs):
 # Parses an expression representing a type. Annotation refers to whether
 # the type is to be located in memory or storage
 def parse_type(item, location, sigs=None, custom_structs=None):
+    # Types resolved during semantic validation are translated instead of parsed again
+    type_definition = item._metadata.get("type")
+    if type_definition is not None:
+        from vyper.types.translation import translate_type_definition
+
+        typ = translate_type_definition(type_definition)
+        if typ is not None:
+            return typ
+
     # Base and custom types, e.g. num
     if isinstance(item, vy_ast.Name):
         if item.id in BASE_TYPES: